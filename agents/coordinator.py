@@ -1,8 +1,11 @@
 # agents/coordinator.py
 
-from typing import Dict, Optional, List
-from agents.data_agent import get_phone_data, format_phone_specs
-from agents.review_agent import generate_review, ReviewGenerator, PhoneSpecs
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, List
+from agents.data_agent import get_phone_data, get_phone_data_async, format_phone_specs
+from agents.review_agent import ReviewGenerator, PhoneSpecs, get_review_generator
+from agents.leaderboard import SpecMatrix, overall_score
+from config.tracing import stage
 import json
 
 
@@ -10,12 +13,20 @@ class PhoneAnalysisCoordinator:
     """
     coordinator that manages multiple agents for comprehensive phone analysis.
     Provides both structured data and natural language reviews.
+    Holds no per-request state, so one instance can serve every request.
     """
 
-    def __init__(self):
-        self.review_generator = ReviewGenerator()
-
-    def get_phone_comparison(self, phone_names: List[str]) -> Dict:
+    def __init__(
+        self,
+        review_generator: Optional[ReviewGenerator] = None,
+        data_fetcher: Callable[..., dict] = get_phone_data,
+        async_data_fetcher: Callable[..., Awaitable[dict]] = get_phone_data_async,
+    ):
+        self.review_generator = review_generator or get_review_generator()
+        self.data_fetcher = data_fetcher
+        self.async_data_fetcher = async_data_fetcher
+
+    def get_phone_comparison(self, phone_names: List[str], db=None) -> Dict:
         """
         Compare multiple phones side by side.
         """
@@ -23,7 +34,7 @@ class PhoneAnalysisCoordinator:
         phone_specs = []
 
         for phone_name in phone_names:
-            phone_data = get_phone_data(phone_name)
+            phone_data = self.data_fetcher(phone_name, db=db)
             if "error" not in phone_data:
                 specs = self.review_generator.create_phone_specs_object(phone_data)
                 phone_specs.append(specs)
@@ -98,49 +109,42 @@ class PhoneAnalysisCoordinator:
 
     def _determine_winners(self, phones: List[PhoneSpecs]) -> Dict:
         """Determine category winners"""
-        return {
-            "best_overall": max(
-                phones, key=lambda x: self._calculate_overall_score(x)
-            ).name,
-            "best_camera": max(phones, key=lambda x: x.main_camera_mp).name,
-            "best_battery": max(phones, key=lambda x: x.battery_capacity).name,
-            "best_performance": max(
-                phones, key=lambda x: max(x.ram_variants) if x.ram_variants else 0
-            ).name,
-            "best_value": min(
-                phones, key=lambda x: 1 if x.price_tier == "flagship" else 0
-            ).name,
-        }
+        return SpecMatrix(phones).winners()
 
     def _calculate_overall_score(self, phone: PhoneSpecs) -> float:
         """Calculate overall phone score"""
-        score = 0
-
-        # Performance score (30%)
         max_ram = max(phone.ram_variants) if phone.ram_variants else 8
-        score += (max_ram / 16) * 30
-
-        # Camera score (25%)
-        score += (phone.main_camera_mp / 200) * 25
-
-        # Battery score (25%)
-        score += (phone.battery_capacity / 5000) * 25
-
-        # Display score (10%)
-        score += (phone.display_size / 7.0) * 10
-
-        # Features bonus (10%)
-        feature_bonus = len(phone.special_features) * 2
-        score += min(feature_bonus, 10)
-
-        return score
+        return float(
+            overall_score(
+                max_ram,
+                phone.main_camera_mp,
+                phone.battery_capacity,
+                phone.display_size,
+                len(phone.special_features),
+            )
+        )
 
-    def generate_phone_summary(self, phone_name: str) -> Dict:
+    def generate_phone_summary(self, phone_name: str, db=None) -> Dict:
         """
         phone summary with comprehensive analysis.
+        `db` is an optional session to read through (e.g. request-scoped).
         """
-        phone_data = get_phone_data(phone_name)
+        with stage("fetch_phone"):
+            phone_data = self.data_fetcher(phone_name, db=db)
+        return self.summarize_phone_data(phone_name, phone_data)
 
+    async def generate_phone_summary_async(self, phone_name: str, db=None) -> Dict:
+        """
+        Async variant of generate_phone_summary; `db` is an optional AsyncSession.
+        """
+        with stage("fetch_phone"):
+            phone_data = await self.async_data_fetcher(phone_name, db=db)
+        return self.summarize_phone_data(phone_name, phone_data)
+
+    def summarize_phone_data(self, phone_name: str, phone_data: dict) -> Dict:
+        """
+        Build the review, formatted specs and analysis from fetched phone data.
+        """
         if "error" in phone_data:
             return {
                 "error": phone_data["error"],
@@ -149,15 +153,15 @@ class PhoneAnalysisCoordinator:
                 "analysis": None,
             }
 
-        # Generate comprehensive review
-        review = generate_review(phone_name)
-
-        # Format basic specs
-        formatted_specs = format_phone_specs(phone_data)
+        # Generate comprehensive review from the data fetched above
+        with stage("review_text"):
+            review = self.review_generator.generate_review_from_data(phone_data)
 
-        # Generate detailed analysis
-        specs_obj = self.review_generator.create_phone_specs_object(phone_data)
-        analysis = self._generate_detailed_analysis(specs_obj)
+        # Format basic specs and generate detailed analysis
+        with stage("analysis"):
+            formatted_specs = format_phone_specs(phone_data)
+            specs_obj = self.review_generator.create_phone_specs_object(phone_data)
+            analysis = self._generate_detailed_analysis(specs_obj)
 
         return {
             "phone_name": phone_name,
@@ -234,18 +238,22 @@ class PhoneAnalysisCoordinator:
             return "Budget-conscious users who want a reliable Samsung device with decent features"
 
 
+@lru_cache(maxsize=None)
+def get_coordinator() -> PhoneAnalysisCoordinator:
+    """Process-wide coordinator shared by the API and CLI helpers"""
+    return PhoneAnalysisCoordinator()
+
+
 # Main coordination function
 def generate_phone_summary(phone_name: str) -> Dict:
     """
     Generate comprehensive phone analysis using multi-agent system.
     """
-    coordinator = PhoneAnalysisCoordinator()
-    return coordinator.generate_phone_summary(phone_name)
+    return get_coordinator().generate_phone_summary(phone_name)
 
 
 def compare_phones(phone_names: List[str]) -> Dict:
     """
     Compare multiple phones using analysis.
     """
-    coordinator = PhoneAnalysisCoordinator()
-    return coordinator.get_phone_comparison(phone_names)
+    return get_coordinator().get_phone_comparison(phone_names)
@@ -1,23 +1,91 @@
 # agents/data_agent.py
 
-from sqlalchemy.orm import Session
-from config.database import SessionLocal
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
+from config.database import async_session_scope, session_scope
 from database.models import Phone, Specification
+from agents.name_resolver import get_name_resolver, get_name_resolver_async
+from catalog.snapshot import active_snapshot
 
 
-def get_phone_data(phone_name: str) -> dict:
+def get_phone_data(phone_name: str, db: Optional[Session] = None) -> dict:
     """
     Fetch phone data and specs by name from the database.
     Returns a dict with all structured fields + specs.
+    Uses the given (e.g. request-scoped) session, or opens and closes its own.
+    Reads from the catalog snapshot instead when one is enabled.
     """
-    db: Session = SessionLocal()
-    phone = db.query(Phone).filter(Phone.name.ilike(f"%{phone_name}%")).first()
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        return snapshot_phone_data(snapshot, phone_name)
+
+    if db is None:
+        with session_scope() as own_db:
+            return get_phone_data(phone_name, own_db)
+
+    phone = find_phone(db, phone_name)
 
     if not phone:
         return {"error": f"No phone found with name matching: {phone_name}"}
 
-    specs = db.query(Specification).filter(Specification.phone_id == phone.id).all()
+    extra = spec_dict(phone)
+    if extra is None:
+        specs = db.query(Specification).filter(Specification.phone_id == phone.id)
+        extra = {spec.key: spec.value for spec in specs}
+
+    return phone_to_data(phone, extra)
 
+
+async def get_phone_data_async(
+    phone_name: str, db: Optional[AsyncSession] = None
+) -> dict:
+    """
+    Async variant of get_phone_data for the API's async path.
+    """
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        return snapshot_phone_data(snapshot, phone_name)
+
+    if db is None:
+        async with async_session_scope() as own_db:
+            return await get_phone_data_async(phone_name, own_db)
+
+    phone = await find_phone_async(db, phone_name)
+
+    if not phone:
+        return {"error": f"No phone found with name matching: {phone_name}"}
+
+    extra = spec_dict(phone)
+    if extra is None:
+        result = await db.execute(
+            select(Specification).where(Specification.phone_id == phone.id)
+        )
+        extra = {spec.key: spec.value for spec in result.scalars()}
+
+    return phone_to_data(phone, extra)
+
+
+def snapshot_phone_data(snapshot, phone_name: str) -> dict:
+    """get_phone_data answered from a catalog snapshot (no DB access)"""
+    record = snapshot.find(phone_name)
+    if not record:
+        return {"error": f"No phone found with name matching: {phone_name}"}
+    return phone_to_data(record, dict(record.specs))
+
+
+def spec_dict(phone: Phone) -> Optional[dict]:
+    """Extra specs from the phone's spec document, or None if it has none yet"""
+    items = phone.spec_items()
+    return dict(items) if items is not None else None
+
+
+def phone_to_data(phone: Phone, extra_specs: dict) -> dict:
+    """
+    Build the structured + extra specs dict for a phone.
+    """
     structured = {
         "Name": phone.name,
         "Battery": phone.battery,
@@ -33,9 +101,79 @@ def get_phone_data(phone_name: str) -> dict:
         "Weight": phone.weight,
     }
 
-    extra_specs = {spec.key: spec.value for spec in specs}
+    return {"id": phone.id, "structured": structured, "extra": extra_specs}
+
+
+def get_all_phone_data() -> list:
+    """
+    Fetch every phone with its specs. Phones with a spec document need no
+    join; spec rows are only read (in one query) for phones without one.
+    """
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        return [phone_to_data(r, dict(r.specs)) for r in snapshot.records]
+
+    with session_scope() as db:
+        phones = db.query(Phone).options(undefer(Phone.spec_doc)).order_by(Phone.id)
+        extras = {phone: spec_dict(phone) for phone in phones}
+
+        missing = [phone.id for phone, extra in extras.items() if extra is None]
+        if missing:
+            specs_by_phone = defaultdict(dict)
+            for spec in (
+                db.query(Specification)
+                .filter(Specification.phone_id.in_(missing))
+                .order_by(Specification.id)
+            ):
+                specs_by_phone[spec.phone_id][spec.key] = spec.value
+            for phone in extras:
+                if extras[phone] is None:
+                    extras[phone] = specs_by_phone[phone.id]
+
+        return [phone_to_data(phone, extra) for phone, extra in extras.items()]
+
+
+def find_phone(db: Session, phone_name: str) -> Optional[Phone]:
+    """
+    Resolve a free-text phone name to a Phone row.
+    Uses the in-memory name index first, then a pg_trgm similarity lookup on Postgres.
+    """
+    match = get_name_resolver(db).resolve(phone_name)
+    if match:
+        return db.get(Phone, match.phone_id, options=[undefer(Phone.spec_doc)])
+
+    return _trigram_lookup(db, phone_name)
+
+
+async def find_phone_async(db: AsyncSession, phone_name: str) -> Optional[Phone]:
+    """Async variant of find_phone"""
+    match = (await get_name_resolver_async(db)).resolve(phone_name)
+    if match:
+        return await db.get(Phone, match.phone_id, options=[undefer(Phone.spec_doc)])
+
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+
+    result = await db.execute(_trigram_query(phone_name))
+    return result.scalars().first()
+
+
+def _trigram_query(phone_name: str):
+    return (
+        select(Phone)
+        .options(undefer(Phone.spec_doc))
+        .where(Phone.name.op("%")(phone_name))
+        .order_by(func.similarity(Phone.name, phone_name).desc(), Phone.name)
+        .limit(1)
+    )
+
+
+def _trigram_lookup(db: Session, phone_name: str) -> Optional[Phone]:
+    """Fuzzy lookup backed by the trigram index (Postgres only)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
 
-    return {"structured": structured, "extra": extra_specs}
+    return db.execute(_trigram_query(phone_name)).scalars().first()
 
 
 def format_phone_specs(data: dict) -> str:
@@ -0,0 +1,161 @@
+# agents/leaderboard.py
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from agents.review_agent import PhoneSpecs
+
+CATEGORIES = ("overall", "camera", "battery", "performance", "display", "value")
+
+# RAM assumed for the overall score when a phone lists no variants
+DEFAULT_SCORE_RAM = 8
+
+
+def overall_score(max_ram, camera_mp, battery_mah, display_in, feature_count):
+    """
+    Weighted overall score. Works on scalars or NumPy arrays alike:
+    performance 30%, camera 25%, battery 25%, display 10%, features 10%.
+    """
+    score = (max_ram / 16) * 30
+    score = score + (camera_mp / 200) * 25
+    score = score + (battery_mah / 5000) * 25
+    score = score + (display_in / 7.0) * 10
+    score = score + np.minimum(feature_count * 2, 10)
+    return score
+
+
+class SpecMatrix:
+    """Column-oriented view of many PhoneSpecs with vectorized scoring"""
+
+    def __init__(self, phones: Sequence[PhoneSpecs]):
+        self.phones = list(phones)
+        self.names = [p.name for p in self.phones]
+        self.ram = np.array(
+            [max(p.ram_variants) if p.ram_variants else 0 for p in self.phones],
+            dtype=np.float64,
+        )
+        self.camera_mp = np.array(
+            [p.main_camera_mp for p in self.phones], dtype=np.float64
+        )
+        self.battery = np.array(
+            [p.battery_capacity for p in self.phones], dtype=np.float64
+        )
+        self.display = np.array([p.display_size for p in self.phones], dtype=np.float64)
+        self.feature_count = np.array(
+            [len(p.special_features) for p in self.phones], dtype=np.float64
+        )
+        self.release_year = np.array(
+            [p.release_year for p in self.phones], dtype=np.int32
+        )
+        self.price_tier = np.array([p.price_tier for p in self.phones], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.phones)
+
+    def overall_scores(self) -> np.ndarray:
+        score_ram = np.where(self.ram > 0, self.ram, DEFAULT_SCORE_RAM)
+        return overall_score(
+            score_ram, self.camera_mp, self.battery, self.display, self.feature_count
+        )
+
+    def category_scores(self) -> Dict[str, np.ndarray]:
+        """Score per category; higher is better"""
+        return {
+            "overall": self.overall_scores(),
+            "camera": self.camera_mp,
+            "battery": self.battery,
+            "performance": self.ram,
+            "display": self.display,
+            # Non-flagships first; ties keep catalog order
+            "value": (self.price_tier != "flagship").astype(np.float64),
+        }
+
+    def winners(self) -> Dict[str, str]:
+        """Category winners (first phone wins ties, like max()/min())"""
+        scores = self.category_scores()
+        return {
+            f"best_{category}": self.names[int(np.argmax(scores[category]))]
+            for category in ("overall", "camera", "battery", "performance", "value")
+        }
+
+
+class Leaderboard:
+    """Per-category rankings precomputed over a SpecMatrix"""
+
+    def __init__(self, matrix: SpecMatrix):
+        self.matrix = matrix
+        self.scores = matrix.category_scores()
+        # Stable sort on negated scores: descending, ties in catalog order
+        self.order = {
+            category: np.argsort(-values, kind="stable")
+            for category, values in self.scores.items()
+        }
+
+    def filter_mask(
+        self,
+        price_tier: Optional[str] = None,
+        min_year: Optional[int] = None,
+        max_year: Optional[int] = None,
+    ) -> Optional[np.ndarray]:
+        """Boolean mask over the catalog, or None when no filter applies"""
+        mask = np.ones(len(self.matrix), dtype=bool)
+        if price_tier:
+            mask &= self.matrix.price_tier == price_tier
+        if min_year is not None:
+            mask &= self.matrix.release_year >= min_year
+        if max_year is not None:
+            mask &= self.matrix.release_year <= max_year
+        return None if mask.all() else mask
+
+    def top(
+        self, category: str, limit: int = 10, mask: Optional[np.ndarray] = None
+    ) -> List[Dict]:
+        """Top phones in a category, optionally restricted to a mask"""
+        if category not in self.order:
+            raise KeyError(category)
+
+        order = self.order[category]
+        if mask is not None:
+            order = order[mask[order]]
+
+        values = self.scores[category]
+        return [
+            {
+                "rank": rank,
+                "name": self.matrix.names[i],
+                "score": round(float(values[i]), 2),
+            }
+            for rank, i in enumerate(order[:limit], 1)
+        ]
+
+
+# Process-wide catalog leaderboard
+_catalog_leaderboard: Optional[Leaderboard] = None
+_leaderboard_lock = threading.Lock()
+
+
+def build_catalog_leaderboard() -> Leaderboard:
+    """Parse the whole catalog and precompute its leaderboards"""
+    from agents.data_agent import get_all_phone_data
+    from agents.review_agent import ReviewGenerator
+
+    specs = ReviewGenerator(cache_size=0).analyze_many(get_all_phone_data())
+    return Leaderboard(SpecMatrix(specs))
+
+
+def get_catalog_leaderboard() -> Leaderboard:
+    global _catalog_leaderboard
+    if _catalog_leaderboard is None:
+        with _leaderboard_lock:
+            if _catalog_leaderboard is None:
+                _catalog_leaderboard = build_catalog_leaderboard()
+    return _catalog_leaderboard
+
+
+def refresh_catalog_leaderboard():
+    """Drop the cached leaderboard so the next request rebuilds it"""
+    global _catalog_leaderboard
+    with _leaderboard_lock:
+        _catalog_leaderboard = None
@@ -0,0 +1,210 @@
+# agents/name_resolver.py
+
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Tokens that carry no information for telling Samsung models apart
+NOISE_TOKENS = {"samsung", "galaxy"}
+
+# Minimum Dice similarity (over character trigrams) for a fuzzy match
+FUZZY_THRESHOLD = 0.35
+
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_FUZZY = "fuzzy"
+
+_MATCH_RANK = {MATCH_EXACT: 0, MATCH_PREFIX: 1, MATCH_FUZZY: 2}
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    """A candidate phone for a name lookup"""
+
+    phone_id: int
+    name: str
+    match_type: str
+    score: float
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase a phone name and collapse punctuation/whitespace. "+" becomes
+    its own "plus" token so "Galaxy S24+" keeps apart from "Galaxy S24".
+    """
+    name = (name or "").lower().replace("+", " plus ")
+    return " ".join(_NON_ALNUM_RE.split(name)).strip()
+
+
+def name_alias(name: str) -> str:
+    """Short alias of a phone name, e.g. 'Samsung Galaxy S25 Ultra' -> 's25 ultra'"""
+    tokens = [t for t in normalize_name(name).split() if t not in NOISE_TOKENS]
+    return " ".join(tokens)
+
+
+def trigrams(text: str) -> set:
+    """Character trigrams of a normalized string (padded so short names still match)"""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PhoneNameResolver:
+    """
+    In-memory phone name index.
+    Resolves free-text names with exact, prefix and trigram-fuzzy matching,
+    ranked in that order so lookups are deterministic.
+    """
+
+    def __init__(self, phones: Iterable[Tuple[int, str]] = ()):
+        self._names: Dict[int, str] = {}
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._sorted_keys: List[Tuple[str, int]] = []
+        self._grams: Dict[str, set] = defaultdict(set)
+        self._gram_counts: Dict[int, int] = {}
+
+        for phone_id, name in phones:
+            self._add(phone_id, name)
+
+        self._sorted_keys.sort()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _add(self, phone_id: int, name: str):
+        self._names[phone_id] = name
+
+        keys = {normalize_name(name), name_alias(name)}
+        for key in keys:
+            if key:
+                self._exact[key].append(phone_id)
+                self._sorted_keys.append((key, phone_id))
+
+        grams = trigrams(name_alias(name) or normalize_name(name))
+        self._gram_counts[phone_id] = len(grams)
+        for gram in grams:
+            self._grams[gram].add(phone_id)
+
+    def _sort_key(self, match: NameMatch):
+        # Best match type, then best score, then the shortest (least specific) name
+        return (
+            _MATCH_RANK[match.match_type],
+            -match.score,
+            len(match.name),
+            match.name,
+        )
+
+    def _exact_matches(self, keys: List[str]) -> Dict[int, NameMatch]:
+        found = {}
+        for key in keys:
+            for phone_id in self._exact.get(key, ()):
+                found[phone_id] = NameMatch(
+                    phone_id, self._names[phone_id], MATCH_EXACT, 1.0
+                )
+        return found
+
+    def _prefix_matches(self, keys: List[str]) -> Dict[int, NameMatch]:
+        found = {}
+        for key in keys:
+            start = bisect_left(self._sorted_keys, (key, -1))
+            for candidate, phone_id in self._sorted_keys[start:]:
+                if not candidate.startswith(key):
+                    break
+                score = len(key) / len(candidate)
+                previous = found.get(phone_id)
+                if previous is None or score > previous.score:
+                    found[phone_id] = NameMatch(
+                        phone_id, self._names[phone_id], MATCH_PREFIX, score
+                    )
+        return found
+
+    def _fuzzy_matches(self, key: str) -> Dict[int, NameMatch]:
+        query_grams = trigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for phone_id in self._grams.get(gram, ()):
+                shared[phone_id] += 1
+
+        found = {}
+        for phone_id, common in shared.items():
+            score = 2 * common / (len(query_grams) + self._gram_counts[phone_id])
+            if score >= FUZZY_THRESHOLD:
+                found[phone_id] = NameMatch(
+                    phone_id, self._names[phone_id], MATCH_FUZZY, score
+                )
+        return found
+
+    def candidates(self, query: str, limit: int = 5) -> List[NameMatch]:
+        """Rank candidate phones for a query: exact, then prefix, then fuzzy"""
+        keys = [
+            k for k in dict.fromkeys([normalize_name(query), name_alias(query)]) if k
+        ]
+        if not keys:
+            return []
+
+        matches = self._exact_matches(keys)
+        if len(matches) < limit:
+            for phone_id, match in self._prefix_matches(keys).items():
+                matches.setdefault(phone_id, match)
+        if len(matches) < limit:
+            for phone_id, match in self._fuzzy_matches(keys[-1]).items():
+                matches.setdefault(phone_id, match)
+
+        return sorted(matches.values(), key=self._sort_key)[:limit]
+
+    def resolve(self, query: str) -> Optional[NameMatch]:
+        """Return the single best match for a query, or None"""
+        ranked = self.candidates(query, limit=1)
+        return ranked[0] if ranked else None
+
+
+# Process-wide resolver, built lazily from the phones table
+_resolver: Optional[PhoneNameResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def build_resolver_from_db(db) -> PhoneNameResolver:
+    """Build a resolver from (id, name) pairs in the phones table"""
+    from database.models import Phone
+
+    return PhoneNameResolver(db.query(Phone.id, Phone.name).all())
+
+
+async def build_resolver_from_db_async(db) -> PhoneNameResolver:
+    """Async variant of build_resolver_from_db for an AsyncSession"""
+    from sqlalchemy import select
+    from database.models import Phone
+
+    result = await db.execute(select(Phone.id, Phone.name))
+    return PhoneNameResolver(result.all())
+
+
+def get_name_resolver(db) -> PhoneNameResolver:
+    """Return the shared resolver, building it on first use"""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = build_resolver_from_db(db)
+    return _resolver
+
+
+async def get_name_resolver_async(db) -> PhoneNameResolver:
+    """Return the shared resolver, building it through an AsyncSession if needed"""
+    global _resolver
+    if _resolver is None:
+        resolver = await build_resolver_from_db_async(db)
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = resolver
+    return _resolver
+
+
+def refresh_name_resolver(db=None):
+    """Drop (and optionally rebuild) the shared resolver after the catalog changes"""
+    global _resolver
+    with _resolver_lock:
+        _resolver = build_resolver_from_db(db) if db is not None else None
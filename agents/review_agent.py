@@ -1,9 +1,46 @@
 # agents/enhanced_review_agent.py
 
 import re
-from typing import Dict, List, Tuple, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
 from dataclasses import dataclass
 from agents.data_agent import get_phone_data
+from config.tracing import count, stage
+
+# Precompiled spec parsing patterns
+_DISPLAY_SIZE_RE = re.compile(r"(\d+\.\d+)")
+_CAMERA_MP_RE = re.compile(r"(\d+)\s*MP")
+_BATTERY_RE = re.compile(r"(\d+)")
+_GB_RE = re.compile(r"(\d+)GB")
+_YEAR_RE = re.compile(r"(\d{4})")
+
+# Max number of parsed PhoneSpecs kept in memory
+SPECS_CACHE_SIZE = 4096
+# Max number of distinct names/chipsets whose tier lookup is memoized
+TIER_CACHE_SIZE = 8192
+
+
+def compile_tier_table(tiers: Dict[str, List[str]], ignore_case: bool = False):
+    """
+    Flatten a tier table into one (model, tier) tuple in priority order.
+    The first model contained in the text decides the tier, exactly like
+    walking the nested dict, but without per-call dict iteration or case folding.
+    """
+    return tuple(
+        (model.upper() if ignore_case else model, tier)
+        for tier, models in tiers.items()
+        for model in models
+    )
+
+
+def match_tier(table: Tuple, text: str, default: str) -> str:
+    """Return the tier of the first model in table contained in text"""
+    for model, tier in table:
+        if model in text:
+            return tier
+    return default
 
 
 @dataclass
@@ -47,22 +84,44 @@ class SpecAnalyzer:
         "mid_range": ["A36", "A35", "A26"],
     }
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_tiers()
+
+    @classmethod
+    def _compile_tiers(cls):
+        """Compile the tier tables once per class and reset the lookup memos"""
+        chipset_table = compile_tier_table(cls.CHIPSET_TIERS)
+        price_table = compile_tier_table(cls.PRICE_TIERS, ignore_case=True)
+
+        # Catalogs reuse a small set of chipset strings and names, so memoize per text
+        cls._chipset_tier = staticmethod(
+            lru_cache(maxsize=TIER_CACHE_SIZE)(
+                lambda chipset: match_tier(chipset_table, chipset, "mid_range")
+            )
+        )
+        cls._price_tier = staticmethod(
+            lru_cache(maxsize=TIER_CACHE_SIZE)(
+                lambda name: match_tier(price_table, name.upper(), "mid_range")
+            )
+        )
+
     @staticmethod
     def parse_display_size(display_str: str) -> float:
         """Extract display size from string like '6.7 inches'"""
-        match = re.search(r"(\d+\.\d+)", display_str)
+        match = _DISPLAY_SIZE_RE.search(display_str)
         return float(match.group(1)) if match else 0.0
 
     @staticmethod
     def parse_camera_mp(camera_str: str) -> int:
         """Extract main camera MP from string"""
-        match = re.search(r"(\d+)\s*MP", camera_str)
+        match = _CAMERA_MP_RE.search(camera_str)
         return int(match.group(1)) if match else 0
 
     @staticmethod
     def parse_battery_capacity(battery_str: str) -> int:
         """Extract battery capacity from string like '5000 mAh'"""
-        match = re.search(r"(\d+)", battery_str)
+        match = _BATTERY_RE.search(battery_str)
         return int(match.group(1)) if match else 0
 
     @staticmethod
@@ -74,33 +133,23 @@ class SpecAnalyzer:
         storage_variants = []
 
         # Extract all numbers followed by 'GB'
-        ram_matches = re.findall(r"(\d+)GB", ram_str)
-        storage_matches = re.findall(r"(\d+)GB", storage_str)
+        ram_matches = _GB_RE.findall(ram_str)
+        storage_matches = _GB_RE.findall(storage_str)
 
         ram_variants = list(set(int(x) for x in ram_matches))
         storage_variants = list(set(int(x) for x in storage_matches))
 
         return sorted(ram_variants), sorted(storage_variants)
 
-    @staticmethod
-    def determine_price_tier(phone_name: str) -> str:
+    @classmethod
+    def determine_price_tier(cls, phone_name: str) -> str:
         """Determine price tier based on phone name"""
-        name_upper = phone_name.upper()
-
-        for tier, models in SpecAnalyzer.PRICE_TIERS.items():
-            for model in models:
-                if model.upper() in name_upper:
-                    return tier
-        return "mid_range"
+        return cls._price_tier(phone_name)
 
-    @staticmethod
-    def determine_chipset_tier(chipset: str) -> str:
+    @classmethod
+    def determine_chipset_tier(cls, chipset: str) -> str:
         """Determine chipset performance tier"""
-        for tier, chips in SpecAnalyzer.CHIPSET_TIERS.items():
-            for chip in chips:
-                if chip in chipset:
-                    return tier
-        return "mid_range"
+        return cls._chipset_tier(chipset)
 
     @staticmethod
     def extract_special_features(phone_data: dict) -> List[str]:
@@ -109,71 +158,143 @@ class SpecAnalyzer:
         specs = phone_data.get("structured", {})
 
         # Check for OIS
-        if "OIS" in specs.get("Camera", ""):
+        if "OIS" in (specs.get("Camera") or ""):
             features.append("Optical Image Stabilization")
 
         # Check for high refresh rate
-        if "120Hz" in str(specs.get("Display", "")):
+        if "120Hz" in str(specs.get("Display") or ""):
             features.append("120Hz Display")
 
         # Check for fast charging
-        battery_info = specs.get("Battery", "")
+        battery_info = specs.get("Battery") or ""
         if "fast" in battery_info.lower() or "wireless" in battery_info.lower():
             features.append("Fast Charging")
 
         # Check for 5G
-        if "5G" in specs.get("Network", ""):
+        if "5G" in (specs.get("Network") or ""):
             features.append("5G Connectivity")
 
         # Check for S Pen (Ultra models)
-        if "Ultra" in specs.get("Name", ""):
+        if "Ultra" in (specs.get("Name") or ""):
             features.append("S Pen Support")
 
         return features
 
 
+SpecAnalyzer._compile_tiers()
+
+
+def spec_key(phone_data: dict) -> Tuple:
+    """
+    Cache key for the structured specs a PhoneSpecs object is built from.
+    The tuple itself is the key (hashed by the dict), so there are no collisions.
+    """
+    return tuple(phone_data.get("structured", {}).items())
+
+
 class ReviewGenerator:
     """Generates comprehensive phone reviews"""
 
-    def __init__(self):
-        self.analyzer = SpecAnalyzer()
+    def __init__(
+        self,
+        analyzer: Optional[SpecAnalyzer] = None,
+        data_fetcher: Callable[..., dict] = get_phone_data,
+        cache_size: int = SPECS_CACHE_SIZE,
+    ):
+        self.analyzer = analyzer or SpecAnalyzer()
+        self.data_fetcher = data_fetcher
+        self.cache_size = cache_size
+        self._specs_cache: "OrderedDict[Tuple, PhoneSpecs]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def create_phone_specs_object(self, phone_data: dict) -> PhoneSpecs:
-        """Convert raw phone data to structured PhoneSpecs object"""
+        """
+        Convert raw phone data to structured PhoneSpecs object.
+        Results are memoized per (phone id, specs) when the data carries an id.
+        """
+        if self.cache_size <= 0 or phone_data.get("id") is None:
+            with stage("parse_specs"):
+                return self._parse_phone_specs(phone_data)
+
+        key = (phone_data["id"], spec_key(phone_data))
+        with self._cache_lock:
+            cached = self._specs_cache.get(key)
+            if cached is not None:
+                self._specs_cache.move_to_end(key)
+        if cached is not None:
+            count("cache_hits_total", cache="specs")
+            return cached
+
+        count("cache_misses_total", cache="specs")
+        with stage("parse_specs"):
+            specs_obj = self._parse_phone_specs(phone_data)
+
+        with self._cache_lock:
+            self._specs_cache[key] = specs_obj
+            if len(self._specs_cache) > self.cache_size:
+                self._specs_cache.popitem(last=False)
+
+        return specs_obj
+
+    def analyze_many(self, phones: Iterable[dict]) -> List[PhoneSpecs]:
+        """
+        Parse many phones in one pass.
+        Skips the per-phone cache so bulk runs don't evict entries used by the API.
+        """
+        return [
+            self._parse_phone_specs(phone_data)
+            for phone_data in phones
+            if "error" not in phone_data
+        ]
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._specs_cache.clear()
+
+    def invalidate(self, phone_ids: Iterable[int]):
+        """Drop cached specs for phones whose data changed"""
+        phone_ids = set(phone_ids)
+        with self._cache_lock:
+            for key in [key for key in self._specs_cache if key[0] in phone_ids]:
+                del self._specs_cache[key]
+
+    def _parse_phone_specs(self, phone_data: dict) -> PhoneSpecs:
+        """Build a PhoneSpecs object from raw phone data"""
         specs = phone_data.get("structured", {})
 
         ram_variants, storage_variants = self.analyzer.parse_ram_storage(
-            specs.get("RAM", ""), specs.get("Storage", "")
+            specs.get("RAM") or "", specs.get("Storage") or ""
         )
 
         return PhoneSpecs(
-            name=specs.get("Name", ""),
-            display_size=self.analyzer.parse_display_size(specs.get("Display", "")),
-            resolution=specs.get("Resolution", ""),
-            chipset=specs.get("Chipset", ""),
+            name=specs.get("Name") or "",
+            display_size=self.analyzer.parse_display_size(specs.get("Display") or ""),
+            resolution=specs.get("Resolution") or "",
+            chipset=specs.get("Chipset") or "",
             ram_variants=ram_variants,
             storage_variants=storage_variants,
-            main_camera_mp=self.analyzer.parse_camera_mp(specs.get("Camera", "")),
+            main_camera_mp=self.analyzer.parse_camera_mp(specs.get("Camera") or ""),
             battery_capacity=self.analyzer.parse_battery_capacity(
-                specs.get("Battery", "")
+                specs.get("Battery") or ""
             ),
-            release_year=self._extract_year(specs.get("Release Date", "")),
-            price_tier=self.analyzer.determine_price_tier(specs.get("Name", "")),
-            os_version=specs.get("OS", ""),
-            build_quality=self._assess_build_quality(specs.get("Name", "")),
+            release_year=self._extract_year(specs.get("Release Date") or ""),
+            price_tier=self.analyzer.determine_price_tier(specs.get("Name") or ""),
+            os_version=specs.get("OS") or "",
+            build_quality=self._assess_build_quality(specs.get("Name") or ""),
             special_features=self.analyzer.extract_special_features(phone_data),
         )
 
     def _extract_year(self, release_date: str) -> int:
         """Extract year from release date"""
-        match = re.search(r"(\d{4})", release_date)
+        match = _YEAR_RE.search(release_date)
         return int(match.group(1)) if match else 2024
 
     def _assess_build_quality(self, name: str) -> str:
         """Assess build quality based on phone tier"""
-        if any(x in name.upper() for x in ["ULTRA", "S25", "S24", "S23"]):
+        name_upper = name.upper()
+        if any(x in name_upper for x in ["ULTRA", "S25", "S24", "S23"]):
             return "Premium"
-        elif any(x in name.upper() for x in ["A56", "A55", "FE"]):
+        elif any(x in name_upper for x in ["A56", "A55", "FE"]):
             return "Good"
         else:
             return "Standard"
@@ -296,10 +417,12 @@ class ReviewGenerator:
 
         return value_props.get(specs.price_tier, value_props["mid_range"])
 
-    def generate_comprehensive_review(self, phone_name: str) -> str:
+    def generate_comprehensive_review(self, phone_name: str, db=None) -> str:
         """Generate a comprehensive, professional phone review"""
-        phone_data = get_phone_data(phone_name)
+        return self.generate_review_from_data(self.data_fetcher(phone_name, db=db))
 
+    def generate_review_from_data(self, phone_data: dict) -> str:
+        """Generate the review from already-fetched phone data"""
         if "error" in phone_data:
             return f"Unable to generate review: {phone_data['error']}"
 
@@ -386,11 +509,16 @@ class ReviewGenerator:
         return full_review
 
 
+@lru_cache(maxsize=None)
+def get_review_generator() -> ReviewGenerator:
+    """Process-wide ReviewGenerator, so the analyzer and specs cache are shared"""
+    return ReviewGenerator()
+
+
 # Enhanced main function
 def generate_review(phone_name: str) -> str:
     """
     Generate a comprehensive, professional phone review.
     This replaces the basic review_agent.py functionality.
     """
-    generator = ReviewGenerator()
-    return generator.generate_comprehensive_review(phone_name)
+    return get_review_generator().generate_comprehensive_review(phone_name)
@@ -1,6 +1,6 @@
 # api/chatbot/services.py
 
-from chatbot.chatbot import answer_query
+from chatbot.chatbot import answer_query, answer_query_async
 
 
 def generate_chatbot_response(user_question: str) -> str:
@@ -8,3 +8,10 @@ def generate_chatbot_response(user_question: str) -> str:
     Wrapper to call the chatbot pipeline.
     """
     return answer_query(user_question)
+
+
+async def generate_chatbot_response_async(user_question: str) -> str:
+    """
+    Async wrapper used by the API routes.
+    """
+    return await answer_query_async(user_question)
@@ -0,0 +1,41 @@
+# api/dependencies.py
+
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException
+from agents.coordinator import (
+    PhoneAnalysisCoordinator,
+    get_coordinator as _shared_coordinator,
+)
+from agents.leaderboard import CATEGORIES, Leaderboard, get_catalog_leaderboard
+from config import settings
+
+
+def get_coordinator() -> PhoneAnalysisCoordinator:
+    """
+    FastAPI dependency returning the process-wide coordinator.
+    Override with app.dependency_overrides to inject a different one in tests.
+    """
+    return _shared_coordinator()
+
+
+def get_leaderboard(category: str) -> Optional[Leaderboard]:
+    """
+    FastAPI dependency returning the shared catalog leaderboard. None for an
+    unknown category, which the route rejects without building the catalog.
+    """
+    if category not in CATEGORIES:
+        return None
+    return get_catalog_leaderboard()
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """FastAPI dependency guarding admin routes with PROFILING_ADMIN_TOKEN"""
+    expected = settings.PROFILING_ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin token not configured")
+    # Compared as bytes: compare_digest rejects non-ASCII str (headers are latin-1)
+    if not x_admin_token or not secrets.compare_digest(
+        x_admin_token.encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -1,12 +1,42 @@
 # api/main.py
+import asyncio
+import contextlib
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from api.middleware import TracingMiddleware
+from api.readiness import readiness, warm_up
 from api.router import api_router
+from config import settings
+from config.database import dispose_engines, pool_stats
+from config.tracing import render_prometheus
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preload models/index and warm each mounted path in the background;
+    # /health/ready reports 503 until this is done
+    features = settings.API_FEATURES if settings.WARMUP_QUERIES else []
+    tasks = [asyncio.create_task(warm_up(settings.WARMUP_COMPONENTS, features))]
+
+    # Pick up catalog changes written by crawls in other processes
+    if settings.CATALOG_SYNC_INTERVAL > 0:
+        from catalog.refresh import watch_catalog
+
+        tasks.append(asyncio.create_task(watch_catalog(settings.CATALOG_SYNC_INTERVAL)))
+    yield
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await dispose_engines()
+
 
 app = FastAPI(
     title="Samsung Phone Query API",
     description="An API for answering questions and generating reviews about Samsung phones.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 #  CORS Middleware
@@ -16,7 +46,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+#  On-demand profiling of live requests (admin only, off by default)
+if settings.PROFILING_ENABLED:
+    from api.middleware import ProfilingMiddleware
+    from api.profiling.routes import router as profiling_router
+
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(profiling_router, prefix="/admin/profile", tags=["Admin"])
+#  Per-route latency and Server-Timing (outermost, so it times everything)
+app.add_middleware(TracingMiddleware)
 
 #  Add API routes
 app.include_router(api_router)
@@ -26,3 +66,44 @@ app.include_router(api_router)
 @app.get("/")
 def read_root():
     return {"message": "Samsung Query API is live!"}
+
+
+#  Readiness: 503 until the startup warmup has loaded everything it was asked to
+@app.get("/health/ready")
+def ready():
+    summary = readiness.summary()
+    return JSONResponse(status_code=200 if summary["ready"] else 503, content=summary)
+
+
+#  Connection pool metrics
+@app.get("/health/db")
+def db_pool_health():
+    return pool_stats()
+
+
+# Cumulative pool stats, exported as Prometheus counters
+POOL_COUNTERS = {
+    "checkouts": "checkouts_total",
+    "checkout_timeouts": "checkout_timeouts_total",
+}
+
+
+#  Prometheus metrics: stage/request latency histograms, counters, pool stats
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    try:
+        pool = pool_stats()
+    except ValueError:  # no DATABASE_URL configured
+        pool = {}
+    gauges = {}
+    for prefix, stats in (("db_pool", pool), ("db_async_pool", pool.get("async", {}))):
+        gauges.update(
+            {
+                f"{prefix}_{POOL_COUNTERS.get(name, name)}": value
+                for name, value in stats.items()
+                if isinstance(value, (int, float))
+            }
+        )
+    return PlainTextResponse(
+        render_prometheus(gauges), media_type="text/plain; version=0.0.4"
+    )
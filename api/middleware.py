@@ -0,0 +1,115 @@
+# api/middleware.py
+
+import time
+
+from config import settings
+from config.tracing import (
+    end_request_trace,
+    registry,
+    request_stages,
+    server_timing,
+    start_request_trace,
+)
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware: records request latency per route template (so
+    /review/{phone_name} is one series, not one per phone) and, when
+    SERVER_TIMING_ENABLED, adds the request's stage timings as a
+    Server-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = start_request_trace()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    # Headers go out before the trace ends; stages after
+                    # this point (e.g. streaming) aren't included
+                    header = server_timing(
+                        request_stages(), time.perf_counter() - start
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request_trace(token)
+            registry.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route_template(scope),
+                status=status,
+            )
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's full path template, e.g. "/review/{phone_name}".
+    Depending on the FastAPI version, the matched route's own path may lack
+    the prefixes of the routers it was included through; those are
+    recovered from the request path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):  # e.g. "{id:int}" converters
+        return template
+    path = scope["path"]
+    if concrete and path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return template
+
+
+class ProfilingMiddleware:
+    """
+    Feeds requests to the active profiling session (see api.profiling).
+    Only installed when PROFILING_ENABLED; with no session running it costs
+    one lookup per request.
+    """
+
+    def __init__(self, app):
+        from api.profiling.services import active_session
+
+        self.app = app
+        self.active_session = active_session
+
+    async def __call__(self, scope, receive, send):
+        session = self.active_session() if scope["type"] == "http" else None
+        if session is None or not session.wants(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        state = session.request_started()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            session.request_finished(state, scope["method"], scope["path"], status)
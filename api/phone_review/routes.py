@@ -1,19 +1,27 @@
 # api/phone_review/routes.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from agents.coordinator import PhoneAnalysisCoordinator
+from config.database import get_async_db
+from api.dependencies import get_coordinator
 from api.phone_review.schemas import PhoneReviewResponse, ReviewResponse
-from api.phone_review.services import get_phone_review
+from api.phone_review.services import get_phone_review_async
 
 router = APIRouter()
 
 
 @router.get("/{phone_name}", response_model=PhoneReviewResponse)
-def get_review_specs(phone_name: str):
+async def get_review_specs(
+    phone_name: str,
+    coordinator: PhoneAnalysisCoordinator = Depends(get_coordinator),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Generate a review and display specs for a Samsung phone.
     """
-    result = get_phone_review(phone_name)
+    result = await get_phone_review_async(phone_name, coordinator, db)
 
     if result.get("error"):
         return JSONResponse(status_code=404, content={"error": result["error"]})
@@ -26,11 +34,15 @@ def get_review_specs(phone_name: str):
 
 
 @router.get("/{phone_name}", response_model=ReviewResponse)
-def get_review(phone_name: str):
+async def get_review(
+    phone_name: str,
+    coordinator: PhoneAnalysisCoordinator = Depends(get_coordinator),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Generate a review for a Samsung phone.
     """
-    result = get_phone_review(phone_name)
+    result = await get_phone_review_async(phone_name, coordinator, db)
 
     if result.get("error"):
         return JSONResponse(status_code=404, content={"error": result["error"]})
@@ -1,10 +1,23 @@
 # api/phone_review/services.py
 
-from agents.coordinator import generate_phone_summary
+from agents.coordinator import PhoneAnalysisCoordinator, get_coordinator
 
 
-def get_phone_review(phone_name: str):
+def get_phone_review(
+    phone_name: str, coordinator: PhoneAnalysisCoordinator = None, db=None
+):
     """
     Coordinates the agents and returns specs + review.
     """
-    return generate_phone_summary(phone_name)
+    coordinator = coordinator or get_coordinator()
+    return coordinator.generate_phone_summary(phone_name, db=db)
+
+
+async def get_phone_review_async(
+    phone_name: str, coordinator: PhoneAnalysisCoordinator = None, db=None
+):
+    """
+    Async variant of get_phone_review; `db` is an optional AsyncSession.
+    """
+    coordinator = coordinator or get_coordinator()
+    return await coordinator.generate_phone_summary_async(phone_name, db=db)
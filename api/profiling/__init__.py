@@ -0,0 +1,2 @@
+# profiling/__init__.py
+# Marks profiling as a sub-package
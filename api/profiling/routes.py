@@ -0,0 +1,76 @@
+# api/profiling/routes.py
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from api.dependencies import require_admin_token
+from api.profiling.schemas import ProfileRequest
+from api.profiling.services import current_session, start_session, stop_session
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+def _no_session():
+    return JSONResponse(
+        status_code=404, content={"error": "No profiling session has been started"}
+    )
+
+
+@router.post("")
+async def start_profile(payload: ProfileRequest):
+    """
+    Profile the next requests to the chatbot/review routes, for a time window
+    or a number of requests.
+    """
+    result = start_session(**payload.model_dump())
+
+    if result.get("error"):
+        return JSONResponse(status_code=409, content={"error": result["error"]})
+
+    return result
+
+
+@router.get("")
+async def profile_status():
+    """
+    Status of the running or last session, with per-request timings and
+    allocation stats.
+    """
+    session = current_session()
+    if session is None:
+        return _no_session()
+    return session.summary()
+
+
+@router.delete("")
+async def stop_profile():
+    """Stop the running session early"""
+    result = stop_session()
+
+    if result.get("error"):
+        return JSONResponse(status_code=404, content={"error": result["error"]})
+
+    return result
+
+
+@router.get("/folded", response_class=PlainTextResponse)
+async def folded_stacks():
+    """Sampled stacks in the folded format (flamegraph.pl, speedscope, inferno)"""
+    session = current_session()
+    if session is None:
+        return _no_session()
+    return PlainTextResponse(session.folded())
+
+
+@router.get("/pstats")
+async def pstats_profile(format: str = "text"):
+    """cProfile results: a text summary, or `?format=prof` for the raw dump"""
+    session = current_session()
+    if session is None:
+        return _no_session()
+    if format == "prof":
+        return Response(
+            session.pstats_dump(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": "attachment; filename=profile.prof"},
+        )
+    return PlainTextResponse(session.pstats_text())
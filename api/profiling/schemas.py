@@ -0,0 +1,16 @@
+# api/profiling/schemas.py
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileRequest(BaseModel):
+    mode: Literal["sampling", "cprofile"] = "sampling"
+    # Stop after this many seconds and/or matching requests (capped by
+    # PROFILING_MAX_SECONDS, which is also the window if neither is given)
+    seconds: Optional[float] = Field(None, gt=0)
+    requests: Optional[int] = Field(None, ge=1)
+    interval_ms: float = Field(5, ge=1, le=1000)
+    routes: List[Literal["chatbot", "review"]] = ["chatbot", "review"]
+    allocations: bool = True
@@ -0,0 +1,293 @@
+# api/profiling/services.py
+"""
+On-demand profiling of live requests, one session at a time per worker.
+
+  sampling  a background thread snapshots every thread's Python stack each
+            `interval_ms` and counts them as folded stacks ("a;b;c 12"), the
+            input format of flamegraph.pl, speedscope and inferno
+  cprofile  deterministic cProfile of the session; results as a pstats
+            summary and a .prof dump (snakeviz, flameprof). Before Python
+            3.12 cProfile only sees the event loop thread, so work done in
+            asyncio.to_thread workers (e.g. generation) is missed there.
+
+A session runs for a time window or until N matching requests finished,
+whichever comes first, and never longer than PROFILING_MAX_SECONDS. With
+`allocations`, tracemalloc runs for the session: each request records the
+memory it left allocated and its peak (exact only when it didn't overlap
+another request), and the session reports the top allocation sites.
+"""
+
+import asyncio
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import List, Optional
+
+from config import settings
+
+# Route families that can be profiled, by path prefix
+ROUTE_PREFIXES = {"chatbot": "/chatbot/", "review": "/review/"}
+
+# Leaf frames of threads that are waiting, not working (idle loop, thread
+# pools, the log listener); their samples are dropped
+IDLE_FRAMES = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+    ("concurrent.futures.thread", "_worker"),
+    ("logging.handlers", "dequeue"),
+    ("aiosqlite.core", "_connection_worker_thread"),
+}
+
+MAX_REQUEST_RECORDS = 1000
+TOP_ALLOCATIONS = 15
+
+
+def frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def fold_stack(frame) -> Optional[str]:
+    """Root-first "module:function;..." for a thread's stack, or None if idle"""
+    leaf = (frame.f_globals.get("__name__"), frame.f_code.co_name)
+    if leaf in IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler(threading.Thread):
+    """Counts folded stacks of all other threads every `interval` seconds"""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = fold_stack(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class ProfileSession:
+    """
+    One profiling session. start(), finish() and the request hooks are
+    called on the event loop thread.
+    """
+
+    def __init__(
+        self,
+        mode: str = "sampling",
+        seconds: Optional[float] = None,
+        requests: Optional[int] = None,
+        interval_ms: float = 5,
+        routes: Optional[List[str]] = None,
+        allocations: bool = True,
+    ):
+        self.mode = mode
+        self.seconds = min(
+            seconds or settings.PROFILING_MAX_SECONDS, settings.PROFILING_MAX_SECONDS
+        )
+        self.max_requests = requests
+        self.interval_ms = interval_ms
+        self.routes = routes or list(ROUTE_PREFIXES)
+        self.prefixes = tuple(ROUTE_PREFIXES[route] for route in self.routes)
+        self.allocations = allocations
+
+        self.started_at = None
+        self.finished_at = None
+        self.requests: List[dict] = []
+        self.completed = 0
+        self.in_flight = 0
+        self._starts = 0
+        self.top_allocations: List[dict] = []
+        self._sampler: Optional[StackSampler] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._owns_tracemalloc = False
+        self._baseline = None
+        self._timer = None
+        self._stats = None
+
+    @property
+    def active(self) -> bool:
+        return self.started_at is not None and self.finished_at is None
+
+    def start(self):
+        self.started_at = time.time()
+        if self.allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            self._baseline = tracemalloc.take_snapshot()
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = StackSampler(self.interval_ms / 1000)
+            self._sampler.start()
+        self._timer = asyncio.get_running_loop().call_later(self.seconds, self.finish)
+
+    def finish(self):
+        if not self.active:
+            return
+        self.finished_at = time.time()
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.create_stats()
+            self._stats = self._profiler.stats
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self.allocations:
+            snapshot = tracemalloc.take_snapshot()
+            self.top_allocations = [
+                {
+                    "site": str(stat.traceback),
+                    "size_kb": round(stat.size_diff / 1024, 1),
+                    "count": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(self._baseline, "lineno")[
+                    :TOP_ALLOCATIONS
+                ]
+            ]
+            self._baseline = None
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+
+    # --------- Request hooks (see api.middleware.ProfilingMiddleware) ---------
+
+    def wants(self, path: str) -> bool:
+        return self.active and path.startswith(self.prefixes)
+
+    def request_started(self) -> dict:
+        state = {"start": time.perf_counter(), "overlapped": self.in_flight > 0}
+        if self.allocations and tracemalloc.is_tracing():
+            if not self.in_flight:
+                tracemalloc.reset_peak()
+            state["memory"] = tracemalloc.get_traced_memory()[0]
+        self.in_flight += 1
+        self._starts += 1
+        state["starts"] = self._starts
+        return state
+
+    def request_finished(self, state: dict, method: str, path: str, status: int):
+        self.in_flight -= 1
+        # Another request ran at some point during this one
+        overlapped = (
+            state["overlapped"] or self.in_flight > 0 or self._starts != state["starts"]
+        )
+        record = {
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round((time.perf_counter() - state["start"]) * 1000, 2),
+            "overlapped": overlapped,
+        }
+        if "memory" in state and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            record["alloc_net_kb"] = round((current - state["memory"]) / 1024, 1)
+            record["alloc_peak_kb"] = round(max(0, peak - state["memory"]) / 1024, 1)
+        if len(self.requests) < MAX_REQUEST_RECORDS:
+            self.requests.append(record)
+
+        self.completed += 1
+        if self.max_requests and self.completed >= self.max_requests:
+            self.finish()
+
+    # --------- Results ---------
+
+    def folded(self) -> str:
+        """Folded stacks, heaviest first (sampling mode)"""
+        if self._sampler is None:
+            return ""
+        return "".join(
+            f"{stack} {n}\n" for stack, n in self._sampler.stacks.most_common()
+        )
+
+    def pstats_text(self, limit: int = 40) -> str:
+        """Top functions by cumulative time (cprofile mode, once finished)"""
+        if self._stats is None:
+            return ""
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def pstats_dump(self) -> bytes:
+        """The profile in the .prof format pstats.Stats(path) loads"""
+        return marshal.dumps(self._stats) if self._stats is not None else b""
+
+    def summary(self) -> dict:
+        end = self.finished_at or time.time()
+        summary = {
+            "mode": self.mode,
+            "active": self.active,
+            "routes": self.routes,
+            "started_at": self.started_at,
+            "elapsed_seconds": round(end - self.started_at, 3),
+            "window_seconds": self.seconds,
+            "max_requests": self.max_requests,
+            "requests_profiled": self.completed,
+            "requests": self.requests,
+        }
+        if self._sampler is not None:
+            summary["samples"] = self._sampler.samples
+            summary["interval_ms"] = self.interval_ms
+        if self.allocations:
+            summary["top_allocations"] = self.top_allocations
+        return summary
+
+
+_session: Optional[ProfileSession] = None
+
+
+def current_session() -> Optional[ProfileSession]:
+    """The running or most recent session"""
+    return _session
+
+
+def active_session() -> Optional[ProfileSession]:
+    session = _session
+    return session if session is not None and session.active else None
+
+
+def start_session(**options) -> dict:
+    """Start a session on the running loop, unless one is already active"""
+    global _session
+    if active_session() is not None:
+        return {"error": "A profiling session is already running"}
+    session = ProfileSession(**options)
+    session.start()
+    _session = session
+    return session.summary()
+
+
+def stop_session() -> dict:
+    session = current_session()
+    if session is None:
+        return {"error": "No profiling session has been started"}
+    session.finish()
+    return session.summary()
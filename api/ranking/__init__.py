@@ -0,0 +1,2 @@
+# ranking/__init__.py
+# Marks ranking as a sub-package
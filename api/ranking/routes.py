@@ -0,0 +1,38 @@
+# api/ranking/routes.py
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from agents.leaderboard import Leaderboard
+from api.dependencies import get_leaderboard
+from api.ranking.schemas import RankingResponse
+from api.ranking.services import get_ranking
+
+router = APIRouter()
+
+
+@router.get("/{category}", response_model=RankingResponse)
+async def rank_phones(
+    category: str,
+    limit: int = Query(10, ge=1, le=100),
+    price_tier: Optional[str] = None,
+    min_year: Optional[int] = None,
+    max_year: Optional[int] = None,
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+):
+    """
+    Rank the whole catalog by category: overall, camera, battery, performance, display or value.
+    """
+    result = get_ranking(
+        category,
+        limit=limit,
+        price_tier=price_tier,
+        min_year=min_year,
+        max_year=max_year,
+        leaderboard=leaderboard,
+    )
+
+    if result.get("error"):
+        return JSONResponse(status_code=404, content={"error": result["error"]})
+
+    return RankingResponse(**result)
@@ -0,0 +1,16 @@
+# api/ranking/schemas.py
+
+from typing import List
+from pydantic import BaseModel
+
+
+class RankedPhone(BaseModel):
+    rank: int
+    name: str
+    score: float
+
+
+class RankingResponse(BaseModel):
+    category: str
+    total: int
+    phones: List[RankedPhone]
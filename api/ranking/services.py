@@ -0,0 +1,32 @@
+# api/ranking/services.py
+
+from typing import Optional
+from agents.leaderboard import CATEGORIES, Leaderboard, get_catalog_leaderboard
+
+
+def get_ranking(
+    category: str,
+    limit: int = 10,
+    price_tier: Optional[str] = None,
+    min_year: Optional[int] = None,
+    max_year: Optional[int] = None,
+    leaderboard: Optional[Leaderboard] = None,
+) -> dict:
+    """
+    Returns the catalog-wide leaderboard for a category, optionally filtered.
+    """
+    if category not in CATEGORIES:
+        return {
+            "error": f"Unknown category '{category}'. Choose one of: {', '.join(CATEGORIES)}"
+        }
+
+    leaderboard = leaderboard or get_catalog_leaderboard()
+    mask = leaderboard.filter_mask(
+        price_tier=price_tier, min_year=min_year, max_year=max_year
+    )
+
+    return {
+        "category": category,
+        "total": len(leaderboard.matrix) if mask is None else int(mask.sum()),
+        "phones": leaderboard.top(category, limit=limit, mask=mask),
+    }
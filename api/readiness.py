@@ -0,0 +1,162 @@
+# api/readiness.py
+"""
+Startup warmup and readiness. At startup the app preloads the components
+listed in WARMUP_COMPONENTS (encoder, FAISS index, answer generator) and,
+with WARMUP_QUERIES, sends a few queries through each mounted feature's path
+so first-call costs (model loading, index and cache builds, connection
+pools) are paid before traffic arrives. This runs in the background; until
+every step is done /health/ready answers 503, with per-component status and
+load times.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from config.logger import get_logger
+
+logger = get_logger(__name__)
+
+WARMUP_CHAT_QUERIES = [
+    "Which Samsung phone has the best camera?",  # superlative ranking
+    "good camera phone with long battery life",  # vector/keyword search
+]
+
+
+# --------- Preloads (blocking, run in a worker thread) ---------
+
+
+def preload_encoder():
+    from chatbot.embeddings import get_embedding_model
+
+    get_embedding_model().encode(["warmup"])
+
+
+def preload_index():
+    from chatbot.retriever import load_faiss_index
+
+    index, _ = load_faiss_index()
+    if index is None:
+        raise RuntimeError("FAISS index files not found")
+
+
+def preload_generator():
+    from chatbot.chatbot import get_answer_generator
+
+    get_answer_generator()
+
+
+PRELOADS: Dict[str, Callable[[], None]] = {
+    "encoder": preload_encoder,
+    "index": preload_index,
+    "generator": preload_generator,
+}
+
+
+# --------- Warmup queries, per API feature ---------
+
+
+def _any_phone_name() -> Optional[str]:
+    from sqlalchemy import select
+
+    from catalog.snapshot import active_snapshot
+    from config.database import session_scope
+    from database.models import Phone
+
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        return next((record.name for record in snapshot.records), None)
+    with session_scope() as db:
+        return db.scalar(select(Phone.name).order_by(Phone.id).limit(1))
+
+
+async def warm_chatbot():
+    from chatbot.chatbot import answer_query_async
+
+    for query in WARMUP_CHAT_QUERIES:
+        await answer_query_async(query)
+
+
+async def warm_review():
+    from agents.coordinator import get_coordinator
+
+    name = await asyncio.to_thread(_any_phone_name)
+    if name is None:
+        return "skipped"  # empty catalog
+    await get_coordinator().generate_phone_summary_async(name)
+
+
+async def warm_ranking():
+    from agents.leaderboard import get_catalog_leaderboard
+
+    await asyncio.to_thread(get_catalog_leaderboard)
+
+
+WARMUPS = {
+    "chatbot": warm_chatbot,
+    "review": warm_review,
+    "ranking": warm_ranking,
+}
+
+
+class Readiness:
+    """Per-component startup state; ready once every planned step succeeded"""
+
+    def __init__(self):
+        self.components: Dict[str, dict] = {}
+        self.finished = False
+
+    def plan(self, names: List[str]):
+        self.components = {name: {"status": "pending"} for name in names}
+        self.finished = False
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and all(
+            c["status"] in ("ready", "skipped") for c in self.components.values()
+        )
+
+    def summary(self) -> dict:
+        return {"ready": self.ready, "components": self.components}
+
+    async def run_step(self, name: str, step: Callable):
+        component = self.components[name]
+        component["status"] = "loading"
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(step):
+                outcome = await step()
+            else:
+                outcome = await asyncio.to_thread(step)
+            component["status"] = outcome or "ready"
+        except Exception as e:
+            component["status"] = "failed"
+            component["error"] = f"{type(e).__name__}: {e}"
+            logger.exception("❌ Startup step %s failed", name)
+        component["seconds"] = round(time.perf_counter() - start, 3)
+
+
+readiness = Readiness()
+
+
+async def warm_up(components: List[str], features: List[str]):
+    """
+    Preload `components`, then run the warmup queries of `features`.
+    Unknown component names fail their step rather than the app.
+    """
+    steps = [(name, PRELOADS.get(name)) for name in components]
+    steps += [(f"warmup_{f}", WARMUPS[f]) for f in features if f in WARMUPS]
+    readiness.plan([name for name, _ in steps])
+
+    for name, step in steps:
+        if step is None:
+            readiness.components[name] = {
+                "status": "failed",
+                "error": f"Unknown warmup component '{name}'",
+            }
+            continue
+        await readiness.run_step(name, step)
+
+    readiness.finished = True
+    if steps:
+        logger.info("✅ Startup warmup finished: %s", readiness.summary())
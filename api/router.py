@@ -1,12 +1,34 @@
 # api/router.py
 
+import importlib
+
 from fastapi import APIRouter
-from api.chatbot.routes import router as chatbot_router
+from config import settings
+
+# Feature routers as (module, prefix, tag). Only the features listed in
+# API_FEATURES are imported and mounted, so e.g. a review-only worker never
+# imports the chatbot stack.
+FEATURE_ROUTERS = {
+    "chatbot": ("api.chatbot.routes", "/chatbot", "Chatbot"),
+    "review": ("api.phone_review.routes", "/review", "Phone Review"),
+    "ranking": ("api.ranking.routes", "/ranking", "Ranking"),
+}
+
+
+def build_api_router(features=None) -> APIRouter:
+    if features is None:
+        features = settings.API_FEATURES
+    router = APIRouter()
 
-from api.phone_review.routes import router as review_router
+    # Mount feature-specific routers
+    for feature in features:
+        if feature not in FEATURE_ROUTERS:
+            raise ValueError(f"Unknown API feature '{feature}'")
+        module, prefix, tag = FEATURE_ROUTERS[feature]
+        router.include_router(
+            importlib.import_module(module).router, prefix=prefix, tags=[tag]
+        )
+    return router
 
-api_router = APIRouter()
 
-# Mount feature-specific routers
-api_router.include_router(chatbot_router, prefix="/chatbot", tags=["Chatbot"])
-api_router.include_router(review_router, prefix="/review", tags=["Phone Review"])
+api_router = build_api_router()
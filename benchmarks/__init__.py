@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Marks this folder as a Python package
@@ -0,0 +1,179 @@
+# benchmarks/catalog.py
+"""
+Synthetic Samsung-style catalogs. Phones look like scraper output (structured
+fields plus a GSMArena-style spec table) and are written through the normal
+ingest path, so the benchmarks run against the same rows, spec documents and
+hashes a real crawl produces. Generation is deterministic per (index, seed).
+"""
+
+import random
+import time
+from typing import Iterator, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from database.migrations import run_migrations
+from scraper.ingest import bulk_upsert_phones
+
+# (series, model numbers, variants) roughly following Samsung's line-up
+SERIES = [
+    ("S", range(20, 27), ["", "+", " Ultra", " FE"]),
+    ("A", range(1, 100), ["", "s", " 5G", "e"]),
+    ("M", range(10, 60), ["", "s", " 5G"]),
+    ("F", range(10, 65), ["", " 5G"]),
+    ("Note", range(8, 21), ["", "+", " Ultra", " Lite"]),
+    ("Z Fold", range(1, 8), ["", " Special Edition"]),
+    ("Z Flip", range(1, 8), ["", " FE", " 5G"]),
+    ("Tab S", range(6, 11), ["", "+", " Ultra", " FE", " Lite"]),
+    ("Tab A", range(7, 10), ["", " Lite", " 10.1"]),
+    ("XCover", range(4, 8), ["", " Pro"]),
+]
+EDITIONS = ["", " Duos", " LTE", " (2026)", " Enterprise Edition", " Neo", " Prime"]
+
+CHIPSETS = [
+    ("Qualcomm SM8750-AB Snapdragon 8 Elite (3 nm)", "Octa-core (2x4.47 GHz)", 2025),
+    ("Qualcomm SM8650-AC Snapdragon 8 Gen 3 (4 nm)", "Octa-core (1x3.39 GHz)", 2024),
+    ("Exynos 2400 (4 nm)", "Deca-core (1x3.2 GHz Cortex-X4)", 2024),
+    ("Exynos 2200 (4 nm)", "Octa-core (1x2.8 GHz Cortex-X2)", 2022),
+    ("Exynos 1580 (4 nm)", "Octa-core (1x2.9 GHz Cortex-A720)", 2025),
+    ("Exynos 1380 (5 nm)", "Octa-core (4x2.4 GHz Cortex-A78)", 2023),
+    ("Qualcomm SM6375 Snapdragon 695 5G (6 nm)", "Octa-core (2x2.2 GHz)", 2022),
+    ("Mediatek Dimensity 6300 (6 nm)", "Octa-core (2x2.4 GHz Cortex-A76)", 2024),
+    ("Mediatek Helio G99 (6 nm)", "Octa-core (2x2.2 GHz Cortex-A76)", 2023),
+    ("Exynos 850 (8 nm)", "Octa-core (8x2.0 GHz Cortex-A55)", 2021),
+]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July"]
+MONTHS += ["August", "September", "October", "November", "December"]
+COLORS = ["Titanium Black", "Titanium Gray", "Icyblue", "Mint", "Navy", "Lavender"]
+
+
+def _base_names() -> List[str]:
+    return [
+        f"Samsung Galaxy {series}{number}{variant}"
+        for series, numbers, variants in SERIES
+        for number in numbers
+        for variant in variants
+    ]
+
+
+BASE_NAMES = _base_names()
+
+
+def phone_name(i: int) -> str:
+    """Unique name for phone i: base models first, then editions, then revisions"""
+    base = BASE_NAMES[i % len(BASE_NAMES)]
+    edition = EDITIONS[(i // len(BASE_NAMES)) % len(EDITIONS)]
+    revision = i // (len(BASE_NAMES) * len(EDITIONS))
+    return f"{base}{edition}" + (f" Rev {revision}" if revision else "")
+
+
+def synthetic_phone(i: int, seed: int = 0) -> dict:
+    """Phone i as the scraper would return it (structured fields + specifications)"""
+    rng = random.Random(seed * 1_000_003 + i)
+    name = phone_name(i)
+    chipset, cpu, chip_year = rng.choice(CHIPSETS)
+    year = chip_year + rng.choice([0, 0, 1])
+    month, day = rng.choice(MONTHS), rng.randint(1, 28)
+    size = rng.choice([5.8, 6.1, 6.4, 6.6, 6.7, 6.8, 6.9, 7.6, 8.0, 11.0, 12.4])
+    width, height = rng.choice([(720, 1600), (1080, 2340), (1440, 3120)])
+    ram, storage = rng.choice([4, 6, 8, 12, 16]), rng.choice([64, 128, 256, 512])
+    main_mp = rng.choice([12, 48, 50, 64, 108, 200])
+    battery = rng.choice([3700, 4000, 4400, 4500, 5000, 6000, 7000])
+    weight = rng.randint(160, 260)
+    has_5g = "5G" in name or chip_year >= 2022
+
+    technology = "GSM / HSPA / LTE" + (" / 5G" if has_5g else "")
+    sections = [
+        ("Network", "Technology", technology),
+        ("Network", "2G bands", "GSM 850 / 900 / 1800 / 1900 - SIM 1 & SIM 2"),
+        ("Network", "4G bands", "1, 2, 3, 4, 5, 7, 8, 12, 17, 20, 28, 38, 40, 41, 66"),
+        ("Network", "Speed", "HSPA, LTE" + (", 5G" if has_5g else "")),
+        ("Launch", "Announced", f"{year}, {month} {day}"),
+        ("Launch", "Status", f"Available. Released {year}, {month} {day}"),
+        (
+            "Body",
+            "Dimensions",
+            f"{140 + size * 3:.1f} x {70 + size:.1f} x {7 + rng.random():.1f} mm",
+        ),
+        ("Body", "Weight", f"{weight} g ({weight / 28.35:.2f} oz)"),
+        ("Body", "Build", "Glass front (Gorilla Glass Victus 2), aluminum frame"),
+        ("Body", "SIM", "Nano-SIM + eSIM"),
+        ("Display", "Type", "Dynamic AMOLED 2X, 120Hz, HDR10+"),
+        ("Display", "Size", f"{size} inches, {size * 16:.1f} cm2"),
+        ("Display", "Resolution", f"{width} x {height} pixels"),
+        ("Platform", "OS", f"Android {year - 2010}, One UI {year - 2018}"),
+        ("Platform", "Chipset", chipset),
+        ("Platform", "CPU", cpu),
+        ("Memory", "Card slot", rng.choice(["No", "microSDXC (dedicated slot)"])),
+        ("Memory", "Internal", f"{storage}GB {ram}GB RAM"),
+        ("Main Camera", "Triple", f"{main_mp} MP, f/1.8, (wide), PDAF, OIS"),
+        ("Main Camera", "Video", "4K@30/60fps, 1080p@30/60/240fps"),
+        ("Selfie camera", "Single", f"{rng.choice([10, 12, 13, 32])} MP, f/2.2"),
+        ("Sound", "Loudspeaker", "Yes, with stereo speakers"),
+        ("Comms", "WLAN", "Wi-Fi 802.11 a/b/g/n/ac/6e"),
+        ("Comms", "Bluetooth", f"5.{rng.randint(0, 4)}, A2DP, LE"),
+        ("Comms", "NFC", rng.choice(["Yes", "No"])),
+        ("Features", "Sensors", "Fingerprint (under display), accelerometer, gyro"),
+        ("Battery", "Type", f"Li-Ion {battery} mAh"),
+        ("Battery", "Charging", f"{rng.choice([15, 25, 45])}W wired"),
+        ("Misc", "Colors", ", ".join(rng.sample(COLORS, 3))),
+        ("Misc", "Price", f"$ {rng.randint(150, 1900)}.99"),
+    ]
+    specifications = {f"{section} - {key}": value for section, key, value in sections}
+
+    slug = name.lower().replace(" ", "_").replace("+", "_plus").replace("(", "")
+    slug = slug.replace(")", "")
+    return {
+        "name": name,
+        "url": f"https://www.gsmarena.com/{slug}-{i}.php",
+        "image": f"https://fdn2.gsmarena.com/vv/bigpic/{slug}.jpg",
+        "release_date": specifications["Launch - Announced"],
+        "display_size": specifications["Display - Size"],
+        "resolution": specifications["Display - Resolution"],
+        "os": specifications["Platform - OS"],
+        "chipset": chipset,
+        "ram": specifications["Memory - Internal"],
+        "storage": specifications["Memory - Internal"],
+        "camera_main": specifications["Main Camera - Triple"],
+        "battery": specifications["Battery - Type"],
+        "network": technology,
+        "dimensions": specifications["Body - Dimensions"],
+        "weight": specifications["Body - Weight"],
+        "specifications": specifications,
+    }
+
+
+def synthetic_catalog(count: int, seed: int = 0) -> Iterator[dict]:
+    for i in range(count):
+        yield synthetic_phone(i, seed)
+
+
+def catalog_size(database_url: str) -> int:
+    """Phones already in the database (0 if the schema doesn't exist yet)"""
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM phones")).scalar()
+    except Exception:
+        return 0
+    finally:
+        engine.dispose()
+
+
+def generate_catalog(
+    database_url: str, count: int, seed: int = 0, batch_size: int = 2000
+) -> dict:
+    """
+    Migrate the database and ingest `count` synthetic phones (one catalog
+    version). Returns the ingest counts and how long it took.
+    """
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    start = time.perf_counter()
+    with Session(engine) as db:
+        counts = bulk_upsert_phones(
+            db, synthetic_catalog(count, seed), batch_size=batch_size, catalog_version=1
+        )
+    engine.dispose()
+    return {**counts, "seconds": round(time.perf_counter() - start, 3)}
@@ -0,0 +1,199 @@
+# benchmarks/load.py
+"""
+Open-loop load test of the API, in process and with no network: requests go
+through httpx's ASGI transport straight into the app. Requests are sent on a
+fixed schedule (--qps) whether or not earlier ones have finished, and latency
+is measured from each request's scheduled send time, so a saturated server
+shows up as growing latency instead of a quietly lower request rate.
+
+By default the app runs on the deterministic model stand-ins
+(EMBEDDING_BACKEND=hash, GENERATOR_BACKEND=template) against a synthetic
+catalog, so no model weights or downloads are needed. If faiss is installed,
+a vector index of the catalog is built with the hash embedder first.
+
+Usage:
+    python -m benchmarks.load --qps 20 --duration 10
+    python -m benchmarks.load --routes chat --qps 50 --generator-latency-ms 200
+    python -m benchmarks.load --database-url postgresql://.../bench --phones 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+CHAT_QUESTIONS = [
+    "Which Samsung phone has the best camera?",
+    "Samsung phone with the biggest battery",
+    "What is the latest Samsung phone?",
+    "good camera phone for travel",
+    "long battery life",
+    "fast performance snapdragon",
+    "Samsung phone with a big display",
+]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max in ms, from latencies in seconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 2)
+
+    return {"p50_ms": at(0.5), "p90_ms": at(0.9), "p99_ms": at(0.99), "max_ms": at(1.0)}
+
+
+async def run_load(
+    client, make_request: Callable[[int], tuple], qps: float, duration: float
+) -> dict:
+    """
+    Send round(qps * duration) requests on a fixed schedule. make_request(i)
+    returns (method, path, json body or None). Returns latencies (from the
+    scheduled send time), status counts and the achieved rate.
+    """
+    total = max(1, round(qps * duration))
+    latencies, statuses = [], {}
+
+    async def send(i: int, scheduled: float):
+        method, path, body = make_request(i)
+        try:
+            response = await client.request(method, path, json=body)
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        latencies.append(time.perf_counter() - scheduled)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        scheduled = start + i / qps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(i, scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "target_qps": qps,
+        "achieved_qps": round(total / elapsed, 1),
+        "statuses": statuses,
+        **percentiles(latencies),
+    }
+
+
+def route_requests(route: str, names: List[str]) -> Callable[[int], tuple]:
+    from urllib.parse import quote
+
+    if route == "chat":
+        return lambda i: (
+            "POST",
+            "/chatbot/query",
+            {"question": CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)]},
+        )
+    return lambda i: ("GET", f"/review/{quote(names[i % len(names)])}", None)
+
+
+def build_vector_index() -> str:
+    """Build the FAISS index with the configured embedder, if faiss is available"""
+    try:
+        import faiss  # noqa: F401
+    except ImportError:
+        return "skipped (faiss not installed): chat uses the keyword fallback"
+
+    from chatbot.embeddings import build_faiss_index
+
+    build_faiss_index()
+    return "built"
+
+
+async def drive(app, routes: List[str], names: List[str], args) -> dict:
+    import httpx
+
+    from config.database import get_async_engine
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load", timeout=None
+        ) as client:
+            for route in routes:
+                make_request = route_requests(route, names)
+                # Warm-up: first-use loading (models, indexes, caches) isn't load
+                await run_load(client, make_request, qps=args.qps, duration=0.5)
+                print(f"🚦 {route}: {args.qps:g} req/s for {args.duration:g}s...")
+                results[route] = await run_load(
+                    client, make_request, args.qps, args.duration
+                )
+    finally:
+        # Pooled async connections belong to this event loop
+        await get_async_engine().dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", nargs="+", choices=["chat", "review"])
+    parser.add_argument("--qps", type=float, default=20)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per route")
+    parser.add_argument("--phones", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--database-url",
+        help="Database to generate into / load (default: a temp SQLite file)",
+    )
+    parser.add_argument("--generator-latency-ms", type=float)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+    routes = args.routes or ["chat", "review"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read when config.settings is first imported
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp}/load.db"
+        os.environ["VECTOR_INDEX_DIR"] = os.path.join(tmp, "index")
+        os.environ.setdefault("EMBEDDING_BACKEND", "hash")
+        os.environ.setdefault("GENERATOR_BACKEND", "template")
+        os.environ.setdefault("LOG_LEVEL", "ERROR")
+        if args.generator_latency_ms is not None:
+            os.environ["FAKE_GENERATOR_LATENCY_MS"] = str(args.generator_latency_ms)
+
+        from benchmarks.run import prepare_catalog
+
+        prepare_catalog(os.environ["DATABASE_URL"], args.phones, args.seed)
+
+        from api.main import app
+        from benchmarks.suites import BenchContext
+        from config import settings
+
+        print(f"🔍 Vector index: {build_vector_index()}")
+        names = BenchContext(phones=args.phones, seed=args.seed).sample_names(200)
+        results = asyncio.run(drive(app, routes, names, args))
+
+    print(
+        f"\nbackends: embedding={settings.EMBEDDING_BACKEND}, "
+        f"generator={settings.GENERATOR_BACKEND} "
+        f"({settings.FAKE_GENERATOR_LATENCY_MS:g} ms/answer)"
+    )
+    for route, stats in results.items():
+        print(
+            f"  {route:<7} {stats['achieved_qps']:>7} req/s (target {stats['target_qps']:g})"
+            f"  p50 {stats['p50_ms']} ms  p90 {stats['p90_ms']} ms"
+            f"  p99 {stats['p99_ms']} ms  max {stats['max_ms']} ms  {stats['statuses']}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/results.py
+"""
+Benchmark result files and baseline comparison. A result file is JSON:
+
+    {"meta": {"phones": ..., "backend": ..., ...},
+     "results": {"<suite>": {"<metric>": value, ...}, ...}}
+
+Baselines are result files kept under benchmarks/baselines/, one per
+(backend, catalog size), e.g. baselines/sqlite-1000.json.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Latency differences below this are timer noise, not regressions
+NOISE_FLOOR_MS = 0.05
+
+# Compared metrics; tail latencies and means are too noisy to gate on
+LOWER_IS_BETTER = ("_p50_ms", "_seconds")
+HIGHER_IS_BETTER = ("_per_second", "_rate")
+
+
+def calibrate(rounds: int = 5) -> float:
+    """
+    Best time of a fixed pure-Python workload. Stored with the results so a
+    comparison can scale timings by how fast the machine is running today.
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        table = {}
+        for i in range(200_000):
+            table[f"galaxy-{i % 5000}"] = table.get(f"galaxy-{i % 5000}", 0) + i
+        sorted(table.items(), key=lambda item: item[1])
+        best = min(best, time.perf_counter() - start)
+    return round(best, 5)
+
+
+def baseline_path(backend: str, phones: int) -> str:
+    return os.path.join(BASELINE_DIR, f"{backend}-{phones}.json")
+
+
+def write_results(path: str, results: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def read_results(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def metric_direction(metric: str) -> Optional[int]:
+    """+1 if higher is better, -1 if lower is better, None if not comparable"""
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return None
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float) -> List[Dict]:
+    """
+    Metrics that got worse than the baseline by more than `tolerance`
+    (a fraction, e.g. 0.25). Metrics missing from either side are skipped.
+    Timings are first scaled by the two runs' calibration times, so a
+    uniformly slower (or busier) machine doesn't read as a regression.
+    """
+    speed = 1.0
+    current_cal = current["meta"].get("calibration_seconds")
+    baseline_cal = baseline["meta"].get("calibration_seconds")
+    if current_cal and baseline_cal:
+        speed = current_cal / baseline_cal
+
+    regressions = []
+    for suite, metrics in current["results"].items():
+        base_metrics = baseline["results"].get(suite, {})
+        for metric, value in metrics.items():
+            direction = metric_direction(metric)
+            base = base_metrics.get(metric)
+            if direction is None or not isinstance(base, (int, float)) or not base:
+                continue
+            if not isinstance(value, (int, float)):
+                continue
+
+            # Positive change = worse, as a fraction of the (scaled) baseline
+            if direction > 0:
+                expected = base / speed
+                change = (expected - value) / expected
+            else:
+                expected = base * speed
+                change = (value - expected) / expected
+            if metric.endswith("_ms") and abs(value - expected) < NOISE_FLOOR_MS:
+                continue
+            if change > tolerance:
+                regressions.append(
+                    {
+                        "suite": suite,
+                        "metric": metric,
+                        "baseline": base,
+                        "current": value,
+                        "change": round(change, 4),
+                    }
+                )
+    return regressions
@@ -0,0 +1,188 @@
+# benchmarks/run.py
+"""
+End-to-end benchmarks over a synthetic catalog.
+
+Generates (or reuses) a catalog of --phones synthetic phones, runs the
+selected suites against it (--repeat times, keeping per-metric medians),
+writes the metrics as JSON and compares them with the stored baseline for
+that backend and catalog size. Exits with status 1 if any metric regressed by
+more than --tolerance.
+
+Usage:
+    python -m benchmarks.run --phones 1000
+    python -m benchmarks.run --phones 100000 --suites index_build name_resolution
+    python -m benchmarks.run --phones 1000 --save-baseline
+    python -m benchmarks.run --database-url postgresql://.../bench --phones 1000000
+"""
+
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SUITE_NAMES = ["index_build", "retrieval", "name_resolution", "review", "api"]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def prepare_catalog(database_url: str, phones: int, seed: int) -> dict:
+    from benchmarks.catalog import catalog_size, generate_catalog
+
+    existing = catalog_size(database_url)
+    if existing == phones:
+        return {"reused": True}
+    if existing:
+        raise SystemExit(
+            f"❌ {database_url} already holds {existing} phones; "
+            f"use an empty database for a {phones}-phone catalog"
+        )
+    print(f"🏗️ Generating {phones} synthetic phones...")
+    return generate_catalog(database_url, phones, seed)
+
+
+def median_metrics(runs: list) -> dict:
+    """Per-metric median over repeated runs of a suite (non-numbers from the first)"""
+    merged = dict(runs[0])
+    for metric, value in runs[0].items():
+        if isinstance(value, (int, float)):
+            merged[metric] = statistics.median(r[metric] for r in runs)
+    return merged
+
+
+def run(args, database_url: str) -> dict:
+    # The app reads its database from the environment when the engine is
+    # first created, so this has to happen before the suites are imported
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["CATALOG_SNAPSHOT_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Model-free unless asked otherwise (see benchmarks.load)
+    os.environ.setdefault("EMBEDDING_BACKEND", "hash")
+    os.environ.setdefault("GENERATOR_BACKEND", "template")
+
+    generated = prepare_catalog(database_url, args.phones, args.seed)
+
+    from benchmarks.results import calibrate
+    from benchmarks.suites import SUITES, BenchContext
+    from sqlalchemy.engine import make_url
+
+    ctx = BenchContext(
+        phones=args.phones,
+        seed=args.seed,
+        samples=args.samples,
+        api_requests=args.api_requests,
+        api_concurrency=args.concurrency,
+    )
+    results = {}
+    for name in args.suites:
+        print(f"⏱️ {name}...")
+        start = time.perf_counter()
+        results[name] = median_metrics([SUITES[name](ctx) for _ in range(args.repeat)])
+        print(f"   done in {time.perf_counter() - start:.1f}s")
+
+    return {
+        "meta": {
+            "phones": args.phones,
+            "backend": make_url(database_url).get_backend_name(),
+            "seed": args.seed,
+            "samples": args.samples,
+            "repeat": args.repeat,
+            "generated": generated,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "calibration_seconds": calibrate(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def print_results(results: dict):
+    for suite, metrics in results["results"].items():
+        print(f"\n{suite}")
+        for metric, value in metrics.items():
+            print(f"  {metric:<40} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--phones", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--database-url",
+        help="Database to generate into / benchmark (default: a temp SQLite file)",
+    )
+    parser.add_argument("--suites", nargs="+", choices=SUITE_NAMES, default=SUITE_NAMES)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--api-requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per suite; metrics are medians"
+    )
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Baseline JSON (default: stored baseline)")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store results as the baseline"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{tmp}/bench.db"
+        results = run(args, database_url)
+
+    from benchmarks.results import (
+        baseline_path,
+        compare_results,
+        read_results,
+        write_results,
+    )
+
+    print_results(results)
+    if args.output:
+        write_results(args.output, results)
+        print(f"\n📄 Results written to {args.output}")
+
+    meta = results["meta"]
+    stored = baseline_path(meta["backend"], meta["phones"])
+    if args.save_baseline:
+        write_results(stored, results)
+        print(f"📌 Baseline saved to {stored}")
+        return
+
+    baseline = read_results(args.baseline or stored)
+    if baseline is None:
+        print(f"\nℹ️ No baseline at {args.baseline or stored}; nothing to compare")
+        return
+
+    regressions = compare_results(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} of the baseline")
+        return
+    print(f"\n❌ {len(regressions)} regressions beyond {args.tolerance:.0%}:")
+    for r in regressions:
+        print(
+            f"  {r['suite']}.{r['metric']}: {r['baseline']} -> {r['current']} "
+            f"({r['change']:+.0%})"
+        )
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+# benchmarks/suites.py
+"""
+Benchmark suites. Each suite takes a BenchContext and returns a flat dict of
+metrics. Metric names carry their unit; benchmarks.results decides from the name
+which ones are compared against the baseline (p95/mean latencies, counts and
+skip reasons are informational).
+
+Suites read through the app's own code paths, so DATABASE_URL must point at
+the generated catalog before this module is imported (benchmarks.run does).
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from config.database import session_scope
+from database.models import Phone
+
+
+@dataclass
+class BenchContext:
+    phones: int
+    seed: int = 0
+    samples: int = 200  # timed calls per latency metric
+    api_requests: int = 300
+    api_concurrency: int = 16
+
+    def sample_names(self, count: int) -> List[str]:
+        """Names of `count` random phones from the catalog (seeded)"""
+        with session_scope() as db:
+            ids = [row.id for row in db.query(Phone.id)]
+            rng = random.Random(self.seed)
+            picked = [rng.choice(ids) for _ in range(count)]
+            names = dict(db.query(Phone.id, Phone.name).filter(Phone.id.in_(picked)))
+        return [names[i] for i in picked]
+
+
+def latency_metrics(prefix: str, samples: List[float]) -> Dict[str, float]:
+    """p50/p95/mean in ms, from per-call seconds"""
+    ordered = sorted(samples)
+    return {
+        f"{prefix}_p50_ms": round(statistics.median(ordered) * 1000, 4),
+        f"{prefix}_p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 4),
+        f"{prefix}_mean_ms": round(statistics.mean(ordered) * 1000, 4),
+    }
+
+
+def time_calls(fn: Callable, inputs) -> List[float]:
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def timed(fn: Callable, repeat: int = 3):
+    """(last result, best of `repeat` wall times in seconds)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, round(best, 4)
+
+
+# --------- Suites ---------
+
+
+def bench_index_build(ctx: BenchContext) -> dict:
+    """Building the in-memory catalog structures from the database"""
+    from agents.leaderboard import build_catalog_leaderboard
+    from agents.name_resolver import build_resolver_from_db
+    from catalog.snapshot import load_snapshot_from_db
+    from chatbot.attribute_index import build_attribute_index
+
+    with session_scope() as db:
+        _, snapshot_seconds = timed(lambda: load_snapshot_from_db(db))
+        _, resolver_seconds = timed(lambda: build_resolver_from_db(db))
+    _, attribute_seconds = timed(build_attribute_index)
+    _, leaderboard_seconds = timed(build_catalog_leaderboard)
+
+    metrics = {
+        "snapshot_load_seconds": snapshot_seconds,
+        "name_resolver_build_seconds": resolver_seconds,
+        "attribute_index_build_seconds": attribute_seconds,
+        "leaderboard_build_seconds": leaderboard_seconds,
+    }
+    metrics.update(_bench_vector_index_build(ctx))
+    return metrics
+
+
+def _bench_vector_index_build(ctx: BenchContext) -> dict:
+    # Encodes the catalog and builds the FAISS index in memory (the index
+    # files on disk are left alone). Needs faiss, and the configured encoder.
+    try:
+        import faiss
+
+        from chatbot.embeddings import encode_phones, get_embedding_model
+    except ImportError as e:
+        return {"vector_index": f"skipped: {e}"}
+
+    model = get_embedding_model()
+    with session_scope() as db:
+        phones = db.query(Phone).all()
+        vectors, encode_seconds = timed(lambda: encode_phones(db, phones, model), 1)
+
+    def build():
+        index = faiss.IndexFlatL2(vectors.shape[1])
+        index.add(vectors)
+
+    _, build_seconds = timed(build)
+    return {
+        "vector_encode_seconds": encode_seconds,
+        "vector_index_build_seconds": build_seconds,
+    }
+
+
+SUPERLATIVE_QUERIES = [
+    "Which Samsung phone has the best camera?",
+    "Samsung phone with the biggest battery",
+    "What is the latest Samsung phone?",
+    "Samsung phone with the largest display",
+    "Which Samsung phone has the most RAM?",
+]
+KEYWORD_QUERIES = [
+    "good camera phone",
+    "long battery life",
+    "fast performance snapdragon",
+]
+
+
+def bench_retrieval(ctx: BenchContext) -> dict:
+    """Chat retrieval: superlative ranking, snapshot lookups and keyword fallback"""
+    from catalog.snapshot import load_snapshot_from_db
+    from chatbot.attribute_index import get_attribute_index, top_phones_for_query
+    from chatbot.retriever import simple_search
+
+    get_attribute_index()  # build time is covered by the index_build suite
+    queries = [SUPERLATIVE_QUERIES[i % 5] for i in range(ctx.samples)]
+    metrics = latency_metrics(
+        "superlative", time_calls(lambda q: top_phones_for_query(q, 5), queries)
+    )
+
+    with session_scope() as db:
+        snapshot = load_snapshot_from_db(db)
+    names = ctx.sample_names(ctx.samples)
+    metrics.update(latency_metrics("snapshot_find", time_calls(snapshot.find, names)))
+
+    # The keyword fallback scans the whole catalog, so it gets fewer calls
+    fallback = [KEYWORD_QUERIES[i % 3] for i in range(max(3, ctx.samples // 4))]
+    metrics.update(
+        latency_metrics(
+            "keyword_fallback", time_calls(lambda q: simple_search(q, 5), fallback)
+        )
+    )
+    return metrics
+
+
+def name_queries(names: List[str], seed: int) -> List[tuple]:
+    """(query, expected name) pairs: exact, lowercase, alias, partial and typo"""
+    from agents.name_resolver import name_alias
+
+    rng = random.Random(seed)
+    queries = []
+    for n, name in enumerate(names):
+        alias = name_alias(name)
+        kind = n % 5
+        if kind == 0:
+            query = name
+        elif kind == 1:
+            query = name.lower()
+        elif kind == 2:
+            query = alias
+        elif kind == 3:
+            query = f"galaxy {alias}"
+        else:
+            cut = rng.randrange(len(alias))
+            query = alias[:cut] + alias[cut + 1 :]  # drop one character
+        queries.append((query, name))
+    return queries
+
+
+def bench_name_resolution(ctx: BenchContext) -> dict:
+    """Free-text phone name lookups through the in-memory resolver"""
+    from agents.name_resolver import build_resolver_from_db
+
+    with session_scope() as db:
+        resolver = build_resolver_from_db(db)
+    queries = name_queries(ctx.sample_names(ctx.samples), ctx.seed)
+
+    hits = 0
+
+    def resolve(pair):
+        nonlocal hits
+        match = resolver.resolve(pair[0])
+        hits += match is not None and match.name == pair[1]
+
+    metrics = latency_metrics("resolve", time_calls(resolve, queries))
+    metrics["resolve_hit_rate"] = round(hits / len(queries), 4)
+    return metrics
+
+
+def bench_review(ctx: BenchContext) -> dict:
+    """Review generation from the database, cold (no spec cache) and warm"""
+    from agents.data_agent import get_phone_data
+    from agents.review_agent import ReviewGenerator
+
+    names = ctx.sample_names(ctx.samples)
+    data = {}
+    with session_scope() as db:
+
+        def fetch(name):
+            data[name] = get_phone_data(name, db)
+
+        fetch(names[0])  # warm-up
+        fetch_samples = time_calls(fetch, names)
+
+    cold = ReviewGenerator(cache_size=0)
+    warm = ReviewGenerator()
+    for name in names:
+        warm.generate_review_from_data(data[name])
+
+    metrics = latency_metrics("phone_data", fetch_samples)
+    metrics.update(
+        latency_metrics(
+            "review_cold",
+            time_calls(lambda n: cold.generate_review_from_data(data[n]), names),
+        )
+    )
+    metrics.update(
+        latency_metrics(
+            "review_warm",
+            time_calls(lambda n: warm.generate_review_from_data(data[n]), names),
+        )
+    )
+    return metrics
+
+
+async def _drive_api(app, paths: List[str], concurrency: int) -> List[float]:
+    import httpx
+
+    samples = []
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+
+    async def worker(client):
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return samples
+
+
+def bench_api(ctx: BenchContext) -> dict:
+    """In-process API throughput (review and ranking routes) over ASGI"""
+    from urllib.parse import quote
+
+    from api.main import app
+
+    names = ctx.sample_names(ctx.api_requests)
+    review_paths = [f"/review/{quote(name)}" for name in names]
+    ranking_paths = [
+        f"/ranking/{category}?limit=10"
+        for category in ("overall", "camera", "battery", "performance")
+    ] * (ctx.api_requests // 4)
+
+    async def drive():
+        from config.database import get_async_engine
+
+        metrics = {}
+        try:
+            for label, paths in (
+                ("api_review", review_paths),
+                ("api_ranking", ranking_paths),
+            ):
+                await _drive_api(app, paths[:10], ctx.api_concurrency)  # warm-up
+                start = time.perf_counter()
+                samples = await _drive_api(app, paths, ctx.api_concurrency)
+                elapsed = time.perf_counter() - start
+                metrics.update(latency_metrics(label, samples))
+                metrics[f"{label}_requests_per_second"] = round(
+                    len(samples) / elapsed, 1
+                )
+        finally:
+            # Pooled async connections belong to this event loop
+            await get_async_engine().dispose()
+        return metrics
+
+    return asyncio.run(drive())
+
+
+SUITES: Dict[str, Callable[[BenchContext], dict]] = {
+    "index_build": bench_index_build,
+    "retrieval": bench_retrieval,
+    "name_resolution": bench_name_resolution,
+    "review": bench_review,
+    "api": bench_api,
+}
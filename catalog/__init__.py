@@ -0,0 +1,2 @@
+# catalog/__init__.py
+# Marks catalog as a package
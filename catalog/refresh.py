@@ -0,0 +1,198 @@
+# catalog/refresh.py
+"""
+Incremental catalog refresh. Ingest stamps every inserted or changed phone
+with a new catalog version (a phone whose content hash is unchanged keeps its
+old one), so the phones that changed since any version are one indexed query
+away. Rebuild hooks get that set of ids and redo only the work for them.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from config.logger import get_logger
+from database.models import Phone
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogChange:
+    """Phones written after `since_version`, up to and including `version`"""
+
+    since_version: int
+    version: int
+    changed_ids: Tuple[int, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed_ids)
+
+
+def current_catalog_version(db) -> int:
+    """Highest catalog version any phone was written at (0 for an empty catalog)"""
+    return db.execute(select(func.max(Phone.catalog_version))).scalar() or 0
+
+
+def changes_since(db, version: int) -> CatalogChange:
+    """The phones inserted or changed after catalog version `version`"""
+    rows = db.execute(
+        select(Phone.id, Phone.catalog_version)
+        .where(Phone.catalog_version > version)
+        .order_by(Phone.id)
+    ).all()
+    return CatalogChange(
+        since_version=version,
+        version=max((row.catalog_version for row in rows), default=version),
+        changed_ids=tuple(row.id for row in rows),
+    )
+
+
+# Rebuild hooks run in registration order: hook(db, change) -> optional details
+RefreshHook = Callable[..., Optional[dict]]
+_hooks: Dict[str, RefreshHook] = {}
+
+
+def register_refresh_hook(name: str, hook: RefreshHook) -> RefreshHook:
+    """Run `hook` whenever a catalog change is applied (replaces a hook of that name)"""
+    _hooks[name] = hook
+    return hook
+
+
+def apply_catalog_change(db, change: CatalogChange) -> Dict[str, dict]:
+    """
+    Run every rebuild hook for a change. A failing hook doesn't stop the
+    others; its entry carries an "error" key instead.
+    """
+    results = {}
+    if not change:
+        return results
+
+    for name, hook in list(_hooks.items()):
+        start = time.perf_counter()
+        try:
+            details = hook(db, change) or {}
+        except Exception as e:
+            logger.error(f"❌ Catalog refresh hook {name} failed: {str(e)}")
+            details = {"error": str(e)}
+        results[name] = {"seconds": round(time.perf_counter() - start, 3), **details}
+    return results
+
+
+def refresh_catalog(db, phone_dicts: Iterable[dict], rebuild: bool = True) -> dict:
+    """
+    Ingest scraped phones under one new catalog version, then rebuild only
+    what depends on the phones that actually changed.
+    """
+    from scraper.ingest import bulk_upsert_phones
+
+    since = current_catalog_version(db)
+    counts = bulk_upsert_phones(db, phone_dicts, catalog_version=since + 1)
+    change = changes_since(db, since)
+    return {
+        "ingested": counts,
+        "catalog_version": change.version,
+        "changed_ids": list(change.changed_ids),
+        "rebuilt": apply_catalog_change(db, change) if rebuild else {},
+    }
+
+
+# Last catalog version this process has applied (see sync_catalog)
+_applied_version: Optional[int] = None
+_sync_lock = threading.Lock()
+
+
+def sync_catalog(db) -> Optional[dict]:
+    """
+    Apply catalog changes written by other processes (e.g. a crawl) since the
+    last sync. The first call only records the current version, since caches
+    built from now on already see it. Returns the rebuild results, or None
+    when there was nothing to do.
+    """
+    global _applied_version
+    with _sync_lock:
+        if _applied_version is None:
+            _applied_version = current_catalog_version(db)
+            return None
+
+        change = changes_since(db, _applied_version)
+        if not change:
+            return None
+        results = apply_catalog_change(db, change)
+        _applied_version = change.version
+        return {"catalog_version": change.version, "rebuilt": results}
+
+
+def _sync_with_new_session():
+    from config.database import session_scope
+
+    with session_scope() as db:
+        result = sync_catalog(db)
+    if result:
+        logger.info(f"🔄 Catalog synced to version {result['catalog_version']}")
+
+
+async def watch_catalog(interval: float):
+    """Background task: sync_catalog every `interval` seconds until cancelled"""
+    while True:
+        try:
+            await asyncio.to_thread(_sync_with_new_session)
+        except Exception as e:
+            logger.error(f"❌ Catalog sync failed: {str(e)}")
+        await asyncio.sleep(interval)
+
+
+# --------- Default rebuild hooks ---------
+
+
+def _refresh_snapshot(db, change: CatalogChange):
+    from catalog.snapshot import (
+        load_records_from_db,
+        loaded_snapshot,
+        publish_snapshot,
+    )
+
+    snapshot = loaded_snapshot()
+    if snapshot is None:
+        return {"skipped": "not loaded"}
+    records = load_records_from_db(db, change.changed_ids)
+    found = {record.id for record in records}
+    removed = [i for i in change.changed_ids if i not in found]
+    publish_snapshot(snapshot.with_changes(records, removed))
+    return {"records": len(records)}
+
+
+def _refresh_name_resolver(db, change: CatalogChange):
+    from agents.name_resolver import refresh_name_resolver
+
+    refresh_name_resolver()
+
+
+def _invalidate_review_cache(db, change: CatalogChange):
+    from agents.review_agent import get_review_generator
+
+    get_review_generator().invalidate(change.changed_ids)
+
+
+def _refresh_rankings(db, change: CatalogChange):
+    from agents.leaderboard import refresh_catalog_leaderboard
+    from chatbot.attribute_index import refresh_attribute_index
+
+    refresh_catalog_leaderboard()
+    refresh_attribute_index()
+
+
+def _update_vector_index(db, change: CatalogChange):
+    from chatbot.embeddings import update_faiss_index
+
+    return update_faiss_index(db)
+
+
+register_refresh_hook("snapshot", _refresh_snapshot)
+register_refresh_hook("name_resolver", _refresh_name_resolver)
+register_refresh_hook("review_cache", _invalidate_review_cache)
+register_refresh_hook("rankings", _refresh_rankings)
+register_refresh_hook("vector_index", _update_vector_index)
@@ -0,0 +1,252 @@
+# catalog/snapshot.py
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Iterable, List, Optional, Tuple
+
+from agents.name_resolver import PhoneNameResolver
+from config import settings
+from database.models import Phone, Specification
+
+SNAPSHOT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class PhoneRecord:
+    """
+    Read-only copy of a Phone row and its specs.
+    Attribute names mirror Phone so serving code can take either.
+    """
+
+    id: int
+    name: str
+    url: Optional[str] = None
+    image: Optional[str] = None
+    release_date: Optional[str] = None
+    display_size: Optional[str] = None
+    resolution: Optional[str] = None
+    os: Optional[str] = None
+    chipset: Optional[str] = None
+    ram: Optional[str] = None
+    storage: Optional[str] = None
+    camera_main: Optional[str] = None
+    battery: Optional[str] = None
+    network: Optional[str] = None
+    dimensions: Optional[str] = None
+    weight: Optional[str] = None
+    specs: Tuple[Tuple[str, str], ...] = ()
+
+    def spec_items(self) -> List[Tuple[str, str]]:
+        return list(self.specs)
+
+    def to_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["specs"] = [list(item) for item in self.specs]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PhoneRecord":
+        data = dict(data)
+        data["specs"] = tuple(tuple(item) for item in data.get("specs", ()))
+        return cls(**data)
+
+
+_PHONE_COLUMNS = [f.name for f in fields(PhoneRecord) if f.name != "specs"]
+
+
+def record_from_phone(phone: Phone, specs: Iterable[Tuple[str, str]]) -> PhoneRecord:
+    return PhoneRecord(
+        **{column: getattr(phone, column) for column in _PHONE_COLUMNS},
+        specs=tuple((key, value) for key, value in specs),
+    )
+
+
+def content_version(records: Iterable[PhoneRecord]) -> str:
+    """Digest of the catalog contents; equal catalogs get equal versions"""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(json.dumps(record.to_dict(), sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+class CatalogSnapshot:
+    """
+    Immutable in-process view of the whole catalog: phone records (with
+    specs) by id plus a name resolver over their names and aliases.
+    Replace it wholesale via publish_snapshot() rather than mutating it.
+    """
+
+    def __init__(self, records: Iterable[PhoneRecord], version: Optional[str] = None):
+        self.records = tuple(sorted(records, key=lambda record: record.id))
+        self.by_id = MappingProxyType({record.id: record for record in self.records})
+        self.resolver = PhoneNameResolver(
+            (record.id, record.name) for record in self.records
+        )
+        self.version = version or content_version(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, phone_id: int) -> Optional[PhoneRecord]:
+        return self.by_id.get(phone_id)
+
+    def get_many(self, phone_ids: Iterable[int]) -> List[PhoneRecord]:
+        """Records for the given ids in the given order; unknown ids are skipped"""
+        return [self.by_id[i] for i in phone_ids if i in self.by_id]
+
+    def find(self, phone_name: str) -> Optional[PhoneRecord]:
+        """Resolve a free-text phone name to a record"""
+        match = self.resolver.resolve(phone_name)
+        return self.by_id[match.phone_id] if match else None
+
+    def with_changes(
+        self, records: Iterable[PhoneRecord], removed_ids: Iterable[int] = ()
+    ) -> "CatalogSnapshot":
+        """A new snapshot with `records` added or replaced and `removed_ids` dropped"""
+        by_id = dict(self.by_id)
+        for phone_id in removed_ids:
+            by_id.pop(phone_id, None)
+        by_id.update((record.id, record) for record in records)
+        return CatalogSnapshot(by_id.values())
+
+    def to_payload(self) -> dict:
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "version": self.version,
+            "phones": [record.to_dict() for record in self.records],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "CatalogSnapshot":
+        if payload.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {payload.get('format')}")
+        records = [PhoneRecord.from_dict(phone) for phone in payload["phones"]]
+        return cls(records, version=payload.get("version"))
+
+
+def load_records_from_db(db, phone_ids: Optional[Iterable[int]] = None):
+    """
+    Phone records from the phones table (all, or just `phone_ids`). Spec
+    documents are used where present; spec rows are read in one query for
+    phones without one.
+    """
+    from sqlalchemy.orm import undefer
+
+    query = db.query(Phone).options(undefer(Phone.spec_doc))
+    if phone_ids is not None:
+        query = query.filter(Phone.id.in_(list(phone_ids)))
+    phones = query.all()
+    specs = {phone.id: phone.spec_items() for phone in phones}
+
+    missing = [phone_id for phone_id, items in specs.items() if items is None]
+    if missing:
+        for phone_id in missing:
+            specs[phone_id] = []
+        rows = (
+            db.query(Specification.phone_id, Specification.key, Specification.value)
+            .filter(Specification.phone_id.in_(missing))
+            .order_by(Specification.id)
+        )
+        for phone_id, key, value in rows:
+            specs[phone_id].append((key, value))
+
+    return [record_from_phone(phone, specs[phone.id]) for phone in phones]
+
+
+def load_snapshot_from_db(db) -> CatalogSnapshot:
+    """Build a snapshot of the whole phones table"""
+    return CatalogSnapshot(load_records_from_db(db))
+
+
+def load_snapshot_from_url(database_url: str) -> CatalogSnapshot:
+    """Build a snapshot from any database URL, e.g. a SQLite file standing in for Postgres"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(database_url)
+    try:
+        with Session(engine) as db:
+            return load_snapshot_from_db(db)
+    finally:
+        engine.dispose()
+
+
+def _open(path: str, mode: str, compressed: bool):
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_snapshot_file(snapshot: CatalogSnapshot, path: str):
+    """Export a snapshot as JSON (gzipped for .gz paths); the file is replaced atomically"""
+    tmp_path = f"{path}.tmp"
+    with _open(tmp_path, "w", path.endswith(".gz")) as f:
+        json.dump(snapshot.to_payload(), f)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_file(path: str) -> CatalogSnapshot:
+    with _open(path, "r", path.endswith(".gz")) as f:
+        return CatalogSnapshot.from_payload(json.load(f))
+
+
+def load_snapshot() -> CatalogSnapshot:
+    """Load the configured snapshot: the export file if there is one, else the DB"""
+    path = settings.CATALOG_SNAPSHOT_PATH
+    if path and os.path.exists(path):
+        return read_snapshot_file(path)
+
+    from config.database import session_scope
+
+    with session_scope() as db:
+        return load_snapshot_from_db(db)
+
+
+# Process-wide snapshot; readers grab the reference once per request
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> CatalogSnapshot:
+    """Return the published snapshot, loading it on first use"""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot()
+    return _snapshot
+
+
+def loaded_snapshot() -> Optional[CatalogSnapshot]:
+    """The published snapshot if one has been loaded, without loading it"""
+    return _snapshot
+
+
+def active_snapshot() -> Optional[CatalogSnapshot]:
+    """The snapshot serving code should read from, or None to use the DB"""
+    if not settings.CATALOG_SNAPSHOT_ENABLED:
+        return None
+    return get_snapshot()
+
+
+def publish_snapshot(snapshot: CatalogSnapshot) -> CatalogSnapshot:
+    """
+    Atomically swap in a new catalog version. Requests already holding the
+    old snapshot finish on it; derived indexes are dropped so they rebuild.
+    """
+    global _snapshot
+    from agents.leaderboard import refresh_catalog_leaderboard
+    from chatbot.attribute_index import refresh_attribute_index
+
+    with _snapshot_lock:
+        previous, _snapshot = _snapshot, snapshot
+
+    if previous is None or previous.version != snapshot.version:
+        refresh_catalog_leaderboard()
+        refresh_attribute_index()
+    return snapshot
@@ -0,0 +1,168 @@
+# chatbot/attribute_index.py
+
+import calendar
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from database.models import Phone
+
+_CAMERA_MP_RE = re.compile(r"(\d+)\s*MP")
+_BATTERY_RE = re.compile(r"(\d+)\s*mAh", re.IGNORECASE)
+_DISPLAY_RE = re.compile(r"(\d+(?:\.\d+)?)\s*inch", re.IGNORECASE)
+_RAM_RE = re.compile(r"(\d+)\s*GB\s*RAM", re.IGNORECASE)
+_YEAR_RE = re.compile(r"\b((?:19|20)\d{2})\b")
+_DAY_RE = re.compile(r"\b(\d{1,2})\b")
+
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+
+
+def camera_mp(phone) -> int:
+    match = _CAMERA_MP_RE.search(phone.camera_main or "")
+    return int(match.group(1)) if match else 0
+
+
+def battery_mah(phone) -> int:
+    match = _BATTERY_RE.search(phone.battery or "")
+    return int(match.group(1)) if match else 0
+
+
+def display_inches(phone) -> float:
+    match = _DISPLAY_RE.search(phone.display_size or "")
+    return float(match.group(1)) if match else 0.0
+
+
+def ram_gb(phone) -> int:
+    return max((int(x) for x in _RAM_RE.findall(phone.ram or "")), default=0)
+
+
+def release_key(phone) -> Optional[Tuple[int, int, int]]:
+    """Sortable (year, month, day) from strings like '2025, January 22'"""
+    text = (phone.release_date or "").lower()
+    year = _YEAR_RE.search(text)
+    if not year:
+        return None
+
+    month = next((num for name, num in MONTHS.items() if name in text), 0)
+    rest = text[year.end() :]
+    day = _DAY_RE.search(rest) if month else None
+    return (int(year.group(1)), month, int(day.group(1)) if day else 0)
+
+
+# Attribute name -> key function (higher is better)
+ATTRIBUTES: Dict[str, Callable] = {
+    "camera": camera_mp,
+    "battery": battery_mah,
+    "display": display_inches,
+    "ram": ram_gb,
+    "release_date": release_key,
+}
+
+# Query words that make a question superlative
+SUPERLATIVE_TERMS = (
+    "best",
+    "highest",
+    "most",
+    "biggest",
+    "largest",
+    "longest",
+    "top",
+    "maximum",
+    "greatest",
+)
+RECENCY_TERMS = ("latest", "newest", "recent")
+
+# Query words that select an attribute
+ATTRIBUTE_TERMS = {
+    "camera": ("camera", "photo", "megapixel"),
+    "battery": ("battery", "mah"),
+    "display": ("display", "screen"),
+    "ram": ("ram", "memory", "multitask"),
+}
+
+
+def detect_superlative(query: str) -> Optional[str]:
+    """
+    Return the attribute a superlative question ranks by, or None.
+    e.g. 'Which phone has the best camera?' -> 'camera'
+    """
+    words = set(re.findall(r"[a-z]+", query.lower()))
+    if words.intersection(RECENCY_TERMS):
+        return "release_date"
+
+    if not words.intersection(SUPERLATIVE_TERMS):
+        return None
+
+    for attribute, terms in ATTRIBUTE_TERMS.items():
+        if words.intersection(terms):
+            return attribute
+    return None
+
+
+class AttributeIndex:
+    """
+    Catalog-wide rankings per numeric attribute.
+    Each attribute keeps phones pre-sorted (descending, ties by name),
+    so top-N is a slice.
+    """
+
+    def __init__(self, phones: Sequence[Phone]):
+        self.phones = list(phones)
+        self.sorted: Dict[str, List] = {}
+        for attribute, key_func in ATTRIBUTES.items():
+            keyed = [(key_func(phone), phone) for phone in self.phones]
+            keyed = [item for item in keyed if item[0]]
+            keyed.sort(key=lambda item: item[1].name)
+            keyed.sort(key=lambda item: item[0], reverse=True)
+            self.sorted[attribute] = [phone for _, phone in keyed]
+
+    def __len__(self) -> int:
+        return len(self.phones)
+
+    def top(self, attribute: str, limit: int = 5) -> List:
+        """Top phones by attribute; phones missing the attribute are excluded"""
+        return self.sorted[attribute][:limit]
+
+
+# Process-wide index, rebuilt when the catalog changes
+_index: Optional[AttributeIndex] = None
+_index_lock = threading.Lock()
+
+
+def build_attribute_index() -> AttributeIndex:
+    from catalog.snapshot import active_snapshot
+    from config.database import session_scope
+
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        return AttributeIndex(snapshot.records)
+
+    with session_scope() as db:
+        return AttributeIndex(db.query(Phone).all())
+
+
+def get_attribute_index() -> AttributeIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = build_attribute_index()
+    return _index
+
+
+def refresh_attribute_index():
+    """Drop the cached index so the next superlative query rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def top_phones_for_query(query: str, limit: int = 5) -> Optional[List]:
+    """
+    Catalog-wide top phones for superlative questions, or None when the
+    question isn't superlative (callers then fall back to vector search).
+    """
+    attribute = detect_superlative(query)
+    if attribute is None:
+        return None
+    return get_attribute_index().top(attribute, limit) or None
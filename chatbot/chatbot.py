@@ -1,16 +1,111 @@
 # chatbot/chatbot.py
 
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-from chatbot.retriever import search_phones
+from chatbot.retriever import search_phones, search_phones_async
+from chatbot.attribute_index import (
+    detect_superlative,
+    release_key,
+    top_phones_for_query,
+)
 from chatbot.prompts import generate_prompt
+from config import settings
+from config.logger import get_logger
+from config.tracing import count, stage
+import asyncio
 import re
+import time
+from functools import lru_cache
+from typing import Optional
 
+logger = get_logger(__name__)
 
 MODEL_NAME = "google/flan-t5-xl"
 
-print("Loading model...")
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+
+class Seq2SeqGenerator:
+    """Answers with flan-t5 (weights are loaded when the generator is created)"""
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        logger.info("Loading model...")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+
+    def generate(
+        self, query: str, phones: list, attribute: Optional[str] = None
+    ) -> Optional[str]:
+        """The model's answer, or None if it isn't a usable one"""
+        with stage("tokenize"):
+            prompt = generate_prompt(query, phones[:3])
+            input_ids = self.tokenizer(
+                prompt, return_tensors="pt", truncation=True, max_length=512
+            ).input_ids
+
+        try:
+            with stage("generate"):
+                count("model_invocations_total", model="generator")
+                output = self.model.generate(
+                    input_ids,
+                    max_new_tokens=200,
+                    temperature=0.7,
+                    do_sample=True,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                )
+                answer = self.tokenizer.decode(output[0], skip_special_tokens=True)
+        except Exception:
+            return None
+
+        # Only a detailed response is worth more than the rule-based one
+        if len(answer.split()) > 10 and not answer.strip().endswith(phones[0].name):
+            return answer
+        return None
+
+
+class TemplateGenerator:
+    """
+    Deterministic stand-in for the model: costs `latency_ms` per answer
+    (sleeping, or spinning the CPU if `cpu_bound`) and answers with the
+    rule-based response.
+    """
+
+    def __init__(self, latency_ms: float = 50, cpu_bound: bool = False):
+        self.latency_ms = latency_ms
+        self.cpu_bound = cpu_bound
+
+    def generate(
+        self, query: str, phones: list, attribute: Optional[str] = None
+    ) -> Optional[str]:
+        seconds = self.latency_ms / 1000
+        with stage("generate"):
+            count("model_invocations_total", model="generator")
+            if self.cpu_bound:
+                deadline = time.perf_counter() + seconds
+                while time.perf_counter() < deadline:
+                    pass
+            elif seconds > 0:
+                time.sleep(seconds)
+            return create_detailed_response(query, phones, attribute)
+
+
+@lru_cache(maxsize=1)
+def get_answer_generator():
+    """
+    The answer generator selected by GENERATOR_BACKEND, created on first use
+    so that importing the chatbot doesn't import transformers or load weights.
+    """
+    backend = settings.GENERATOR_BACKEND
+    if backend == "template":
+        return TemplateGenerator(
+            settings.FAKE_GENERATOR_LATENCY_MS, settings.FAKE_GENERATOR_CPU_BOUND
+        )
+    if backend == "flan-t5":
+        return Seq2SeqGenerator()
+    raise ValueError(f"Unknown GENERATOR_BACKEND: {backend!r}")
+
+
+NO_PHONES_ANSWER = (
+    "Sorry, I couldn't find any relevant Samsung phones for your question."
+)
 
 
 def extract_camera_mp(camera_text):
@@ -21,13 +116,35 @@ def extract_camera_mp(camera_text):
     return int(match.group(1)) if match else 0
 
 
-def create_detailed_response(query: str, phones: list) -> str:
+def query_topic(query: str) -> Optional[str]:
+    """The spec a question asks about, by keyword (None for a general question)"""
+    query_lower = query.lower()
+    if "camera" in query_lower:
+        return "camera"
+    if "battery" in query_lower:
+        return "battery"
+    if any(word in query_lower for word in ("performance", "chipset", "processor")):
+        return "performance"
+    if "storage" in query_lower or "memory" in query_lower:
+        return "storage"
+    if "display" in query_lower or "screen" in query_lower:
+        return "display"
+    if any(word in query_lower for word in ("latest", "newest", "recent")):
+        return "release_date"
+    return None
+
+
+def create_detailed_response(
+    query: str, phones: list, attribute: Optional[str] = None
+) -> str:
     """
-    Create a detailed response based on query type and retrieved phones
+    Create a detailed response based on query type and retrieved phones.
+    `attribute` is the one superlative phones were ranked by; it picks the
+    response over the query's keywords, so the answer shows what was ranked.
     """
-    query_lower = query.lower()
+    topic = attribute or query_topic(query)
 
-    if "camera" in query_lower:
+    if topic == "camera":
         # Sort phones by camera megapixels
         phones_with_mp = [
             (phone, extract_camera_mp(phone.camera_main)) for phone in phones
@@ -44,7 +161,7 @@ def create_detailed_response(query: str, phones: list) -> str:
             response += f" at {phones_with_mp[0][1]}MP"
         response += "."
 
-    elif "battery" in query_lower:
+    elif topic == "battery":
         response = "Battery comparison:\n\n"
         for i, phone in enumerate(phones[:3], 1):
             response += f"{i}. **{phone.name}** - {phone.battery}\n"
@@ -52,32 +169,35 @@ def create_detailed_response(query: str, phones: list) -> str:
             "\n All these phones have 5000 mAh batteries for excellent all-day usage."
         )
 
-    elif (
-        "performance" in query_lower
-        or "chipset" in query_lower
-        or "processor" in query_lower
-    ):
+    elif topic == "performance":
         response = "Performance comparison:\n\n"
         for i, phone in enumerate(phones[:3], 1):
             response += f"{i}. **{phone.name}** - {phone.chipset}\n"
             if phone.ram:
                 response += f"   RAM: {phone.ram}\n"
 
-    elif "storage" in query_lower or "memory" in query_lower:
+    elif topic == "ram":
+        response = "Memory (RAM) options:\n\n"
+        for i, phone in enumerate(phones[:3], 1):
+            response += f"{i}. **{phone.name}** - {phone.ram}\n"
+
+    elif topic == "storage":
         response = "Storage options:\n\n"
         for i, phone in enumerate(phones[:3], 1):
             response += f"{i}. **{phone.name}** - {phone.storage}\n"
 
-    elif "display" in query_lower or "screen" in query_lower:
+    elif topic == "display":
         response = "Display specifications:\n\n"
         for i, phone in enumerate(phones[:3], 1):
             response += f"{i}. **{phone.name}** - {phone.display_size}\n"
             if phone.resolution:
                 response += f"   Resolution: {phone.resolution}\n"
 
-    elif "latest" in query_lower or "newest" in query_lower or "recent" in query_lower:
-        response = "Latest Samsung phones (2025):\n\n"
-        latest_phones = [p for p in phones if "2025" in (p.release_date or "")]
+    elif topic == "release_date":
+        response = "Latest Samsung phones:\n\n"
+        latest_phones = sorted(
+            (p for p in phones if release_key(p)), key=release_key, reverse=True
+        )
         for i, phone in enumerate(latest_phones[:3], 1):
             response += f"{i}. **{phone.name}** - Released {phone.release_date}\n"
 
@@ -98,40 +218,53 @@ def answer_query(query: str, top_k: int = 5) -> str:
     """
     Runs the full chatbot pipeline: retrieve → analyze → generate detailed response.
     """
-    print(" Retrieving relevant phones...")
-    phones = search_phones(query, top_k=top_k)
+    logger.debug("Retrieving relevant phones...")
+    # Superlative questions rank the whole catalog; everything else uses vector search
+    with stage("rank_superlative"):
+        phones = top_phones_for_query(query, limit=top_k)
+    if phones is None:
+        phones = search_phones(query, top_k=top_k)
 
     if not phones:
-        return "Sorry, I couldn't find any relevant Samsung phones for your question."
+        return NO_PHONES_ANSWER
 
-    print(" Creating detailed response...")
+    return generate_answer(query, phones, detect_superlative(query))
 
-    # Try the model approach first
-    prompt = generate_prompt(query, phones[:3])
-    input_ids = tokenizer(
-        prompt, return_tensors="pt", truncation=True, max_length=512
-    ).input_ids
-
-    try:
-        output = model.generate(
-            input_ids,
-            max_new_tokens=200,
-            temperature=0.7,
-            do_sample=True,
-            pad_token_id=tokenizer.eos_token_id,
-        )
-        model_answer = tokenizer.decode(output[0], skip_special_tokens=True)
 
-        # If model gives a good detailed response, use it
-        if len(model_answer.split()) > 10 and not model_answer.strip().endswith(
-            phones[0].name
-        ):
-            return model_answer
-    except:
-        pass
+async def answer_query_async(query: str, top_k: int = 5) -> str:
+    """
+    Async variant of answer_query. DB lookups are awaited; index building,
+    encoding and generation run in worker threads.
+    """
+    with stage("rank_superlative"):
+        phones = await asyncio.to_thread(top_phones_for_query, query, top_k)
+    if phones is None:
+        phones = await search_phones_async(query, top_k=top_k)
+
+    if not phones:
+        return NO_PHONES_ANSWER
+
+    return await asyncio.to_thread(
+        generate_answer, query, phones, detect_superlative(query)
+    )
+
+
+def generate_answer(query: str, phones: list, attribute: Optional[str] = None) -> str:
+    """
+    Generates the answer for retrieved phones: model first, rule-based fallback.
+    `attribute` is the superlative ranking the phones came from, if any.
+    """
+    logger.debug("Creating detailed response...")
+
+    # Try the model approach first
+    answer = get_answer_generator().generate(query, phones, attribute)
+    if answer:
+        return answer
 
     # Fallback to rule-based detailed response
-    return create_detailed_response(query, phones)
+    count("fallbacks_total", reason="rule_based_answer")
+    with stage("rule_based_answer"):
+        return create_detailed_response(query, phones, attribute)
 
 
 """
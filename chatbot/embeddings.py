@@ -1,27 +1,90 @@
 # chatbot/embeddings.py
 
+import hashlib
 import os
-from sqlalchemy.orm import Session
-from sentence_transformers import SentenceTransformer
-import faiss
+import re
+from functools import lru_cache
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
+import numpy as np
 import pickle
 
-from config.database import SessionLocal
+from config import settings
+from config.database import session_scope
+from config.logger import get_logger
 from database.models import Phone, Specification
+from chatbot.attribute_index import refresh_attribute_index
+from catalog.refresh import changes_since, current_catalog_version
+
+logger = get_logger(__name__)
 
 # --------- Constants ---------
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
-FAISS_INDEX_FILE = "chatbot/faiss_index.index"
-METADATA_FILE = "chatbot/faiss_metadata.pkl"
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2 output size
+FAISS_INDEX_FILE = os.path.join(settings.VECTOR_INDEX_DIR, "faiss_index.index")
+METADATA_FILE = os.path.join(settings.VECTOR_INDEX_DIR, "faiss_metadata.pkl")
+EMBEDDINGS_CACHE_FILE = os.path.join(settings.VECTOR_INDEX_DIR, "faiss_embeddings.npz")
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashEmbedder:
+    """
+    Deterministic stand-in for the sentence-transformers model: feature
+    hashing of word unigrams and bigrams into unit vectors of the same
+    dimension. Texts sharing words land close together, which is enough to
+    exercise the index and the retrieval path without model weights.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _slot(self, feature: str):
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def encode(self, texts, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """Same call shape as SentenceTransformer.encode (extra options ignored)"""
+        vectors = np.zeros((len(texts), self.dim), dtype="float32")
+        for row, text in enumerate(texts):
+            tokens = TOKEN_RE.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                slot, sign = self._slot(feature)
+                vectors[row, slot] += sign
+            norm = np.linalg.norm(vectors[row])
+            if norm:
+                vectors[row] /= norm
+        return vectors
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model():
+    """
+    The encoder selected by EMBEDDING_BACKEND, created on first use.
+    "sentence-transformers" loads the real model (importing it pulls in
+    torch, so it is deferred until needed); "hash" needs no weights.
+    """
+    backend = settings.EMBEDDING_BACKEND
+    if backend == "hash":
+        return HashEmbedder()
+    if backend == "sentence-transformers":
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend!r}")
 
 
 def get_phone_text_representation(db: Session, phone: Phone) -> str:
     """
     Create a comprehensive text representation for better embedding
     """
-    # Get specifications from the separate table
-    specs = db.query(Specification).filter(Specification.phone_id == phone.id).all()
-    specs_text = " ".join([f"{s.key} {s.value}" for s in specs])
+    # Prefer the denormalized spec document; fall back to the specifications table
+    spec_items = phone.spec_items()
+    if spec_items is None:
+        specs = db.query(Specification).filter(Specification.phone_id == phone.id)
+        spec_items = [(s.key, s.value) for s in specs]
+    specs_text = " ".join([f"{key} {value}" for key, value in spec_items])
 
     # Core phone information with keywords for better matching
     core_info = f"""
@@ -62,59 +125,161 @@ def get_phone_text_representation(db: Session, phone: Phone) -> str:
     return full_text
 
 
+def phone_metadata(phone: Phone) -> dict:
+    """Per-phone entry stored alongside the FAISS index"""
+    return {
+        "id": phone.id,
+        "name": phone.name,
+        "release_date": phone.release_date,
+        "camera": phone.camera_main,
+        "battery": phone.battery,
+    }
+
+
+def encode_phones(db: Session, phones, model) -> np.ndarray:
+    texts = [get_phone_text_representation(db, phone) for phone in phones]
+    embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
+    return np.asarray(embeddings, dtype="float32")
+
+
+def _write_atomically(path: str, write):
+    """Write a file through `write(tmp_path)`, then swap it into place"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_index_files(vectors: np.ndarray, metadata: list, catalog_version: int):
+    """
+    Build a flat L2 index over the vectors and write it with its metadata.
+    The vectors are also cached, keyed by phone id, so later refreshes only
+    encode the phones that changed.
+
+    API workers may load the files while this runs, so each one is written
+    to a temp file and renamed into place, metadata last: a reader never
+    sees a partial file, and an index newer than its metadata means a write
+    is still in progress (see chatbot.retriever.load_faiss_index).
+    """
+    import faiss
+
+    index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(vectors)
+
+    def write_metadata(path):
+        with open(path, "wb") as f:
+            pickle.dump(metadata, f)
+
+    def write_cache(path):
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                ids=np.array([meta["id"] for meta in metadata], dtype="int64"),
+                vectors=vectors,
+                catalog_version=np.array(catalog_version),
+                backend=np.array(settings.EMBEDDING_BACKEND),
+            )
+
+    os.makedirs(settings.VECTOR_INDEX_DIR, exist_ok=True)
+    _write_atomically(EMBEDDINGS_CACHE_FILE, write_cache)
+    _write_atomically(FAISS_INDEX_FILE, lambda path: faiss.write_index(index, path))
+    _write_atomically(METADATA_FILE, write_metadata)
+
+
+def load_embedding_cache():
+    """
+    (vectors, metadata, catalog version) from the last build, or None if
+    there is none or it was encoded by a different embedding backend.
+    """
+    if not os.path.exists(EMBEDDINGS_CACHE_FILE) or not os.path.exists(METADATA_FILE):
+        return None
+    cache = np.load(EMBEDDINGS_CACHE_FILE)
+    with open(METADATA_FILE, "rb") as f:
+        metadata = pickle.load(f)
+    if [meta["id"] for meta in metadata] != cache["ids"].tolist():
+        return None
+    if "backend" in cache and str(cache["backend"]) != settings.EMBEDDING_BACKEND:
+        return None
+    return cache["vectors"], metadata, int(cache["catalog_version"])
+
+
 def build_faiss_index():
     """
     Builds FAISS index with enhanced phone representations.
     """
-    print("🔍 Loading data from database...")
-    db = SessionLocal()
-    phones = db.query(Phone).all()
-
-    if not phones:
-        print("❌ No phone data found in the database.")
-        print("💡 Make sure to populate the database first with phone data.")
-        return
-
-    print(f"📦 Found {len(phones)} phones. Creating enhanced embeddings...")
-
-    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-    texts = []
-    metadata = []
-
-    for phone in phones:
-        text = get_phone_text_representation(db, phone)
-        texts.append(text)
-        metadata.append(
-            {
-                "id": phone.id,
-                "name": phone.name,
-                "release_date": phone.release_date,
-                "camera": phone.camera_main,
-                "battery": phone.battery,
-            }
-        )
+    logger.info("🔍 Loading data from database...")
 
-    print("🧠 Generating embeddings...")
-    embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
+    with session_scope() as db:
+        version = current_catalog_version(db)
+        phones = db.query(Phone).options(undefer(Phone.spec_doc)).all()
 
-    # Build FAISS index
-    print("🔗 Building FAISS index...")
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(embeddings)
+        if not phones:
+            logger.error("❌ No phone data found in the database.")
+            logger.info("💡 Make sure to populate the database first with phone data.")
+            return
 
-    # Create directory if it doesn't exist
-    os.makedirs("chatbot", exist_ok=True)
+        logger.info(f"📦 Found {len(phones)} phones. Creating enhanced embeddings...")
+        metadata = [phone_metadata(phone) for phone in phones]
 
-    # Save index and metadata
-    faiss.write_index(index, FAISS_INDEX_FILE)
-    with open(METADATA_FILE, "wb") as f:
-        pickle.dump(metadata, f)
+        model = get_embedding_model()
 
-    print(f"✅ FAISS index saved with {len(phones)} phone embeddings!")
-    print(f"📂 Files created: {FAISS_INDEX_FILE}, {METADATA_FILE}")
+        logger.info("🧠 Generating embeddings...")
+        embeddings = encode_phones(db, phones, model)
 
-    db.close()
+    # Build FAISS index and save it with its metadata
+    logger.info("🔗 Building FAISS index...")
+    write_index_files(embeddings, metadata, version)
+
+    # The catalog may have changed, so drop the superlative rankings too
+    refresh_attribute_index()
+
+    logger.info(f"✅ FAISS index saved with {len(phones)} phone embeddings!")
+    logger.info(f"📂 Files created: {FAISS_INDEX_FILE}, {METADATA_FILE}")
+
+
+def update_faiss_index(db: Session, model=None) -> dict:
+    """
+    Bring the FAISS index up to the current catalog version, encoding only
+    phones changed since the cached embeddings were built (a full build if
+    there is no cache). Returns how many phones were encoded.
+    """
+    cache = load_embedding_cache()
+    if cache is None:
+        build_faiss_index()
+        return {"encoded": "all"}
+
+    vectors, metadata, version = cache
+    change = changes_since(db, version)
+    current_ids = set(db.scalars(select(Phone.id)))
+    changed = set(change.changed_ids)
+    if not changed and len(current_ids) == len(metadata):
+        return {"encoded": 0, "total": len(metadata)}
+
+    keep = [
+        i
+        for i, meta in enumerate(metadata)
+        if meta["id"] in current_ids and meta["id"] not in changed
+    ]
+    phones = (
+        db.query(Phone)
+        .options(undefer(Phone.spec_doc))
+        .filter(Phone.id.in_(changed))
+        .order_by(Phone.id)
+        .all()
+    )
+
+    metadata = [metadata[i] for i in keep]
+    vectors = vectors[keep]
+    if phones:
+        model = model or get_embedding_model()
+        vectors = np.vstack([vectors, encode_phones(db, phones, model)])
+        metadata += [phone_metadata(phone) for phone in phones]
+
+    write_index_files(vectors, metadata, change.version)
+    return {"encoded": len(phones), "total": len(metadata)}
 
 
 def verify_index():
@@ -122,19 +287,21 @@ def verify_index():
     Verify that the FAISS index was created correctly
     """
     if os.path.exists(FAISS_INDEX_FILE) and os.path.exists(METADATA_FILE):
+        import faiss
+
         index = faiss.read_index(FAISS_INDEX_FILE)
         with open(METADATA_FILE, "rb") as f:
             metadata = pickle.load(f)
 
-        print(
+        logger.info(
             f"✅ Index verified: {index.ntotal} embeddings, {len(metadata)} metadata entries"
         )
-        print("📱 Sample phones in index:")
+        logger.info("📱 Sample phones in index:")
         for i, meta in enumerate(metadata[:3]):
-            print(f"  {i+1}. {meta['name']} (ID: {meta['id']})")
+            logger.info(f"  {i+1}. {meta['name']} (ID: {meta['id']})")
         return True
     else:
-        print("❌ Index files not found")
+        logger.error("❌ Index files not found")
         return False
 
 
@@ -1,67 +1,166 @@
 # chatbot/retriever.py
 
-import faiss
+import asyncio
 import pickle
-from sentence_transformers import SentenceTransformer
-from config.database import SessionLocal
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import select
+from config.database import async_session_scope, session_scope
+from config.logger import get_logger
+from config.tracing import count, stage, traced
 from database.models import Phone
-from chatbot.embeddings import FAISS_INDEX_FILE, METADATA_FILE, EMBEDDING_MODEL_NAME
+from catalog.snapshot import active_snapshot
+from chatbot.embeddings import FAISS_INDEX_FILE, METADATA_FILE, get_embedding_model
 import os
 
+logger = get_logger(__name__)
+
+
+# (index file mtime, metadata file mtime, index, metadata) of the last load
+_index_cache = None
+_index_lock = threading.Lock()
+INDEX_LOAD_ATTEMPTS = 5
+
+
+def _index_mtimes():
+    return os.path.getmtime(FAISS_INDEX_FILE), os.path.getmtime(METADATA_FILE)
+
 
 def load_faiss_index():
     """
-    Loads the FAISS index and metadata from disk.
+    Loads the FAISS index and metadata from disk. The loaded pair is kept
+    until either file changes (e.g. an incremental refresh rewrote them).
+    A refresh replaces the index before its metadata, so while the index is
+    the newer of the two (or either changes during the load) the pair isn't
+    used: the previous one keeps serving, or the load is retried.
     """
+    global _index_cache
     if not os.path.exists(FAISS_INDEX_FILE) or not os.path.exists(METADATA_FILE):
-        print(
+        logger.warning(
             "⚠️ FAISS index not found. Please run embeddings.py first to build the index."
         )
         return None, None
 
-    index = faiss.read_index(FAISS_INDEX_FILE)
-    with open(METADATA_FILE, "rb") as f:
-        metadata = pickle.load(f)
-    return index, metadata
+    with _index_lock:
+        for attempt in range(INDEX_LOAD_ATTEMPTS):
+            mtimes = _index_mtimes()
+            if _index_cache is not None and (
+                _index_cache[:2] == mtimes or mtimes[1] < mtimes[0]
+            ):
+                count("cache_hits_total", cache="vector_index")
+                return _index_cache[2], _index_cache[3]
+            if mtimes[1] < mtimes[0]:
+                time.sleep(0.05 * (attempt + 1))  # metadata not written yet
+                continue
+
+            count("cache_misses_total", cache="vector_index")
+            import faiss
+
+            with stage("load_vector_index"):
+                index = faiss.read_index(FAISS_INDEX_FILE)
+                with open(METADATA_FILE, "rb") as f:
+                    metadata = pickle.load(f)
+            if _index_mtimes() == mtimes and index.ntotal == len(metadata):
+                _index_cache = (*mtimes, index, metadata)
+                return index, metadata
+
+        logger.warning("⚠️ Could not load a consistent FAISS index and metadata pair.")
+        if _index_cache is not None:
+            return _index_cache[2], _index_cache[3]
+        return None, None
 
 
 def search_phones(query: str, top_k: int = 5):
     """
     Returns top_k relevant phones based on the query with improved matching.
     """
+    phone_ids = vector_search(query, top_k)
+
+    if phone_ids is None:
+        logger.warning("Could not load FAISS index. Falling back to simple search.")
+        count("fallbacks_total", reason="no_vector_index")
+        return simple_search(query, top_k)
+
+    with stage("hydrate"):
+        snapshot = active_snapshot()
+        if snapshot is not None:
+            return snapshot.get_many(phone_ids)
+
+        with session_scope() as db:
+            return hydrate_phones(db, phone_ids)
+
+
+async def search_phones_async(query: str, top_k: int = 5):
+    """
+    Async variant of search_phones: encoding and FAISS search run in a worker
+    thread, phone hydration goes through an AsyncSession.
+    """
+    phone_ids = await asyncio.to_thread(vector_search, query, top_k)
+
+    if phone_ids is None:
+        logger.warning("Could not load FAISS index. Falling back to simple search.")
+        count("fallbacks_total", reason="no_vector_index")
+        return await asyncio.to_thread(simple_search, query, top_k)
+
+    with stage("hydrate"):
+        snapshot = active_snapshot()
+        if snapshot is not None:
+            return snapshot.get_many(phone_ids)
+
+        async with async_session_scope() as db:
+            return await hydrate_phones_async(db, phone_ids)
+
+
+def vector_search(query: str, top_k: int = 5) -> Optional[List[int]]:
+    """
+    Phone ids ranked by vector similarity, or None when there is no index.
+    """
     # Load index and metadata
     index, metadata = load_faiss_index()
 
     if index is None:
-        print(" Could not load FAISS index. Falling back to simple search.")
-        return simple_search(query, top_k)
+        return None
 
-    # Load embedding model and embed query
-    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    # Embed the query (the model is loaded once per process)
+    model = get_embedding_model()
 
     # Expand query for better matching
-    expanded_query = expand_query(query)
-    query_vector = model.encode([expanded_query])
+    with stage("expand_query"):
+        expanded_query = expand_query(query)
+    with stage("encode"):
+        count("model_invocations_total", model="embedding")
+        query_vector = model.encode([expanded_query])
 
     # Search FAISS index
-    distances, indices = index.search(query_vector, min(top_k, len(metadata)))
-
-    # Map results back to phone records
-    db = SessionLocal()
-    results = []
-    seen_phones = set()
+    with stage("vector_search"):
+        distances, indices = index.search(query_vector, min(top_k, len(metadata)))
 
+    phone_ids = []
     for idx in indices[0]:
-        if idx < len(metadata):
+        if 0 <= idx < len(metadata):
             phone_id = metadata[idx]["id"]
-            if phone_id not in seen_phones:
-                phone = db.query(Phone).filter(Phone.id == phone_id).first()
-                if phone:
-                    results.append(phone)
-                    seen_phones.add(phone_id)
+            if phone_id not in phone_ids:
+                phone_ids.append(phone_id)
+    return phone_ids
+
 
-    db.close()
-    return results
+def hydrate_phones(db, phone_ids: List[int]) -> list:
+    """Load phones by id in one query, keeping the ranking order"""
+    if not phone_ids:
+        return []
+    phones = db.execute(select(Phone).where(Phone.id.in_(phone_ids))).scalars()
+    by_id = {phone.id: phone for phone in phones}
+    return [by_id[i] for i in phone_ids if i in by_id]
+
+
+async def hydrate_phones_async(db, phone_ids: List[int]) -> list:
+    """Async variant of hydrate_phones"""
+    if not phone_ids:
+        return []
+    result = await db.execute(select(Phone).where(Phone.id.in_(phone_ids)))
+    by_id = {phone.id: phone for phone in result.scalars()}
+    return [by_id[i] for i in phone_ids if i in by_id]
 
 
 def expand_query(query: str) -> str:
@@ -91,14 +190,20 @@ def expand_query(query: str) -> str:
     return query
 
 
+@traced("keyword_search")
 def simple_search(query: str, top_k: int = 5):
     """
     Fallback search when FAISS is not available
     """
-    db = SessionLocal()
     query_lower = query.lower()
 
-    phones = db.query(Phone).all()
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        phones = snapshot.records
+    else:
+        with session_scope() as db:
+            phones = db.query(Phone).all()
+
     scored_phones = []
 
     for phone in phones:
@@ -129,7 +234,6 @@ def simple_search(query: str, top_k: int = 5):
 
     # Sort by score and return top_k
     scored_phones.sort(key=lambda x: x[1], reverse=True)
-    db.close()
 
     return [phone for phone, score in scored_phones[:top_k] if score > 0]
 
@@ -1,7 +1,241 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from config.settings import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from config.settings import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    require_database_url,
+)
 
-# Create SQLAlchemy engine and session
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _CheckoutTiming:
+    """Pool mixin recording how long each checkout waits into `metrics`"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.record(time.perf_counter() - start, timed_out)
+
+
+class InstrumentedQueuePool(_CheckoutTiming, QueuePool):
+    """QueuePool of the sync engine, with checkout wait metrics"""
+
+    metrics = pool_metrics
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTiming, AsyncAdaptedQueuePool):
+    """Pool of the async engine (the API request path), with checkout wait metrics"""
+
+    metrics = async_pool_metrics
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _create_engine(url: str):
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite picks its own pool; size/overflow don't apply
+        return create_engine(url)
+
+    return create_engine(url, poolclass=InstrumentedQueuePool, **_pool_options())
+
+
+# Async drivers used for the API's async access path
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its asyncio driver (asyncpg / aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases.")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+# Engine and session factory, created on first use so that importing this
+# module (e.g. for a health check or a CLI --help) needs no DATABASE_URL
+_engine = None
+_session_factory = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine, _session_factory
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine(require_database_url())
+                _session_factory = sessionmaker(
+                    autocommit=False, autoflush=False, bind=_engine
+                )
+    return _engine
+
+
+def SessionLocal():
+    get_engine()
+    return _session_factory()
+
+
+def __getattr__(name):
+    # `from config.database import engine` keeps working, lazily
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@contextmanager
+def session_scope():
+    """
+    Context-managed session: rolled back on error and always closed.
+    Writers still call commit() themselves.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_db():
+    """FastAPI dependency yielding a request-scoped session"""
+    with session_scope() as db:
+        yield db
+
+
+# Async engine/session factory, created on first use so the async drivers
+# are only required by processes that actually take the async path
+_async_engine = None
+_async_session_factory = None
+_async_lock = threading.Lock()
+
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _async_lock:
+            if _async_engine is None:
+                url = async_database_url(require_database_url())
+                if make_url(url).get_backend_name() == "sqlite":
+                    _async_engine = create_async_engine(url)
+                else:
+                    _async_engine = create_async_engine(
+                        url, poolclass=InstrumentedAsyncQueuePool, **_pool_options()
+                    )
+                _async_session_factory = async_sessionmaker(
+                    _async_engine, autoflush=False, expire_on_commit=False
+                )
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _async_session_factory()
+
+
+@asynccontextmanager
+async def async_session_scope():
+    """Async counterpart of session_scope()"""
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
+async def dispose_engines():
+    """Close pooled connections of the engines created so far (app shutdown)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+async def get_async_db():
+    """FastAPI dependency yielding a request-scoped async session"""
+    async with async_session_scope() as db:
+        yield db
+
+
+def pool_stats() -> dict:
+    """
+    Occupancy and cumulative checkout wait metrics of the sync engine's pool
+    and, once the async engine exists, of its pool under "async"
+    """
+    stats = _pool_stats(get_engine().pool, pool_metrics)
+    if _async_engine is not None:
+        stats["async"] = _pool_stats(_async_engine.pool, async_pool_metrics)
+    return stats
+
+
+def _pool_stats(pool, metrics: PoolMetrics) -> dict:
+    stats = {
+        "pool_class": type(pool).__name__,
+        "checkouts": metrics.checkouts,
+        "checkout_timeouts": metrics.timeouts,
+        "checkout_wait_seconds_total": round(metrics.wait_seconds_total, 6),
+        "checkout_wait_seconds_max": round(metrics.wait_seconds_max, 6),
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return stats
@@ -1,37 +1,169 @@
 # config/logger.py
+"""
+Application logging. Loggers only put records on an in-memory queue; a
+QueueListener thread formats them and does the console and file I/O, so a log
+call on a request thread never waits on disk. The log file rotates by size
+(or by time when LOG_ROTATE_WHEN is set) and is written as one JSON object per
+line by default.
+"""
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+from datetime import datetime, timezone
 
-LOG_DIR = "logs"
+from config import settings
+
+LOG_DIR = settings.LOG_DIR
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 
+TEXT_FORMAT = "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def get_logger(name: str) -> logging.Logger:
+# Chatty third-party loggers (httpx logs every request at INFO)
+QUIET_LOGGERS = ("httpx", "httpcore", "urllib3", "filelock")
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
     """
-    Configures and returns a logger that logs to both console and file.
+    QueueHandler for an in-process queue. The stock prepare() formats and
+    copies every record so it can be pickled; records here never leave the
+    process, so only the message is rendered (args may be mutated later).
     """
-    os.makedirs(LOG_DIR, exist_ok=True)
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 
-    formatter = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+def _file_handler(path: str) -> logging.Handler:
+    if settings.LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=settings.LOG_ROTATE_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding="utf-8",
     )
 
-    # Console Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
 
-    # File Handler
-    file_handler = logging.FileHandler(LOG_FILE)
-    file_handler.setFormatter(formatter)
+def build_handlers(log_file: str = LOG_FILE) -> list:
+    """The handlers that do the actual output (run on the listener thread)"""
+    handlers = []
+    text = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    if settings.LOG_CONSOLE:
+        console = logging.StreamHandler()
+        console.setFormatter(text)
+        handlers.append(console)
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        file_handler = _file_handler(log_file)
+        file_handler.setFormatter(
+            JsonFormatter() if settings.LOG_FORMAT == "json" else text
+        )
+        handlers.append(file_handler)
+    return handlers
+
+
+_listener = None
+_queue_handler = None
+_forked_child = False
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level: str = None, log_file: str = LOG_FILE):
+    """
+    Route the root logger through a queue to the console and rotating file
+    handlers. Safe to call more than once; only the first call configures.
+    """
+    global _listener, _queue_handler
+    with _configure_lock:
+        if _listener is not None or _forked_child:
+            return
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = LocalQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue, *build_handlers(log_file), respect_handler_level=True
+        )
+
+        root = logging.getLogger()
+        root.setLevel((level or settings.LOG_LEVEL).upper())
+        root.addHandler(_queue_handler)
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    with _configure_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = _queue_handler = None
+
 
-    # Avoid duplicate handlers
-    if not logger.handlers:
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+def _after_fork_in_child():
+    # A forked child (e.g. a parse worker) inherits the queue handler but not
+    # the listener thread, so its records would pile up unread. Log straight
+    # to stderr there instead; only the parent writes the log file.
+    global _listener, _queue_handler, _forked_child
+    if _queue_handler is None:
+        return
+    _forked_child = True
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT))
+    root.addHandler(console)
+    _listener = _queue_handler = None
 
-    return logger
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(shutdown_logging)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a logger that logs to both console and file (through the queue).
+    """
+    configure_logging()
+    return logging.getLogger(name)
@@ -8,5 +8,108 @@ load_dotenv()
 # Retrieve env variables
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set in the environment variables.")
+
+def require_database_url() -> str:
+    """DATABASE_URL, checked when a database engine is first created"""
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL is not set in the environment variables.")
+    return DATABASE_URL
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Connection pool (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# API features to mount (comma-separated): chatbot, review, ranking. Workers
+# that serve a subset skip importing the others (the chatbot stack is heavy).
+API_FEATURES = [
+    f.strip()
+    for f in os.getenv("API_FEATURES", "chatbot,review,ranking").split(",")
+    if f.strip()
+]
+# Cold-start budget checked by scripts/profile_startup.py (milliseconds)
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+# Startup warmup, run in the background while /health/ready reports 503:
+# components to preload (encoder, index, generator) and whether to send
+# warmup queries through each mounted feature's path. Both off by default,
+# so models load on first use as before.
+WARMUP_COMPONENTS = [
+    c.strip() for c in os.getenv("WARMUP_COMPONENTS", "").split(",") if c.strip()
+]
+WARMUP_QUERIES = _env_bool("WARMUP_QUERIES", False)
+
+# Model backends: "sentence-transformers" / "flan-t5" load the real models;
+# "hash" / "template" are deterministic stand-ins that need no downloads (load
+# tests, air-gapped hosts). The template generator's cost per answer is
+# FAKE_GENERATOR_LATENCY_MS, spent sleeping or, if FAKE_GENERATOR_CPU_BOUND,
+# spinning (holding the GIL like in-process inference would).
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "sentence-transformers").strip()
+GENERATOR_BACKEND = os.getenv("GENERATOR_BACKEND", "flan-t5").strip()
+FAKE_GENERATOR_LATENCY_MS = float(os.getenv("FAKE_GENERATOR_LATENCY_MS", "50"))
+FAKE_GENERATOR_CPU_BOUND = _env_bool("FAKE_GENERATOR_CPU_BOUND", False)
+# Directory holding the FAISS index, its metadata and the embeddings cache
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "chatbot")
+
+# Tracing: per-stage latency histograms and counters, served at /metrics in
+# the Prometheus format. SERVER_TIMING_ENABLED adds each request's stage
+# timings as a Server-Timing response header.
+TRACING_ENABLED = _env_bool("TRACING_ENABLED", True)
+SERVER_TIMING_ENABLED = _env_bool("SERVER_TIMING_ENABLED", False)
+
+# On-demand profiling of live workers (/admin/profile). Off by default: when
+# disabled neither the routes nor the middleware are installed. Requests must
+# send PROFILING_ADMIN_TOKEN in the X-Admin-Token header; sessions are capped
+# at PROFILING_MAX_SECONDS.
+PROFILING_ENABLED = _env_bool("PROFILING_ENABLED", False)
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+PROFILING_MAX_SECONDS = float(os.getenv("PROFILING_MAX_SECONDS", "60"))
+
+# Catalog snapshot: serve phone reads from an in-process copy of the catalog
+CATALOG_SNAPSHOT_ENABLED = _env_bool("CATALOG_SNAPSHOT_ENABLED", False)
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH")
+# Seconds between checks for catalog changes written by other processes
+# (crawls, replays); changed phones are pushed to the caches and vector index.
+# 0 disables the watcher.
+CATALOG_SYNC_INTERVAL = float(os.getenv("CATALOG_SYNC_INTERVAL", "0"))
+
+# Scraper: concurrent fetching with a per-host rate limit
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "8"))
+SCRAPER_RATE_PER_HOST = float(os.getenv("SCRAPER_RATE_PER_HOST", "1.0"))
+SCRAPER_BURST = int(os.getenv("SCRAPER_BURST", "2"))
+SCRAPER_MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", "4"))
+SCRAPER_BACKOFF_BASE = float(os.getenv("SCRAPER_BACKOFF_BASE", "0.5"))
+SCRAPER_BACKOFF_CAP = float(os.getenv("SCRAPER_BACKOFF_CAP", "30"))
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "10"))
+# Scraper state (HTTP validators, page archive, crawl frontier)
+SCRAPER_CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", "data/scraper")
+# Phone page parser: "fast" (lxml) or "soup" (original BeautifulSoup parser)
+SCRAPER_PARSER = os.getenv("SCRAPER_PARSER", "fast")
+# Crawl planner: brands to walk ("all" for every brand), phones per batch,
+# attempts per URL before it stays failed, and checkpoint file
+SCRAPER_BRANDS = os.getenv("SCRAPER_BRANDS", "samsung")
+SCRAPER_CRAWL_BATCH = int(os.getenv("SCRAPER_CRAWL_BATCH", "50"))
+SCRAPER_MAX_ATTEMPTS = int(os.getenv("SCRAPER_MAX_ATTEMPTS", "3"))
+SCRAPER_FRONTIER_PATH = os.getenv("SCRAPER_FRONTIER_PATH", "")
+# Ingest pipeline: parse processes (0 = one per CPU) and pages queued between stages
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", "0"))
+SCRAPER_QUEUE_SIZE = int(os.getenv("SCRAPER_QUEUE_SIZE", "64"))
+# Logging: records go through a queue to a background thread that writes the
+# console and a rotating file (by size, or by time if LOG_ROTATE_WHEN is e.g.
+# "midnight"). LOG_FORMAT is "json" or "text" for the file.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").strip().lower()
+LOG_CONSOLE = _env_bool("LOG_CONSOLE", True)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")
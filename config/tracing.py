@@ -0,0 +1,240 @@
+# config/tracing.py
+"""
+Lightweight in-process tracing. Code wraps its pipeline stages in
+`with stage("encode"):` and counts notable events with
+`count("fallbacks_total", reason="no_vector_index")`. Stage durations feed
+latency histograms, which the API renders in the Prometheus text format at
+/metrics. While a request trace is active (see api.middleware), the stages
+it ran are also collected for its Server-Timing header; the trace follows
+the request into asyncio.to_thread workers, since they copy the context.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+
+METRIC_PREFIX = "phone_api"
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+METRIC_HELP = {
+    "stage_duration_seconds": "Time spent in each pipeline stage",
+    "http_request_duration_seconds": "HTTP request latency by route",
+    "cache_hits_total": "Cache lookups answered from the cache",
+    "cache_misses_total": "Cache lookups that had to compute the value",
+    "fallbacks_total": "Requests served by a fallback path",
+    "model_invocations_total": "Calls into an embedding or generation model",
+}
+
+# (stage, seconds) pairs recorded during the current request, if traced
+_request_stages: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = (
+    contextvars.ContextVar("request_stages", default=None)
+)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs for every bucket, ending with +Inf"""
+        total, pairs = 0, []
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            pairs.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return pairs
+
+
+class Registry:
+    """Thread-safe histograms and counters, keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def counter_value(self, name: str, **labels) -> float:
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self.histograms.get((name, tuple(sorted(labels.items()))))
+
+    def clear(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+registry = Registry()
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Time the enclosed block as pipeline stage `name`"""
+    if not settings.TRACING_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe("stage_duration_seconds", elapsed, stage=name)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((name, elapsed))
+
+
+def traced(name: str):
+    """Decorator: time every call of the function as stage `name`"""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, amount: float = 1, **labels):
+    """Increment counter `name` (e.g. "cache_hits_total", cache="specs")"""
+    if settings.TRACING_ENABLED:
+        registry.increment(name, amount, **labels)
+
+
+def start_request_trace() -> contextvars.Token:
+    """Start collecting stages for the current request (see end_request_trace)"""
+    return _request_stages.set([])
+
+
+def request_stages() -> List[Tuple[str, float]]:
+    """The (stage, seconds) pairs recorded so far in the current request trace"""
+    return list(_request_stages.get() or [])
+
+
+def end_request_trace(token: contextvars.Token) -> List[Tuple[str, float]]:
+    """The (stage, seconds) pairs recorded since start_request_trace"""
+    stages = _request_stages.get() or []
+    _request_stages.reset(token)
+    return stages
+
+
+def server_timing(stages: Iterable[Tuple[str, float]], total: float = None) -> str:
+    """
+    Server-Timing header value. Repeated stages are summed, in order of
+    first appearance; stages may nest, so they needn't add up to `total`.
+    """
+    merged: Dict[str, float] = {}
+    for name, seconds in stages:
+        merged[name] = merged.get(name, 0.0) + seconds
+    if total is not None:
+        merged["total"] = total
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.2f}" for name, seconds in merged.items()
+    )
+
+
+def _labels(pairs: Iterable[Tuple[str, object]]) -> str:
+    if not pairs:
+        return ""
+    escaped = []
+    for key, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value) -> str:
+    """A sample value at full precision (":g" would round counters past 1e6)"""
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render_prometheus(gauges: Optional[Dict[str, float]] = None) -> str:
+    """
+    All histograms and counters in the Prometheus text exposition format,
+    plus `gauges` (unlabelled name -> value, e.g. connection pool stats).
+    """
+    with registry._lock:
+        histograms = {
+            key: (h.cumulative(), h.sum, h.count)
+            for key, h in registry.histograms.items()
+        }
+        counters = dict(registry.counters)
+
+    lines = []
+    for kind, series in (("histogram", histograms), ("counter", counters)):
+        for name in sorted({name for name, _ in series}):
+            full = f"{METRIC_PREFIX}_{name}"
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {full} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            for (metric, labels), value in sorted(series.items()):
+                if metric != name:
+                    continue
+                if kind == "counter":
+                    lines.append(f"{full}{_labels(labels)} {_number(value)}")
+                    continue
+                buckets, total, n = value
+                for le, cumulative in buckets:
+                    lines.append(
+                        f"{full}_bucket{_labels(labels + (('le', le),))} {cumulative}"
+                    )
+                lines.append(f"{full}_sum{_labels(labels)} {total:.6f}")
+                lines.append(f"{full}_count{_labels(labels)} {n}")
+
+    for name, value in sorted((gauges or {}).items()):
+        full = f"{METRIC_PREFIX}_{name}"
+        kind = "counter" if name.endswith("_total") else "gauge"
+        lines.append(f"# TYPE {full} {kind}")
+        lines.append(f"{full} {_number(value)}")
+    return "\n".join(lines) + "\n"
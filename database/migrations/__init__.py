@@ -0,0 +1,75 @@
+# database/migrations/__init__.py
+"""
+Minimal schema migration runner.
+Each migration module exposes VERSION, NAME and upgrade(conn). Applied
+versions are recorded in the schema_migrations table.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+
+from database.migrations import (
+    v0001_initial_schema,
+    v0002_spec_phone_key_index,
+    v0003_phone_name_trigram,
+    v0004_phone_spec_doc,
+    v0005_phone_spec_hash,
+)
+
+MIGRATIONS = [
+    v0001_initial_schema,
+    v0002_spec_phone_key_index,
+    v0003_phone_name_trigram,
+    v0004_phone_spec_doc,
+    v0005_phone_spec_hash,
+]
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def applied_versions(conn) -> set:
+    _metadata.create_all(conn, checkfirst=True)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def current_version(engine) -> int:
+    with engine.begin() as conn:
+        return max(applied_versions(conn), default=0)
+
+
+def run_migrations(engine, target: Optional[int] = None) -> List[str]:
+    """
+    Apply pending migrations up to `target` (default: latest), each in its
+    own transaction. Returns the names of the migrations applied.
+    """
+    applied = []
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+
+    for migration in MIGRATIONS:
+        if migration.VERSION in done:
+            continue
+        if target is not None and migration.VERSION > target:
+            break
+
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=migration.VERSION,
+                    name=migration.NAME,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        applied.append(f"{migration.VERSION:04d}_{migration.NAME}")
+
+    return applied
@@ -0,0 +1,47 @@
+# database/migrations/v0001_initial_schema.py
+"""
+Phones and specifications tables as originally created by create_all.
+Defined here rather than from the models so later model changes don't leak
+into this migration. Existing tables are left untouched.
+"""
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, Text
+
+VERSION = 1
+NAME = "initial_schema"
+
+metadata = MetaData()
+
+phones = Table(
+    "phones",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, nullable=False),
+    Column("url", String, unique=True, nullable=False),
+    Column("image", String, nullable=True),
+    Column("release_date", String),
+    Column("display_size", String),
+    Column("resolution", String),
+    Column("os", String),
+    Column("chipset", String),
+    Column("ram", String),
+    Column("storage", String),
+    Column("camera_main", String),
+    Column("battery", String),
+    Column("network", String),
+    Column("dimensions", String),
+    Column("weight", String),
+)
+
+specifications = Table(
+    "specifications",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("phone_id", Integer, ForeignKey("phones.id")),
+    Column("key", String, nullable=False),
+    Column("value", Text, nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
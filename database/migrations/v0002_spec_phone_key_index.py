@@ -0,0 +1,27 @@
+# database/migrations/v0002_spec_phone_key_index.py
+"""
+Unique composite index on specifications (phone_id, key).
+Spec lookups filter by phone_id, which had no index. Duplicate keys per
+phone are removed first, keeping the earliest row.
+"""
+
+from sqlalchemy import text
+
+VERSION = 2
+NAME = "spec_phone_key_index"
+
+
+def upgrade(conn):
+    conn.execute(
+        text(
+            "DELETE FROM specifications WHERE id NOT IN ("
+            ' SELECT MIN(id) FROM specifications GROUP BY phone_id, "key"'
+            ")"
+        )
+    )
+    conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_specifications_phone_id_key "
+            'ON specifications (phone_id, "key")'
+        )
+    )
@@ -0,0 +1,23 @@
+# database/migrations/v0003_phone_name_trigram.py
+"""
+pg_trgm GIN index on phones.name so fuzzy name lookups avoid full scans.
+No-op on databases other than Postgres.
+"""
+
+from sqlalchemy import text
+
+VERSION = 3
+NAME = "phone_name_trigram"
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return
+
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_phones_name_trgm "
+            "ON phones USING gin (name gin_trgm_ops)"
+        )
+    )
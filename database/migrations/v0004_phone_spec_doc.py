@@ -0,0 +1,45 @@
+# database/migrations/v0004_phone_spec_doc.py
+"""
+Denormalized spec document on phones (JSONB on Postgres, JSON elsewhere),
+backfilled from the specifications table.
+"""
+
+from itertools import groupby
+
+from sqlalchemy import JSON, bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+VERSION = 4
+NAME = "phone_spec_doc"
+
+BACKFILL_BATCH = 500
+
+
+def upgrade(conn):
+    postgres = conn.dialect.name == "postgresql"
+    conn.execute(
+        text(
+            f"ALTER TABLE phones ADD COLUMN spec_doc {'JSONB' if postgres else 'JSON'}"
+        )
+    )
+
+    rows = conn.execute(
+        text(
+            'SELECT phone_id, "key", value FROM specifications '
+            "WHERE phone_id IS NOT NULL ORDER BY phone_id, id"
+        )
+    )
+    update = text("UPDATE phones SET spec_doc = :doc WHERE id = :phone_id").bindparams(
+        bindparam("doc", type_=JSONB() if postgres else JSON())
+    )
+
+    batch = []
+    for phone_id, specs in groupby(rows, key=lambda row: row[0]):
+        batch.append(
+            {"phone_id": phone_id, "doc": {"specs": [[k, v] for _, k, v in specs]}}
+        )
+        if len(batch) >= BACKFILL_BATCH:
+            conn.execute(update, batch)
+            batch = []
+    if batch:
+        conn.execute(update, batch)
@@ -0,0 +1,96 @@
+# database/migrations/v0005_phone_spec_hash.py
+"""
+Content hash and catalog version on phones. Existing phones are hashed from
+their columns and spec document and stamped catalog version 1, so consumers
+that have built nothing yet (version 0) pick all of them up. The hash is
+frozen here, as database.models.spec_content_hash computed it when this
+migration was written, so replaying it gives the same hashes however the
+model code changes later.
+"""
+
+import hashlib
+import json
+import re
+
+from sqlalchemy import text
+
+VERSION = 5
+NAME = "phone_spec_hash"
+
+BACKFILL_BATCH = 500
+
+CONTENT_FIELDS = (
+    "name",
+    "url",
+    "image",
+    "release_date",
+    "display_size",
+    "resolution",
+    "os",
+    "chipset",
+    "ram",
+    "storage",
+    "camera_main",
+    "battery",
+    "network",
+    "dimensions",
+    "weight",
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value):
+    if value is None:
+        return None
+    return _WHITESPACE_RE.sub(" ", str(value)).strip()
+
+
+def spec_content_hash(fields, spec_items) -> str:
+    content = {
+        "fields": {f: _normalize(fields.get(f)) for f in CONTENT_FIELDS},
+        "specs": sorted((_normalize(k), _normalize(v)) for k, v in spec_items),
+    }
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE phones ADD COLUMN spec_hash VARCHAR(64)"))
+    conn.execute(
+        text("ALTER TABLE phones ADD COLUMN catalog_version INTEGER NOT NULL DEFAULT 0")
+    )
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_phones_catalog_version "
+            "ON phones (catalog_version)"
+        )
+    )
+
+    # The spec_doc backfill (v0004) covers every phone that has spec rows.
+    # Paged by id, since the rows being read are also being updated.
+    columns = ", ".join(CONTENT_FIELDS)
+    select_page = text(
+        f"SELECT id, {columns}, spec_doc FROM phones "
+        "WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+    update = text(
+        "UPDATE phones SET spec_hash = :spec_hash, catalog_version = 1 WHERE id = :id"
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select_page, {"last_id": last_id, "limit": BACKFILL_BATCH}
+        ).mappings()
+        batch = []
+        for row in rows:
+            doc = row["spec_doc"] or {}
+            if isinstance(doc, str):  # JSON columns come back as text over raw SQL
+                doc = json.loads(doc)
+            specs = [tuple(item) for item in doc.get("specs", [])]
+            batch.append({"id": row["id"], "spec_hash": spec_content_hash(row, specs)})
+        if not batch:
+            break
+        conn.execute(update, batch)
+        last_id = batch[-1]["id"]
@@ -1,7 +1,13 @@
 # database/models.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
-from sqlalchemy.orm import declarative_base, relationship
+import hashlib
+import json
+import re
+from typing import Iterable, Mapping, Tuple
+
+from sqlalchemy import JSON, Column, Index, Integer, String, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import declarative_base, deferred, relationship
 
 Base = declarative_base()
 
@@ -25,11 +31,72 @@ class Phone(Base):
     network = Column(String)
     dimensions = Column(String)
     weight = Column(String)
+    # Denormalized copy of the specifications rows, {"specs": [[key, value], ...]}.
+    # Deferred so list queries don't drag it along; read paths undefer it.
+    spec_doc = deferred(Column(JSON().with_variant(JSONB(), "postgresql")))
+    # Normalized content hash (see spec_content_hash) and the catalog version
+    # in which the phone last changed, so refreshes can find what changed
+    spec_hash = Column(String(64))
+    catalog_version = Column(Integer, nullable=False, default=0, index=True)
 
     specifications = relationship(
         "Specification", back_populates="phone", cascade="all, delete"
     )
 
+    def spec_items(self):
+        """(key, value) pairs from the spec document, or None if it isn't populated"""
+        if self.spec_doc is None:
+            return None
+        return [tuple(item) for item in self.spec_doc.get("specs", [])]
+
+
+def build_spec_doc(specifications: dict) -> dict:
+    """Spec document for Phone.spec_doc; a list of pairs keeps the scraped order"""
+    return {"specs": [[key, value] for key, value in specifications.items()]}
+
+
+# Phone columns that make up its content (everything but keys and bookkeeping)
+CONTENT_FIELDS = (
+    "name",
+    "url",
+    "image",
+    "release_date",
+    "display_size",
+    "resolution",
+    "os",
+    "chipset",
+    "ram",
+    "storage",
+    "camera_main",
+    "battery",
+    "network",
+    "dimensions",
+    "weight",
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value):
+    if value is None:
+        return None
+    return _WHITESPACE_RE.sub(" ", str(value)).strip()
+
+
+def spec_content_hash(
+    fields: Mapping[str, object], spec_items: Iterable[Tuple[str, str]]
+) -> str:
+    """
+    sha256 of a phone's content fields and specs after normalization
+    (whitespace collapsed, specs sorted), so cosmetic re-scrapes hash the same
+    """
+    content = {
+        "fields": {f: _normalize(fields.get(f)) for f in CONTENT_FIELDS},
+        "specs": sorted((_normalize(k), _normalize(v)) for k, v in spec_items),
+    }
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class Specification(Base):
     __tablename__ = "specifications"
@@ -40,3 +107,8 @@ class Specification(Base):
     value = Column(Text, nullable=False)
 
     phone = relationship("Phone", back_populates="specifications")
+
+    # Every spec lookup filters by phone_id; a phone has each key at most once
+    __table_args__ = (
+        Index("ix_specifications_phone_id_key", "phone_id", "key", unique=True),
+    )
@@ -1,11 +1,18 @@
 # database/setup.py
 
-from config.database import engine
-from database.models import Base
+from config.database import get_engine
+from config.logger import get_logger
+from database.migrations import run_migrations
+
+logger = get_logger(__name__)
 
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    """Create or upgrade the schema by applying pending migrations"""
+    applied = run_migrations(get_engine())
+    for name in applied:
+        logger.info(f"Applied migration {name}")
+    return applied
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+# scraper/archive.py
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional; archives fall back to gzip
+    zstandard = None
+
+from config import settings
+
+ZSTD_SUFFIX = ".html.zst"
+GZIP_SUFFIX = ".html.gz"
+
+
+def default_archive_root() -> str:
+    return os.path.join(settings.SCRAPER_CACHE_DIR, "archive")
+
+
+class PageArchive:
+    """
+    Content-addressed store of raw fetched pages.
+    Each distinct page body is kept once under objects/<sha256[:2]>/<sha256>,
+    compressed with zstd when available (gzip otherwise); index.jsonl is an
+    append-only log of (url, digest, fetched_at) so the latest copy of every
+    URL can be replayed offline.
+    """
+
+    def __init__(self, root: Optional[str] = None, codec: Optional[str] = None):
+        self.root = root or default_archive_root()
+        self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise ValueError("zstd archives need the 'zstandard' package")
+        self.index_path = os.path.join(self.root, "index.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+
+    def _object_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest + suffix)
+
+    def find_object(self, digest: str) -> Optional[str]:
+        for suffix in (ZSTD_SUFFIX, GZIP_SUFFIX):
+            path = self._object_path(digest, suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def put(self, url: str, html: str) -> str:
+        """Archive a page body for a URL; returns its content digest"""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self.find_object(digest) is None:
+            suffix = ZSTD_SUFFIX if self.codec == "zstd" else GZIP_SUFFIX
+            path = self._object_path(digest, suffix)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_compress(data, self.codec))
+            os.replace(tmp_path, path)
+
+        entry = {"url": url, "digest": digest, "fetched_at": time.time()}
+        with self._lock, open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Page body for a digest"""
+        path = self.find_object(digest)
+        if path is None:
+            raise KeyError(digest)
+        return read_object(path)
+
+    def latest(self) -> Dict[str, str]:
+        """url -> digest of its most recently archived copy"""
+        latest = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        latest[entry["url"]] = entry["digest"]
+        return latest
+
+    def __len__(self) -> int:
+        return len(self.latest())
+
+    def iter_pages(self) -> Iterator[Tuple[str, str]]:
+        """(url, html) for the latest copy of every archived URL"""
+        for url, digest in self.latest().items():
+            yield url, self.get(digest)
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def read_object(path: str) -> str:
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path} needs the 'zstandard' package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return data.decode("utf-8")
+
+
+def _parse_archived_page(job: Tuple[str, str, str]) -> Optional[dict]:
+    """Process-pool worker: load one archived page and parse it"""
+    from scraper.gsmarena_scraper import parse_phone_details
+
+    root, url, digest = job
+    return parse_phone_details(PageArchive(root).get(digest), url)
+
+
+def reparse_archive(archive: PageArchive, workers: Optional[int] = None) -> list:
+    """
+    Parse the latest copy of every archived page in a process pool
+    (no network access). Returns the parsed phone dicts.
+    """
+    jobs = [(archive.root, url, digest) for url, digest in archive.latest().items()]
+    if not jobs:
+        return []
+    if workers == 1:
+        return list(map(_parse_archived_page, jobs))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_archived_page, jobs, chunksize=16))
+
+
+def replay_archive(db, archive: PageArchive, workers: Optional[int] = None) -> dict:
+    """Re-run parse-and-save over the archive; returns ingest counts"""
+    from scraper.ingest import bulk_upsert_phones
+
+    return bulk_upsert_phones(db, reparse_archive(archive, workers))
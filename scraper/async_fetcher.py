@@ -0,0 +1,203 @@
+# scraper/async_fetcher.py
+
+import asyncio
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+from config import settings
+from scraper.archive import PageArchive
+from scraper.http_cache import CrawlStats, ValidatorStore
+from scraper.utils import DEFAULT_HEADERS
+
+# Responses worth retrying; anything else >= 400 fails immediately
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """A page could not be fetched (after retries, where retrying made sense)"""
+
+    def __init__(self, url: str, reason: str, status: Optional[int] = None):
+        super().__init__(f"Failed to fetch {url}: {reason}")
+        self.url = url
+        self.status = status
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, holding at most `burst`.
+    acquire() waits until a token is available; rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def backoff_delay(
+    attempt: int, base: float, cap: float, rng: random.Random = random
+) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))"""
+    return rng.uniform(0, min(cap, base * (2**attempt)))
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After", 0)), 0.0)
+    except ValueError:
+        # HTTP-date form; fall back to our own backoff
+        return 0.0
+
+
+class AsyncFetcher:
+    """
+    Concurrent page fetcher over one pooled httpx.AsyncClient.
+    At most `concurrency` requests are in flight, each host gets its own token
+    bucket, and transient failures are retried with jittered backoff.
+    With a ValidatorStore, requests are conditional and unchanged pages
+    (HTTP 304) come back as None without a body transfer; with a PageArchive
+    every downloaded page is archived.
+
+        async with AsyncFetcher() as fetcher:
+            html = await fetcher.fetch(url)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = None,
+        rate_per_host: float = None,
+        burst: int = None,
+        max_retries: int = None,
+        backoff_base: float = None,
+        backoff_cap: float = None,
+        timeout: float = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        validators: Optional[ValidatorStore] = None,
+        stats: Optional[CrawlStats] = None,
+        archive: Optional[PageArchive] = None,
+    ):
+        def pick(value, default):
+            return default if value is None else value
+
+        self.concurrency = pick(concurrency, settings.SCRAPER_CONCURRENCY)
+        self.rate_per_host = pick(rate_per_host, settings.SCRAPER_RATE_PER_HOST)
+        self.burst = pick(burst, settings.SCRAPER_BURST)
+        self.max_retries = pick(max_retries, settings.SCRAPER_MAX_RETRIES)
+        self.backoff_base = pick(backoff_base, settings.SCRAPER_BACKOFF_BASE)
+        self.backoff_cap = pick(backoff_cap, settings.SCRAPER_BACKOFF_CAP)
+        self.timeout = pick(timeout, settings.SCRAPER_TIMEOUT)
+        self.transport = transport
+        self.validators = validators
+        self.archive = archive
+        self.stats = stats or CrawlStats()
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return bucket
+
+    async def fetch(self, url: str, conditional: bool = True) -> Optional[str]:
+        """
+        Fetch a page's text, retrying transport errors, 429s and 5xxs.
+        Returns None when the page is unchanged since the stored validators
+        (pass conditional=False for pages whose body is always needed).
+        """
+        bucket = self._bucket(httpx.URL(url).host)
+        headers = (
+            self.validators.conditional_headers(url)
+            if self.validators and conditional
+            else {}
+        )
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            wait = 0.0
+            async with self._semaphore:
+                try:
+                    response = await self._client.get(url, headers=headers)
+                except httpx.TransportError as e:
+                    reason, status = f"{type(e).__name__}: {e}", None
+                else:
+                    status = response.status_code
+                    self.stats.record_response(status, response.num_bytes_downloaded)
+                    if status == 304:
+                        return None
+                    if status < 400:
+                        return await self._accept(url, response)
+                    reason = f"HTTP {status}"
+                    if status not in RETRY_STATUSES:
+                        self.stats.errors += 1
+                        raise FetchError(url, reason, status)
+                    wait = min(_retry_after(response), self.backoff_cap)
+
+            if attempt < self.max_retries:
+                self.stats.retries += 1
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                await asyncio.sleep(max(wait, delay))
+
+        self.stats.errors += 1
+        raise FetchError(url, f"{reason} after {self.max_retries + 1} attempts", status)
+
+    async def _accept(self, url: str, response: httpx.Response) -> str:
+        if self.validators is not None:
+            self.validators.update(url, response.headers)
+        if self.archive is not None:
+            await asyncio.to_thread(self.archive.put, url, response.text)
+        return response.text
+
+    async def fetch_many(
+        self, urls: Iterable[str], conditional: bool = True
+    ) -> List[Tuple[str, Union[str, None, FetchError]]]:
+        """Fetch all URLs concurrently; failures are returned, not raised"""
+        urls = list(urls)
+        results = await asyncio.gather(
+            *(self.fetch(url, conditional) for url in urls), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, FetchError):
+                raise result
+        return list(zip(urls, results))
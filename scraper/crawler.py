@@ -0,0 +1,163 @@
+# scraper/crawler.py
+"""
+Full-catalog crawl. The planner walks every listing page of the chosen brands
+into a CrawlFrontier; the crawl then runs pending phone pages through the
+ingest pipeline (scraper.pipeline), which checkpoints the frontier after every
+saved batch so an interrupted run loses at most one batch of work when resumed.
+"""
+
+from typing import Iterable, List, Optional
+
+from catalog.refresh import (
+    apply_catalog_change,
+    changes_since,
+    current_catalog_version,
+)
+from config import settings
+from config.logger import get_logger
+from scraper.async_fetcher import AsyncFetcher
+from scraper.frontier import CrawlFrontier
+from scraper.gsmarena_scraper import (
+    BRAND_LISTING_URLS,
+    MAKERS_URL,
+    parse_listing_page,
+    parse_makers_page,
+)
+from scraper.pipeline import IngestPipeline
+
+logger = get_logger(__name__)
+
+
+def brand_list(brands=None) -> List[str]:
+    """Brand slugs from a list or a comma-separated string (default SCRAPER_BRANDS)"""
+    if brands is None:
+        brands = settings.SCRAPER_BRANDS
+    if isinstance(brands, str):
+        brands = brands.split(",")
+    return [brand.strip().lower() for brand in brands if brand.strip()]
+
+
+async def listing_start_urls(fetcher: AsyncFetcher, brands=None) -> List[str]:
+    """
+    First listing page of each brand. Brands not in BRAND_LISTING_URLS (or
+    "all") are looked up on the makers page.
+    """
+    wanted = brand_list(brands)
+    starts = {b: BRAND_LISTING_URLS[b] for b in wanted if b in BRAND_LISTING_URLS}
+
+    if len(starts) < len(wanted):
+        makers = parse_makers_page(await fetcher.fetch(MAKERS_URL, conditional=False))
+        if "all" in wanted:
+            return list(makers.values())
+        for brand in wanted:
+            if brand in makers:
+                starts.setdefault(brand, makers[brand])
+            elif brand not in starts:
+                logger.warning(f"⚠️ Unknown brand: {brand}")
+
+    return [starts[b] for b in wanted if b in starts]
+
+
+async def discover_phone_urls(
+    fetcher: AsyncFetcher, start_urls: Iterable[str]
+) -> List[str]:
+    """
+    Walks every listing page reachable through the pagers of the start pages
+    and returns the phone URLs found, in listing order.
+    """
+    phones = {}
+    queue = list(dict.fromkeys(start_urls))
+    seen = set(queue)
+
+    while queue:
+        next_queue = []
+        for url, result in await fetcher.fetch_many(queue, conditional=False):
+            if isinstance(result, Exception):
+                logger.error(f"Error reading listing {url}: {str(result)}")
+                continue
+            page_phones, pages = parse_listing_page(result)
+            phones.update(dict.fromkeys(page_phones))
+            for page in pages:
+                if page not in seen:
+                    seen.add(page)
+                    next_queue.append(page)
+        queue = next_queue
+
+    logger.info(f"Found {len(phones)} phone links on {len(seen)} listing pages")
+    return list(phones)
+
+
+async def plan_crawl(
+    frontier: CrawlFrontier,
+    fetcher: AsyncFetcher,
+    brands=None,
+    start_urls: Optional[Iterable[str]] = None,
+) -> int:
+    """Queue every listed phone URL in the frontier; returns how many were new"""
+    if start_urls is None:
+        start_urls = await listing_start_urls(fetcher, brands)
+    added = frontier.add(await discover_phone_urls(fetcher, start_urls))
+    frontier.mark_planned()
+    frontier.checkpoint()
+    return added
+
+
+async def crawl_catalog(
+    db,
+    frontier: CrawlFrontier,
+    fetcher: AsyncFetcher,
+    brands=None,
+    start_urls: Optional[Iterable[str]] = None,
+    batch_size: int = None,
+    replan: bool = False,
+    limit: Optional[int] = None,
+    workers: int = None,
+    rebuild: bool = True,
+) -> dict:
+    """
+    Plans the crawl if the frontier hasn't been planned yet (or `replan`),
+    then runs pending URLs through an IngestPipeline with `workers` parse
+    processes. It saves batches of `batch_size` phones and checkpoints the
+    frontier (and HTTP validators) after each; URLs that failed with attempts
+    left are retried in further passes. `limit` stops the run after that many
+    URLs. Afterwards the phones whose content changed are handed to the
+    catalog rebuild hooks (unless `rebuild` is False). The fetcher must
+    already be open. Returns the frontier summary plus the pipeline stats
+    and catalog change.
+    """
+    since_version = current_catalog_version(db)
+
+    if replan or not frontier.planned:
+        added = await plan_crawl(frontier, fetcher, brands, start_urls)
+        logger.info(
+            f"🗺️ Planned crawl: {added} new URLs, {len(frontier.pending)} pending"
+        )
+
+    pipeline = IngestPipeline(
+        db, fetcher, workers=workers, batch_size=batch_size, frontier=frontier
+    )
+    processed = 0
+
+    while frontier.pending and (limit is None or processed < limit):
+        size = len(frontier.pending) if limit is None else limit - processed
+        urls = frontier.next_batch(size)
+        await pipeline.run(urls)
+
+        processed += len(urls)
+        summary = frontier.summary()
+        logger.info(
+            f"📦 {summary['done']} done, {summary['pending']} pending, "
+            f"{summary['failed']} failed"
+        )
+
+    change = changes_since(db, since_version)
+    logger.info(
+        f"🧮 {len(change.changed_ids)} phones changed (catalog v{change.version})"
+    )
+    return {
+        **frontier.summary(),
+        "pipeline": pipeline.stats(),
+        "catalog_version": change.version,
+        "changed_ids": list(change.changed_ids),
+        "rebuilt": apply_catalog_change(db, change) if rebuild else {},
+    }
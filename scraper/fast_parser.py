@@ -0,0 +1,281 @@
+# scraper/fast_parser.py
+"""
+lxml-based GSMArena phone page parser. Produces the same dict as the
+BeautifulSoup parser in gsmarena_scraper, but walks only the title, photo
+and #specs-list elements, and maps spec rows to structured fields through
+a table compiled once per (category, key) pair instead of re-running the
+whole rule chain on lowercased strings for every row.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import lxml.html
+
+_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Structured-field rules in priority order, mirroring the scraper's elif chain.
+# Each rule: (field, category terms, key terms, value terms, how they combine)
+#   key          - any key term
+#   key+value    - any key term and any value term
+#   key|value    - any key term, or any value term
+#   any          - any category, key or value term
+#   cat|key+value- any category term, or (any key term and any value term)
+#   cat+key      - any category term and any key term
+# The "memory" rule is special: once the category/key match it ends the chain
+# whether or not RAM/storage get filled.
+MAPPING_RULES = (
+    ("release_date", (), ("announced", "release", "status"), (), "key"),
+    ("display_size", (), ("size",), ("inch", '"', "diagonal"), "key+value"),
+    ("resolution", (), ("resolution",), (), "key"),
+    ("os", (), ("os",), ("android", "ios", "windows"), "key|value"),
+    ("chipset", (), ("chipset", "cpu", "processor"), (), "key"),
+    ("memory", ("memory",), ("memory", "ram", "storage"), (), "memory"),
+    (
+        "camera_main",
+        ("main camera", "primary camera"),
+        ("camera",),
+        ("mp", "megapixel", "pixel"),
+        "cat|key+value",
+    ),
+    ("battery", ("battery",), ("battery",), ("mah",), "any"),
+    ("dimensions", (), ("dimensions",), (), "key"),
+    ("weight", (), ("weight",), (), "key"),
+    ("network", ("network",), ("technology",), (), "cat+key"),
+)
+
+_RAM_IN_VALUE_RE = re.compile(r"\d+\s*gb.*ram")
+_RAM_AMOUNT_RE = re.compile(r"(\d+)\s*gb.*?ram")
+
+# A compiled step: (field, value terms that must also match or None, memory flags)
+Step = Tuple[str, Optional[Tuple[str, ...]], Optional[Tuple[bool, bool, bool]]]
+
+
+def _has_any(text: str, terms) -> bool:
+    return any(term in text for term in terms)
+
+
+@lru_cache(maxsize=8192)
+def compile_mapping(category: str, key: str) -> Tuple[Step, ...]:
+    """
+    The rule steps that can still apply to a (category, key) pair, with the
+    category/key conditions already evaluated; only value checks remain.
+    """
+    cat_lower, key_lower = category.lower(), key.lower()
+    steps: List[Step] = []
+
+    for field, cat_terms, key_terms, val_terms, mode in MAPPING_RULES:
+        cat_hit = _has_any(cat_lower, cat_terms)
+        key_hit = _has_any(key_lower, key_terms)
+
+        if mode == "memory":
+            if cat_hit or key_hit:
+                flags = (
+                    "ram" in key_lower,
+                    "internal" in key_lower or "storage" in key_lower,
+                    "memory" in key_lower,
+                )
+                steps.append((field, None, flags))
+        elif mode == "key":
+            if key_hit:
+                steps.append((field, None, None))
+        elif mode == "key+value":
+            if key_hit:
+                steps.append((field, val_terms, None))
+        elif mode in ("key|value", "any"):
+            steps.append((field, None if cat_hit or key_hit else val_terms, None))
+        elif mode == "cat|key+value":
+            if cat_hit or key_hit:
+                steps.append((field, None if cat_hit else val_terms, None))
+        elif mode == "cat+key":
+            if cat_hit and key_hit:
+                steps.append((field, None, None))
+
+    return tuple(steps)
+
+
+def map_spec_row(phone_data: dict, category: str, key: str, value: str):
+    """Fill the first structured field a spec row maps to (same rules as the scraper)"""
+    val_lower = None
+
+    for field, val_terms, memory in compile_mapping(category, key):
+        if memory is not None:
+            ram_key, storage_key, memory_key = memory
+            val_lower = value.lower()
+            if not phone_data["ram"]:
+                if ram_key or "ram" in val_lower:
+                    phone_data["ram"] = value
+                elif _RAM_IN_VALUE_RE.search(val_lower):
+                    match = _RAM_AMOUNT_RE.search(val_lower)
+                    if match:
+                        phone_data["ram"] = f"{match.group(1)}GB"
+            if not phone_data["storage"] and (
+                storage_key or (memory_key and "gb" in val_lower)
+            ):
+                phone_data["storage"] = value
+            return
+
+        if phone_data[field]:
+            continue
+        if val_terms is not None:
+            if val_lower is None:
+                val_lower = value.lower()
+            if not _has_any(val_lower, val_terms):
+                continue
+        phone_data[field] = value
+        return
+
+
+def _classes(element) -> List[str]:
+    return (element.get("class") or "").split()
+
+
+# Elements whose text BeautifulSoup's get_text leaves out
+_SKIPPED_TEXT_TAGS = {"script", "style", "template"}
+
+
+def _strings(element):
+    if element.text:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have non-string tags
+        if isinstance(child.tag, str) and child.tag not in _SKIPPED_TEXT_TAGS:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element, separator: str = "") -> str:
+    """BeautifulSoup's get_text(separator, strip=True)"""
+    return separator.join(
+        part for part in (s.strip() for s in _strings(element)) if part
+    )
+
+
+def _first(elements):
+    return elements[0] if elements else None
+
+
+def _find_title(root):
+    title = _first(
+        root.xpath(
+            "//h1[contains(concat(' ', normalize-space(@class), ' '),"
+            " ' specs-phone-name-title ')]"
+        )
+    )
+    if title is None:
+        title = _first(root.xpath("//h1"))
+    if title is None:
+        title = _first(
+            root.xpath(
+                "//*[contains(concat(' ', normalize-space(@class), ' '),"
+                " ' specs-brief-accent ')]"
+            )
+        )
+    return title
+
+
+def _find_image(root):
+    for path in (
+        "//*[contains(concat(' ', normalize-space(@class), ' '), ' specs-photo-main ')]//img",
+        "//*[contains(concat(' ', normalize-space(@class), ' '), ' specs-photo ')]//img",
+        "//img[contains(concat(' ', normalize-space(@class), ' '), ' specs-photo ')]",
+    ):
+        image = _first(root.xpath(path))
+        if image is not None:
+            return image
+    return None
+
+
+def _row_cells(row):
+    """(key cell, value cell) of a spec row, or None for header rows"""
+    key_cell = value_cell = None
+    cells = []
+    for element in row.iterdescendants("th", "td"):
+        if element.tag == "th":
+            if "ttl" in _classes(element):
+                return None
+            continue
+        cells.append(element)
+        classes = _classes(element)
+        if key_cell is None and "ttl" in classes:
+            key_cell = element
+        if value_cell is None and "nfo" in classes:
+            value_cell = element
+
+    if key_cell is None or value_cell is None:
+        if len(cells) >= 2:
+            return cells[0], cells[1]
+        return None
+    return key_cell, value_cell
+
+
+def _category(table) -> str:
+    first_th = None
+    for th in table.iterdescendants("th"):
+        if "ttl" in _classes(th):
+            return _text(th)
+        if first_th is None:
+            first_th = th
+    return _text(first_th) if first_th is not None else "General"
+
+
+def parse_phone_details_fast(html: str, url: str) -> dict:
+    """
+    Parses a GSMArena phone page into structured fields and a specs dict
+    (same output as gsmarena_scraper.parse_phone_details in soup mode).
+    """
+    phone_data = {
+        "url": url,
+        "name": None,
+        "image": None,
+        "release_date": None,
+        "display_size": None,
+        "resolution": None,
+        "os": None,
+        "chipset": None,
+        "ram": None,
+        "storage": None,
+        "camera_main": None,
+        "battery": None,
+        "network": None,
+        "dimensions": None,
+        "weight": None,
+        "specifications": {},
+    }
+
+    root = lxml.html.document_fromstring(html.encode("utf-8"), parser=_PARSER)
+
+    title = _find_title(root)
+    if title is not None:
+        phone_data["name"] = _text(title)
+
+    image = _find_image(root)
+    if image is not None and image.get("src"):
+        phone_data["image"] = image.get("src")
+
+    spec_table = _first(root.xpath("//div[@id='specs-list']"))
+    if spec_table is None:
+        spec_table = _first(root.xpath("//table[@cellspacing='0']"))
+    if spec_table is None:
+        return phone_data
+
+    tables = list(spec_table.iterdescendants("table")) or [spec_table]
+    specifications = phone_data["specifications"]
+
+    for table in tables:
+        category = _category(table)
+
+        for row in table.iterdescendants("tr"):
+            cells = _row_cells(row)
+            if cells is None:
+                continue
+
+            key = _text(cells[0])
+            value = _text(cells[1], " ")
+            if key and value and key != value:
+                specifications[f"{category} - {key}"] = value
+                map_spec_row(phone_data, category, key, value)
+
+    return phone_data
@@ -0,0 +1,161 @@
+# scraper/frontier.py
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config import settings
+
+FRONTIER_FORMAT = 1
+
+
+def default_frontier_path() -> str:
+    return settings.SCRAPER_FRONTIER_PATH or os.path.join(
+        settings.SCRAPER_CACHE_DIR, "frontier.json"
+    )
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class CrawlFrontier:
+    """
+    Persistent state of a full-catalog crawl: phone URLs still pending, done
+    (with per-URL fetch/parse timings) and failed (with the last error).
+    checkpoint() writes it to disk atomically, so an interrupted crawl
+    resumes from its last checkpoint instead of starting over.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_attempts: int = None):
+        self.path = path or default_frontier_path()
+        self.max_attempts = max_attempts or settings.SCRAPER_MAX_ATTEMPTS
+        self._lock = threading.Lock()
+        # dicts keep insertion order, so pending doubles as an ordered set
+        self.pending: Dict[str, int] = {}
+        self.done: Dict[str, dict] = {}
+        self.failed: Dict[str, dict] = {}
+        self.planned_at: Optional[float] = None
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("format") != FRONTIER_FORMAT:
+                raise ValueError(f"Unsupported frontier format in {self.path}")
+            self.pending = dict(state["pending"])
+            self.done = state["done"]
+            self.failed = state["failed"]
+            self.planned_at = state.get("planned_at")
+
+    def __len__(self) -> int:
+        return len(self.pending) + len(self.done) + len(self.failed)
+
+    @property
+    def planned(self) -> bool:
+        return self.planned_at is not None
+
+    def add(self, urls: Iterable[str]) -> int:
+        """Queue URLs the frontier hasn't seen yet; returns how many were new"""
+        added = 0
+        with self._lock:
+            for url in urls:
+                if url in self.pending or url in self.done or url in self.failed:
+                    continue
+                self.pending[url] = 0
+                added += 1
+        return added
+
+    def mark_planned(self):
+        self.planned_at = time.time()
+
+    def next_batch(self, size: int) -> List[str]:
+        """The next `size` pending URLs (they stay pending until marked)"""
+        with self._lock:
+            return [url for url, _ in zip(self.pending, range(size))]
+
+    def mark_done(
+        self,
+        url: str,
+        fetch_seconds: float,
+        parse_seconds: float = 0.0,
+        status: str = "parsed",
+    ):
+        """
+        Record a finished URL; status is "parsed", "not_modified" (HTTP 304)
+        or "skipped" (fetched but nothing to save)
+        """
+        with self._lock:
+            self.pending.pop(url, None)
+            self.failed.pop(url, None)
+            self.done[url] = {
+                "status": status,
+                "fetch_ms": round(fetch_seconds * 1000, 1),
+                "parse_ms": round(parse_seconds * 1000, 1),
+                "at": time.time(),
+            }
+
+    def mark_failed(self, url: str, error: str):
+        """
+        Count a failed attempt; the URL stays pending until it has failed
+        max_attempts times, then moves to failed
+        """
+        with self._lock:
+            attempts = self.pending.pop(url, 0) + 1
+            if attempts < self.max_attempts:
+                # Back of the queue, so one bad page doesn't stall a batch
+                self.pending[url] = attempts
+            else:
+                self.failed[url] = {
+                    "error": error,
+                    "attempts": attempts,
+                    "at": time.time(),
+                }
+
+    def requeue_failed(self) -> int:
+        """Give every failed URL a fresh set of attempts"""
+        with self._lock:
+            urls = list(self.failed)
+            self.failed.clear()
+            for url in urls:
+                self.pending[url] = 0
+        return len(urls)
+
+    def checkpoint(self):
+        """Write the frontier to disk atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            state = {
+                "format": FRONTIER_FORMAT,
+                "planned_at": self.planned_at,
+                "pending": list(self.pending.items()),
+                "done": self.done,
+                "failed": self.failed,
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> dict:
+        """Counts plus median / p95 fetch and parse times over done URLs"""
+        with self._lock:
+            fetched = [d for d in self.done.values() if d["status"] != "not_modified"]
+            fetch_ms = [d["fetch_ms"] for d in fetched]
+            parse_ms = [d["parse_ms"] for d in fetched if d["status"] == "parsed"]
+            return {
+                "pending": len(self.pending),
+                "done": len(self.done),
+                "failed": len(self.failed),
+                "not_modified": len(self.done) - len(fetched),
+                "fetch_ms_p50": _percentile(fetch_ms, 0.5),
+                "fetch_ms_p95": _percentile(fetch_ms, 0.95),
+                "parse_ms_p50": _percentile(parse_ms, 0.5),
+                "parse_ms_p95": _percentile(parse_ms, 0.95),
+            }
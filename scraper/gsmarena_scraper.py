@@ -1,10 +1,21 @@
 # scraper/gsmarena_scraper.py
 
+import asyncio
+import logging
 import re
-from scraper.utils import fetch_html
+from typing import Dict, List, Tuple
+from scraper.archive import PageArchive
+from scraper.async_fetcher import AsyncFetcher
+from scraper.fast_parser import parse_phone_details_fast
+from scraper.http_cache import CrawlStats, ValidatorStore
+from scraper.utils import fetch_html, fetch_text
 from bs4 import BeautifulSoup
-from config.database import SessionLocal
-from database.models import Phone, Specification
+from config import settings
+from config.database import session_scope
+from config.logger import get_logger
+from scraper.ingest import bulk_upsert_phones
+
+logger = get_logger(__name__)
 
 BASE_URL = "https://www.gsmarena.com/"
 # SAMSUNG_PHONE_LIST_URL = f"{BASE_URL}samsung-phones-9.php"
@@ -12,6 +23,17 @@ SAMSUNG_PHONE_LIST_URL = (
     f"{BASE_URL}samsung-phones-f-9-17-r1-p1.php"  # for most popular phones
 )
 
+# Full brand listings, walked page by page by the crawl planner (scraper.crawler)
+MAKERS_URL = f"{BASE_URL}makers.php3"
+BRAND_LISTING_URLS = {"samsung": f"{BASE_URL}samsung-phones-9.php"}
+
+
+def absolute_url(href: str) -> str:
+    """Full URL for a (possibly relative) link found on a GSMArena page"""
+    if href.startswith("http"):
+        return href
+    return BASE_URL + href.lstrip("/")
+
 
 def get_phone_links(limit=15):
     """
@@ -27,28 +49,71 @@ def get_phone_links(limit=15):
         # Try alternative selector
         phone_list = soup.select(".section-body ul li a")
 
-    print(f"Found {len(phone_list)} phone links")
+    logger.info(f"Found {len(phone_list)} phone links")
 
     for a in phone_list[:limit]:
         relative_url = a.get("href")
         if relative_url:
-            # Handle both relative and absolute URLs
-            if relative_url.startswith("http"):
-                full_url = relative_url
-            else:
-                full_url = BASE_URL + relative_url.lstrip("/")
-            phone_links.append(full_url)
+            phone_links.append(absolute_url(relative_url))
 
     return phone_links
 
 
+def parse_listing_page(html: str) -> Tuple[List[str], List[str]]:
+    """
+    Returns the phone page URLs on a brand listing page and the URLs of the
+    other listing pages linked from its pager.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    phone_list = soup.select("div.makers ul li a") or soup.select(
+        ".section-body ul li a"
+    )
+    phones = [absolute_url(a["href"]) for a in phone_list if a.get("href")]
+    pages = [
+        absolute_url(a["href"])
+        for a in soup.select("div.nav-pages a")
+        if a.get("href") and not a["href"].startswith("#")
+    ]
+    return phones, pages
+
+
+def parse_makers_page(html: str) -> Dict[str, str]:
+    """
+    Brand slug (e.g. "samsung") -> first listing page URL, from makers.php3
+    """
+    soup = BeautifulSoup(html, "lxml")
+    brands = {}
+    for a in soup.select("div.st-text a"):
+        href = a.get("href") or ""
+        if "-phones-" in href:
+            brands[href.split("-phones-")[0].lower()] = absolute_url(href)
+    return brands
+
+
 def scrape_phone_details(url: str) -> dict:
     """
     Scrapes the full specifications and metadata of a Samsung phone from GSMArena.
     Returns a dict with structured fields and a specs dict.
     """
-    print(f"Scraping: {url}")
-    soup = fetch_html(url)
+    logger.debug("Scraping: %s", url)
+    return parse_phone_details(fetch_text(url), url)
+
+
+def parse_phone_details(html: str, url: str) -> dict:
+    """
+    Parses a GSMArena phone page (already fetched) into structured fields and a specs dict.
+    Uses the lxml parser unless SCRAPER_PARSER=soup.
+    """
+    if settings.SCRAPER_PARSER == "soup":
+        return parse_phone_details_soup(html, url)
+    return parse_phone_details_fast(html, url)
+
+
+def parse_phone_details_soup(html: str, url: str) -> dict:
+    """
+    Original BeautifulSoup parser (verbose; kept as the reference for the lxml parser).
+    """
+    soup = BeautifulSoup(html, "lxml")
 
     phone_data = {
         "url": url,
@@ -78,7 +143,7 @@ def scrape_phone_details(url: str) -> dict:
 
     if title_elem:
         phone_data["name"] = title_elem.get_text(strip=True)
-        print(f"Found phone name: {phone_data['name']}")
+        logger.debug("Found phone name: %s", phone_data["name"])
 
     # Get image - try multiple selectors
     image_elem = soup.select_one(".specs-photo-main img")
@@ -96,7 +161,7 @@ def scrape_phone_details(url: str) -> dict:
         spec_table = soup.find("table", {"cellspacing": "0"})
 
     if spec_table:
-        print("Found spec table, processing...")
+        logger.debug("Found spec table, processing...")
 
         # Handle different table structures
         tables = spec_table.select("table")
@@ -112,7 +177,7 @@ def scrape_phone_details(url: str) -> dict:
             category = "General"
             if category_elem:
                 category = category_elem.get_text(strip=True)
-                print(f"Processing category: {category}")
+                logger.debug("Processing category: %s", category)
 
             # Process rows
             rows = table.select("tr")
@@ -142,7 +207,7 @@ def scrape_phone_details(url: str) -> dict:
                         # Store in master spec dict
                         spec_key = f"{category} - {key}"
                         phone_data["specifications"][spec_key] = value
-                        print(f"  {key}: {value}")
+                        logger.debug("  %s: %s", key, value)
 
                         # Structured mapping with improved logic
                         key_lower = key.lower()
@@ -255,67 +320,63 @@ def scrape_phone_details(url: str) -> dict:
                             phone_data["network"] = value
 
     else:
-        print("No spec table found!")
+        logger.warning(f"No spec table found on {url}")
 
     # Debug output
-    print(f"Extracted structured data:")
-    for key, value in phone_data.items():
-        if key != "specifications" and value:
-            print(f"  {key}: {value}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Extracted structured data:")
+        for key, value in phone_data.items():
+            if key != "specifications" and value:
+                logger.debug("  %s: %s", key, value)
 
     return phone_data
 
 
 def save_phone_to_db(phone_data: dict, db):
+    """
+    Insert or update a single scraped phone (see scraper.ingest for batches).
+    """
     if not phone_data.get("name"):
-        print("Skipping phone with no name")
+        logger.warning("Skipping phone with no name")
         return
 
-    # Check if phone already exists
-    existing = db.query(Phone).filter(Phone.name == phone_data["name"]).first()
-    if existing:
-        print(f"Skipping {phone_data['name']} (already in DB)")
+    try:
+        counts = bulk_upsert_phones(db, [phone_data])
+    except Exception as e:
+        logger.error(f"Error saving {phone_data['name']}: {str(e)}")
         return
 
-    # Create Phone instance
-    phone = Phone(
-        name=phone_data["name"],
-        url=phone_data["url"],
-        image=phone_data["image"],
-        release_date=phone_data["release_date"],
-        display_size=phone_data["display_size"],
-        resolution=phone_data["resolution"],
-        os=phone_data["os"],
-        chipset=phone_data["chipset"],
-        ram=phone_data["ram"],
-        storage=phone_data["storage"],
-        camera_main=phone_data["camera_main"],
-        battery=phone_data["battery"],
-        network=phone_data["network"],
-        dimensions=phone_data["dimensions"],
-        weight=phone_data["weight"],
+    status = next(key for key, count in counts.items() if count)
+    logger.info(
+        f"✅ Saved to DB ({status}): {phone_data['name']} "
+        f"with {len(phone_data['specifications'])} specifications"
     )
 
-    try:
-        db.add(phone)
-        db.commit()
-        db.refresh(phone)  # Load phone.id
-
-        # Add specifications
-        specs = []
-        for key, value in phone_data["specifications"].items():
-            spec = Specification(phone_id=phone.id, key=key, value=value)
-            specs.append(spec)
 
-        if specs:
-            db.add_all(specs)
-            db.commit()
-
-        print(f"✅ Saved to DB: {phone.name} with {len(specs)} specifications")
-
-    except Exception as e:
-        print(f"Error saving {phone_data['name']}: {str(e)}")
-        db.rollback()
+async def scrape_phones_async(urls, fetcher: AsyncFetcher = None, **options) -> list:
+    """
+    Fetches phone pages concurrently (rate-limited per host) and parses them.
+    Pages that fail to fetch or parse are reported and skipped, and pages the server reports
+    unchanged (304 on a conditional request) are skipped without parsing.
+    A given fetcher must already be open; otherwise one is built from `options`.
+    """
+    if fetcher is None:
+        async with AsyncFetcher(**options) as own_fetcher:
+            return await scrape_phones_async(urls, own_fetcher)
+
+    phones = []
+    for url, result in await fetcher.fetch_many(urls):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing {url}: {str(result)}")
+            continue
+        if result is None:
+            continue
+        try:
+            phones.append(parse_phone_details(result, url))
+        except Exception as e:
+            logger.error(f"Error processing {url}: {str(e)}")
+            continue
+    return phones
 
 
 def debug_page_structure(url: str):
@@ -358,29 +419,34 @@ def debug_page_structure(url: str):
 
 # 🧪 Test run
 if __name__ == "__main__":
-    db = SessionLocal()
-
     try:
-        links = get_phone_links(limit=15)  # Start with fewer links for testing
-
-        if not links:
-            print("No phone links found!")
-        else:
-            # Debug first URL structure
-            print("=== DEBUGGING FIRST URL ===")
-            debug_page_structure(links[0])
-            print("=" * 50)
-
-            for i, url in enumerate(links, 1):
-                print(f"\n🔗 {i}/{len(links)}. Scraping: {url}")
-                try:
-                    phone_data = scrape_phone_details(url)
-                    save_phone_to_db(phone_data, db)
-                except Exception as e:
-                    print(f"Error processing {url}: {str(e)}")
-                    continue
+        with session_scope() as db:
+            links = get_phone_links(limit=15)  # Start with fewer links for testing
+            validators, stats, archive = ValidatorStore(), CrawlStats(), PageArchive()
+
+            if not links:
+                print("No phone links found!")
+            else:
+                # Debug first URL structure
+                print("=== DEBUGGING FIRST URL ===")
+                debug_page_structure(links[0])
+                print("=" * 50)
+
+                print(f"\n🔗 Scraping {len(links)} phones...")
+                from scraper.pipeline import IngestPipeline
+
+                async def ingest():
+                    fetcher = AsyncFetcher(
+                        validators=validators, stats=stats, archive=archive
+                    )
+                    async with fetcher:
+                        return await IngestPipeline(db, fetcher).run(links)
+
+                pipeline_stats = asyncio.run(ingest())
+                print(f"💾 Ingested: {pipeline_stats['ingested']}")
+                print(f"🏭 Pipeline stages: {pipeline_stats['stages']}")
+                validators.save()
+                print(f"📈 Crawl stats: {stats.as_dict()}")
 
     except Exception as e:
         print(f"Fatal error: {str(e)}")
-    finally:
-        db.close()
@@ -0,0 +1,93 @@
+# scraper/http_cache.py
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Mapping, Optional
+
+from config import settings
+
+
+def default_validator_path() -> str:
+    return os.path.join(settings.SCRAPER_CACHE_DIR, "validators.json")
+
+
+class ValidatorStore:
+    """
+    ETag / Last-Modified per URL, persisted as JSON, so later crawls can send
+    conditional requests and skip pages that haven't changed (HTTP 304).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_validator_path()
+        self._lock = threading.Lock()
+        self._validators: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self._validators = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._validators)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a URL (empty if unseen)"""
+        stored = self._validators.get(url, {})
+        headers = {}
+        if stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        if stored.get("last_modified"):
+            headers["If-Modified-Since"] = stored["last_modified"]
+        return headers
+
+    def update(self, url: str, headers: Mapping[str, str]):
+        """Remember the validators a 200 response came with"""
+        entry = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        with self._lock:
+            if entry["etag"] or entry["last_modified"]:
+                self._validators[url] = entry
+            else:
+                self._validators.pop(url, None)
+
+    def forget(self, url: str):
+        """Drop a URL's validators so the next fetch downloads it in full"""
+        with self._lock:
+            self._validators.pop(url, None)
+
+    def save(self):
+        """Write the store to disk atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._validators, f)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class CrawlStats:
+    """Transfer counters for one crawl"""
+
+    requests: int = 0
+    bytes_received: int = 0
+    not_modified: int = 0
+    retries: int = 0
+    errors: int = 0
+
+    def record_response(self, status: int, nbytes: int):
+        self.requests += 1
+        self.bytes_received += nbytes
+        if status == 304:
+            self.not_modified += 1
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.not_modified / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "cache_hit_rate": round(self.cache_hit_rate, 3)}
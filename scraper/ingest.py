@@ -0,0 +1,168 @@
+# scraper/ingest.py
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from catalog.refresh import current_catalog_version
+from database.models import Phone, Specification, build_spec_doc, spec_content_hash
+
+# Phone columns filled from a scraped phone dict (name is the natural key)
+PHONE_FIELDS = (
+    "name",
+    "url",
+    "image",
+    "release_date",
+    "display_size",
+    "resolution",
+    "os",
+    "chipset",
+    "ram",
+    "storage",
+    "camera_main",
+    "battery",
+    "network",
+    "dimensions",
+    "weight",
+    "spec_doc",
+    "spec_hash",
+)
+
+INGEST_BATCH_SIZE = 200
+
+
+def phone_row(phone_data: dict) -> dict:
+    """Column values for the phones table from a scraped phone dict"""
+    specifications = phone_data.get("specifications") or {}
+    row = {field: phone_data.get(field) for field in PHONE_FIELDS}
+    row["spec_doc"] = build_spec_doc(specifications)
+    row["spec_hash"] = spec_content_hash(row, specifications.items())
+    return row
+
+
+def bulk_upsert_phones(
+    db: Session,
+    phone_dicts: Iterable[dict],
+    batch_size: int = INGEST_BATCH_SIZE,
+    catalog_version: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Insert or update scraped phones and their specs with set-based statements,
+    one transaction per batch. Phones are matched on name; phones whose content
+    hash matches what is stored are left alone. Written phones are stamped with
+    `catalog_version` (default: one past the current version, per batch).
+    Returns inserted/updated/unchanged/skipped counts.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+
+    batch: List[dict] = []
+    for phone_data in phone_dicts:
+        if not phone_data.get("name"):
+            counts["skipped"] += 1
+            continue
+        batch.append(phone_data)
+        if len(batch) >= batch_size:
+            _ingest_batch(db, batch, counts, catalog_version)
+            batch = []
+    if batch:
+        _ingest_batch(db, batch, counts, catalog_version)
+
+    return counts
+
+
+def _ingest_batch(
+    db: Session,
+    batch: List[dict],
+    counts: Dict[str, int],
+    catalog_version: Optional[int],
+):
+    # Last occurrence of a name wins within a batch
+    rows = {row["name"]: row for row in map(phone_row, batch)}
+    specs = {phone["name"]: phone.get("specifications") or {} for phone in batch}
+
+    try:
+        existing = {
+            row.name: row
+            for row in db.execute(
+                select(Phone.id, Phone.name, Phone.spec_hash).where(
+                    Phone.name.in_(rows)
+                )
+            )
+        }
+
+        new = [row for name, row in rows.items() if name not in existing]
+        changed = [
+            row
+            for name, row in rows.items()
+            if name in existing and row["spec_hash"] != existing[name].spec_hash
+        ]
+        counts["unchanged"] += len(rows) - len(new) - len(changed)
+        if not new and not changed:
+            db.rollback()
+            return
+
+        version = catalog_version or current_catalog_version(db) + 1
+        for row in new + changed:
+            row["catalog_version"] = version
+        _upsert_phone_rows(db, new, changed)
+
+        ids = {name: row.id for name, row in existing.items()}
+        if new:
+            ids.update(
+                db.execute(
+                    select(Phone.name, Phone.id).where(
+                        Phone.name.in_([row["name"] for row in new])
+                    )
+                ).all()
+            )
+
+        # Replace the spec rows of every written phone
+        written = [ids[row["name"]] for row in new + changed]
+        db.execute(delete(Specification).where(Specification.phone_id.in_(written)))
+        spec_rows = [
+            {"phone_id": ids[row["name"]], "key": key, "value": value}
+            for row in new + changed
+            for key, value in specs[row["name"]].items()
+        ]
+        if spec_rows:
+            db.execute(insert(Specification.__table__), spec_rows)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    counts["inserted"] += len(new)
+    counts["updated"] += len(changed)
+
+
+def _upsert_phone_rows(db: Session, new: List[dict], changed: List[dict]):
+    table = Phone.__table__
+    dialect = db.get_bind().dialect.name
+    fields = [f for f in PHONE_FIELDS if f != "name"] + ["catalog_version"]
+
+    if dialect in ("postgresql", "sqlite"):
+        # ON CONFLICT also covers a phone inserted concurrently since the lookup
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={f: stmt.excluded[f] for f in fields},
+        )
+        db.execute(stmt, new + changed)
+        return
+
+    if new:
+        db.execute(insert(table), new)
+    if changed:
+        db.execute(
+            update(table)
+            .where(table.c.name == bindparam("b_name"))
+            .values({f: bindparam(f"b_{f}") for f in fields}),
+            [{f"b_{f}": value for f, value in row.items()} for row in changed],
+        )
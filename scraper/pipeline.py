@@ -0,0 +1,296 @@
+# scraper/pipeline.py
+"""
+Staged ingest pipeline: async fetch -> process-pool parse -> batched DB write.
+
+    fetch tasks --[bounded queue]--> parse tasks --[bounded queue]--> writer
+
+Each stage runs concurrently with the others, so network waits, CPU-bound
+parsing and DB commits overlap. The queues are bounded: when parsing or
+writing falls behind, upstream stages block on put() instead of piling pages
+up in memory (time spent blocked is counted as backpressure).
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+from config import settings
+from config.logger import get_logger
+from scraper.async_fetcher import AsyncFetcher, FetchError
+from scraper.frontier import CrawlFrontier
+from scraper.gsmarena_scraper import parse_phone_details
+from scraper.ingest import bulk_upsert_phones
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class PageResult:
+    """Outcome of fetching and parsing one phone page"""
+
+    url: str
+    status: str  # "parsed", "not_modified", "skipped" or "failed"
+    fetch_seconds: float
+    parse_seconds: float = 0.0
+    phone: Optional[dict] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class StageCounters:
+    """Throughput counters for one pipeline stage"""
+
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0  # time spent doing the stage's work
+    blocked_seconds: float = 0.0  # time waiting for room downstream
+
+    def as_dict(self, elapsed: float) -> dict:
+        return {
+            **{k: round(v, 3) for k, v in asdict(self).items()},
+            "per_second": round(self.items / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def parse_page(html: str, url: str):
+    """Process-pool worker: parse a phone page, returning (phone, seconds)"""
+    start = time.perf_counter()
+    phone = parse_phone_details(html, url)
+    return phone, time.perf_counter() - start
+
+
+def record_batch(
+    db,
+    results: List[PageResult],
+    frontier: Optional[CrawlFrontier] = None,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> Dict[str, int]:
+    """
+    Save the parsed phones of a batch and mark every result in the frontier.
+    If the save fails, the batch's pages are marked failed. Failed pages
+    (fetch, parse or save errors) have their HTTP validators dropped: the
+    fetcher stored them when the page downloaded, so a retry would otherwise
+    get a 304 and the page would never be saved.
+    """
+    phones = [r.phone for r in results if r.status == "parsed"]
+    counts = {}
+    try:
+        counts = bulk_upsert_phones(db, phones)
+    except Exception as e:
+        logger.error(f"Error saving batch: {str(e)}")
+        for r in results:
+            if r.status == "parsed":
+                r.status, r.error = "failed", f"save error: {e}"
+
+    if fetcher is not None and fetcher.validators is not None:
+        for r in results:
+            if r.status == "failed":
+                fetcher.validators.forget(r.url)
+
+    if frontier is not None:
+        for r in results:
+            if r.status == "failed":
+                frontier.mark_failed(r.url, r.error)
+            else:
+                frontier.mark_done(r.url, r.fetch_seconds, r.parse_seconds, r.status)
+    return counts
+
+
+class IngestPipeline:
+    """
+    Fetches, parses and saves phone pages with the three stages overlapping.
+    `workers` parse processes (0 parses in the event loop; default
+    SCRAPER_PARSE_WORKERS, whose 0 means one per CPU), queues of `queue_size`
+    pages between stages, and DB writes of `batch_size` phones. With a
+    frontier, results are marked there and it is checkpointed after every
+    written batch. The fetcher must already be open.
+
+        async with AsyncFetcher() as fetcher:
+            stats = await IngestPipeline(db, fetcher).run(urls)
+    """
+
+    def __init__(
+        self,
+        db,
+        fetcher: AsyncFetcher,
+        workers: int = None,
+        queue_size: int = None,
+        batch_size: int = None,
+        frontier: Optional[CrawlFrontier] = None,
+        executor: Optional[Executor] = None,
+    ):
+        if workers is None:
+            workers = settings.SCRAPER_PARSE_WORKERS or os.cpu_count() or 1
+        self.db = db
+        self.fetcher = fetcher
+        self.workers = workers
+        self.queue_size = queue_size or settings.SCRAPER_QUEUE_SIZE
+        self.batch_size = batch_size or settings.SCRAPER_CRAWL_BATCH
+        self.frontier = frontier
+        self.executor = executor
+        self.counters = {
+            "fetch": StageCounters(),
+            "parse": StageCounters(),
+            "write": StageCounters(),
+        }
+        self.ingested = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        self.elapsed = 0.0
+
+    async def run(self, urls: Iterable[str]) -> dict:
+        """Push every URL through the pipeline; returns stats()"""
+        pending = asyncio.Queue()
+        for url in urls:
+            pending.put_nowait(url)
+        to_parse = asyncio.Queue(self.queue_size)
+        to_write = asyncio.Queue(self.queue_size)
+
+        pool = self.executor
+        if pool is None and self.workers > 0:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Session work stays on one thread, off the event loop
+        db_thread = ThreadPoolExecutor(max_workers=1)
+
+        start = time.perf_counter()
+        try:
+            async with asyncio.TaskGroup() as group:
+                writer = group.create_task(self._write_stage(to_write, db_thread))
+                parsers = [
+                    group.create_task(self._parse_stage(to_parse, to_write, pool))
+                    for _ in range(max(self.workers, 1))
+                ]
+                fetchers = [
+                    group.create_task(self._fetch_stage(pending, to_parse, to_write))
+                    for _ in range(self.fetcher.concurrency)
+                ]
+
+                await asyncio.gather(*fetchers)
+                for _ in parsers:
+                    await to_parse.put(_DONE)
+                await asyncio.gather(*parsers)
+                await to_write.put(_DONE)
+                await writer
+        finally:
+            self.elapsed += time.perf_counter() - start
+            db_thread.shutdown()
+            if pool is not None and pool is not self.executor:
+                pool.shutdown(cancel_futures=True)
+
+        return self.stats()
+
+    async def _put(self, queue: asyncio.Queue, item, counters: StageCounters):
+        start = time.perf_counter()
+        await queue.put(item)
+        counters.blocked_seconds += time.perf_counter() - start
+
+    async def _fetch_stage(self, pending, to_parse, to_write):
+        counters = self.counters["fetch"]
+        while True:
+            try:
+                url = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            start = time.perf_counter()
+            try:
+                html = await self.fetcher.fetch(url)
+            except FetchError as e:
+                html, error = None, str(e)
+                counters.errors += 1
+            else:
+                error = None
+            elapsed = time.perf_counter() - start
+            counters.items += 1
+            counters.busy_seconds += elapsed
+
+            # Failures and unchanged pages have nothing to parse
+            if error is not None:
+                result = PageResult(url, "failed", elapsed, error=error)
+                await self._put(to_write, result, counters)
+            elif html is None:
+                result = PageResult(url, "not_modified", elapsed)
+                await self._put(to_write, result, counters)
+            else:
+                await self._put(to_parse, (url, html, elapsed), counters)
+
+    async def _parse_stage(self, to_parse, to_write, pool):
+        counters = self.counters["parse"]
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await to_parse.get()
+            if item is _DONE:
+                return
+            url, html, fetch_seconds = item
+
+            start = time.perf_counter()
+            try:
+                if pool is None:
+                    phone, parse_seconds = parse_page(html, url)
+                else:
+                    phone, parse_seconds = await loop.run_in_executor(
+                        pool, parse_page, html, url
+                    )
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                counters.errors += 1
+                result = PageResult(
+                    url,
+                    "failed",
+                    fetch_seconds,
+                    time.perf_counter() - start,
+                    error=f"parse error: {e}",
+                )
+            else:
+                status = "parsed" if phone.get("name") else "skipped"
+                result = PageResult(url, status, fetch_seconds, parse_seconds, phone)
+            counters.items += 1
+            counters.busy_seconds += time.perf_counter() - start
+
+            await self._put(to_write, result, counters)
+
+    async def _write_stage(self, to_write, db_thread):
+        counters = self.counters["write"]
+        loop = asyncio.get_running_loop()
+        batch = []
+        while True:
+            item = await to_write.get()
+            if item is not _DONE:
+                batch.append(item)
+            if batch and (item is _DONE or len(batch) >= self.batch_size):
+                parsed = [r for r in batch if r.status == "parsed"]
+                start = time.perf_counter()
+                await loop.run_in_executor(db_thread, self._write_batch, batch)
+                counters.items += len(batch)
+                counters.errors += sum(1 for r in parsed if r.status == "failed")
+                counters.busy_seconds += time.perf_counter() - start
+                batch = []
+            if item is _DONE:
+                return
+
+    def _write_batch(self, batch: List[PageResult]):
+        counts = record_batch(self.db, batch, self.frontier, self.fetcher)
+        for key, count in counts.items():
+            self.ingested[key] += count
+        if self.frontier is not None:
+            self.frontier.checkpoint()
+            if self.fetcher.validators is not None:
+                self.fetcher.validators.save()
+
+    def stats(self) -> dict:
+        """Per-stage counters, ingest counts and overall pages/second"""
+        pages = self.counters["write"].items
+        return {
+            "elapsed_seconds": round(self.elapsed, 3),
+            "pages_per_second": round(pages / self.elapsed, 2) if self.elapsed else 0.0,
+            "stages": {
+                name: counters.as_dict(self.elapsed)
+                for name, counters in self.counters.items()
+            },
+            "ingested": dict(self.ingested),
+        }
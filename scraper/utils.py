@@ -2,33 +2,91 @@
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from typing import Optional
+import threading
 import time
 import random
+from config import settings
+from config.logger import get_logger
+from scraper.archive import PageArchive
+from scraper.http_cache import CrawlStats, ValidatorStore
 
+logger = get_logger(__name__)
 
-def fetch_html(url: str, delay: bool = True) -> BeautifulSoup:
+# Browser-like headers sent with every scraper request
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
     """
-    Fetch HTML content with better headers and optional delay to avoid being blocked
+    Shared requests session, so sequential fetches reuse pooled keep-alive connections
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    }
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(pool_maxsize=settings.SCRAPER_CONCURRENCY)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
 
+
+def fetch_text(
+    url: str,
+    delay: bool = True,
+    validators: Optional[ValidatorStore] = None,
+    stats: Optional[CrawlStats] = None,
+    archive: Optional[PageArchive] = None,
+) -> Optional[str]:
+    """
+    Fetch a page's HTML as text with browser-like headers and optional delay to avoid being blocked.
+    With validators the request is conditional; returns None if the page is unchanged (304).
+    With an archive, downloaded pages are also stored there.
+    """
     # Add random delay to avoid being blocked
     if delay:
         time.sleep(random.uniform(1, 3))
 
+    headers = validators.conditional_headers(url) if validators else None
+
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_session().get(url, headers=headers, timeout=10)
+        if stats is not None:
+            stats.record_response(response.status_code, len(response.content))
+        if response.status_code == 304:
+            return None
         response.raise_for_status()  # Raises an HTTPError for bad responses
 
-        return BeautifulSoup(response.text, "lxml")
+        if validators is not None:
+            validators.update(url, response.headers)
+        if archive is not None:
+            archive.put(url, response.text)
+        return response.text
 
     except requests.RequestException as e:
-        print(f"Error fetching {url}: {str(e)}")
+        if stats is not None:
+            stats.errors += 1
+        logger.error(f"Error fetching {url}: {str(e)}")
         raise Exception(f"Failed to fetch {url}: {str(e)}")
+
+
+def fetch_html(url: str, delay: bool = True) -> BeautifulSoup:
+    """
+    Fetch HTML content with better headers and optional delay to avoid being blocked
+    """
+    return BeautifulSoup(fetch_text(url, delay), "lxml")
@@ -0,0 +1,130 @@
+# scripts/bench_logging.py
+"""
+Logging overhead per request, as seen by the request thread. A "request"
+emits the log records a chat request used to (two progress lines) plus a
+configurable number of extra records, under three setups:
+
+  print   bare print() to the console, as answer_query used to
+  sync    the old get_logger: StreamHandler + FileHandler at DEBUG
+  queued  config.logger: LocalQueueHandler -> listener thread with the console
+          and a rotating JSON file
+
+Console output goes to a scratch file so every setup pays for real I/O.
+The queued run also reports how long the listener took to drain afterwards.
+
+Usage:
+    python -m scripts.bench_logging --requests 5000 --records 5
+"""
+
+import argparse
+import contextlib
+import logging
+import logging.handlers
+import os
+import queue
+import statistics
+import tempfile
+import time
+
+from config.logger import DATE_FORMAT, TEXT_FORMAT, JsonFormatter, LocalQueueHandler
+
+
+def sync_logger(directory: str, console) -> logging.Logger:
+    formatter = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    logger = logging.getLogger("bench.sync")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    for handler in (
+        logging.StreamHandler(console),
+        logging.FileHandler(os.path.join(directory, "sync.log")),
+    ):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+def queued_logger(directory: str, console):
+    console_handler = logging.StreamHandler(console)
+    console_handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT))
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(directory, "queued.log"), maxBytes=10 * 1024 * 1024, backupCount=2
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    logger = logging.getLogger("bench.queued")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(LocalQueueHandler(log_queue))
+    return logger, listener
+
+
+def time_requests(request, count: int) -> list:
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        request(i)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def report(label: str, timings: list, extra: str = ""):
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(
+        f"  {label:<7} mean {statistics.mean(timings):7.1f} us  "
+        f"p50 {statistics.median(timings):7.1f} us  p99 {p99:7.1f} us{extra}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=5, help="Extra records/request")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.records + 2} log records each")
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "console.out"), "w") as console:
+
+            def print_request(i):
+                with contextlib.redirect_stdout(console):
+                    print(" Retrieving relevant phones...")
+                    print(" Creating detailed response...")
+                    for n in range(args.records):
+                        print(f"request {i} step {n}")
+
+            report("print", time_requests(print_request, args.requests))
+
+            logger = sync_logger(directory, console)
+
+            def sync_request(i):
+                logger.debug(" Retrieving relevant phones...")
+                logger.debug(" Creating detailed response...")
+                for n in range(args.records):
+                    logger.info("request %s step %s", i, n)
+
+            report("sync", time_requests(sync_request, args.requests))
+
+            logger, listener = queued_logger(directory, console)
+
+            def queued_request(i):
+                # Progress lines are DEBUG now, so at INFO they cost a level check
+                logger.debug("Retrieving relevant phones...")
+                logger.debug("Creating detailed response...")
+                for n in range(args.records):
+                    logger.info("request %s step %s", i, n, extra={"request": i})
+
+            listener.start()
+            timings = time_requests(queued_request, args.requests)
+            drain_start = time.perf_counter()
+            listener.stop()
+            drain = time.perf_counter() - drain_start
+            report("queued", timings, f"  (listener drained in {drain:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
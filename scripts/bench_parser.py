@@ -0,0 +1,277 @@
+# scripts/bench_parser.py
+"""
+Micro-benchmark: BeautifulSoup phone page parser vs the lxml parser.
+Runs over archived pages when an archive exists (see scraper/archive.py),
+otherwise over synthetic GSMArena-style pages, and checks both parsers
+return identical dicts.
+
+Usage:
+    python -m scripts.bench_parser
+    python -m scripts.bench_parser --archive data/scraper/archive --limit 500
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import time
+
+from scraper.archive import PageArchive
+from scraper.fast_parser import parse_phone_details_fast
+from scraper.gsmarena_scraper import parse_phone_details_soup
+
+SPEC_SECTIONS = [
+    (
+        "Network",
+        [
+            ("Technology", "GSM / HSPA / LTE / 5G"),
+            ("2G bands", "GSM 850 / 900 / 1800 / 1900 - SIM 1 &amp; SIM 2"),
+            (
+                "5G bands",
+                "1, 3, 5, 7, 8, 20, 28, 38, 40, 41, 66, 75, 77, 78 SA/NSA/Sub6",
+            ),
+            ("Speed", "HSPA, LTE (up to 7CA), 5G"),
+        ],
+    ),
+    (
+        "Launch",
+        [
+            ("Announced", "{year}, January {day}"),
+            ("Status", "Available. Released {year}, February {day}"),
+        ],
+    ),
+    (
+        "Body",
+        [
+            ("Dimensions", "162.8 x 77.6 x 8.2 mm (6.41 x 3.06 x 0.32 in)"),
+            ("Weight", "{weight} g (7.76 oz)"),
+            (
+                "Build",
+                "Glass front (Gorilla Glass Armor 2), glass back, titanium frame",
+            ),
+            ("SIM", "Nano-SIM + eSIM"),
+        ],
+    ),
+    (
+        "Display",
+        [
+            ("Type", "Dynamic LTPO AMOLED 2X, 120Hz, HDR10+, 2600 nits (peak)"),
+            (
+                "Size",
+                "{display} inches, 113.5 cm<sup>2</sup> (~90.0% screen-to-body ratio)",
+            ),
+            ("Resolution", "1440 x 3120 pixels, 19.5:9 ratio (~500 ppi density)"),
+            ("Protection", "Corning Gorilla Armor 2"),
+        ],
+    ),
+    (
+        "Platform",
+        [
+            ("OS", "Android 15, up to 7 major Android upgrades, One UI 7"),
+            ("Chipset", "Qualcomm SM8750-AC Snapdragon 8 Elite (3 nm)"),
+            (
+                "CPU",
+                "Octa-core (2x4.47 GHz Oryon V2 Phoenix L + 6x3.53 GHz Oryon V2 Phoenix M)",
+            ),
+            ("GPU", "Adreno 830"),
+        ],
+    ),
+    (
+        "Memory",
+        [
+            ("Card slot", "No"),
+            ("Internal", "256GB {ram}GB RAM, 512GB {ram}GB RAM, 1TB 16GB RAM"),
+            ("", "UFS 4.0"),
+        ],
+    ),
+    (
+        "Main Camera",
+        [
+            (
+                "Quad",
+                '{camera} MP, f/1.7, 24mm (wide), 1/1.3", 0.6µm, multi-directional PDAF, OIS<br>10 MP, f/2.4, 67mm (telephoto), 3x optical zoom<br>50 MP, f/3.4, 111mm (periscope telephoto), 5x optical zoom',
+            ),
+            ("Features", "LED flash, auto-HDR, panorama"),
+            ("Video", "8K@24/30fps, 4K@30/60/120fps, 1080p@30/60/120/240fps, HDR10+"),
+        ],
+    ),
+    (
+        "Selfie camera",
+        [
+            ("Single", "12 MP, f/2.2, 26mm (wide), dual pixel PDAF"),
+            ("Video", "4K@30/60fps, 1080p@30fps"),
+        ],
+    ),
+    ("Sound", [("Loudspeaker", "Yes, with stereo speakers"), ("3.5mm jack", "No")]),
+    (
+        "Comms",
+        [
+            ("WLAN", "Wi-Fi 802.11 a/b/g/n/ac/6e/7, tri-band, Wi-Fi Direct"),
+            ("Bluetooth", "5.4, A2DP, LE"),
+            ("Positioning", "GPS, GALILEO, GLONASS, BDS, QZSS"),
+            ("NFC", "Yes"),
+            ("USB", "USB Type-C 3.2, DisplayPort 1.2, OTG"),
+        ],
+    ),
+    (
+        "Features",
+        [
+            (
+                "Sensors",
+                "Fingerprint (under display, ultrasonic), accelerometer, gyro, proximity, compass, barometer",
+            ),
+            ("", "Samsung DeX, Samsung Wireless DeX (desktop experience support)"),
+        ],
+    ),
+    (
+        "Battery",
+        [
+            ("Type", "Li-Ion {battery} mAh"),
+            (
+                "Charging",
+                "45W wired, PD3.0, 65% in 30 min<br>15W wireless (Qi2 Ready)<br>4.5W reverse wireless",
+            ),
+        ],
+    ),
+    (
+        "Misc",
+        [
+            ("Colors", "Titanium Silverblue, Titanium Black, Titanium Gray"),
+            ("Models", "SM-S938B, SM-S938B/DS, SM-S938U"),
+            ("Price", "&#36;&thinsp;1,299.99 / &euro;&thinsp;1,149.00"),
+        ],
+    ),
+]
+
+
+def synthetic_phone_page(i: int) -> str:
+    """A GSMArena-like phone page: site chrome around a full #specs-list"""
+    rng = random.Random(i)
+    values = {
+        "year": rng.choice([2022, 2023, 2024, 2025]),
+        "day": rng.randint(1, 28),
+        "weight": rng.randint(160, 240),
+        "display": rng.choice(["6.1", "6.4", "6.7", "6.9"]),
+        "ram": rng.choice([6, 8, 12]),
+        "camera": rng.choice([50, 108, 200]),
+        "battery": rng.choice([3900, 4500, 5000]),
+    }
+
+    tables = []
+    for category, rows in SPEC_SECTIONS:
+        cells = []
+        for n, (key, value) in enumerate(rows):
+            header = (
+                f'<th rowspan="{len(rows)}" scope="row">{category}</th>'
+                if n == 0
+                else ""
+            )
+            cells.append(
+                f'<tr>{header}<td class="ttl"><a href="glossary.php3?term={key.lower()}">{key or "&nbsp;"}</a></td>'
+                f'<td class="nfo" data-spec="s{n}">{value.format(**values)}</td></tr>'
+            )
+        tables.append(f'<table cellspacing="0">{"".join(cells)}</table>')
+
+    nav = "".join(f'<li><a href="brand-{n}.php">Brand {n}</a></li>' for n in range(120))
+    related = "".join(
+        f'<li><a href="samsung_galaxy_{n}-{n}.php"><img src="thumb-{n}.jpg"><strong><span>Galaxy {n}</span></strong></a></li>'
+        for n in range(60)
+    )
+    comments = "".join(
+        f'<div class="user-thread"><div class="uavatar"><span>U{n}</span></div><ul class="uinfo2"><li class="uname2">user{n}</li><li class="upost"><time>{n} hours ago</time></li></ul><p class="uopin">Great phone, battery lasts all day. Comment number {n} with some more text to pad it out.</p></div>'
+        for n in range(40)
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Samsung Galaxy Bench {i} - Full phone specifications</title>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+<style>.specs-photo-main img{{max-width:160px}}</style></head>
+<body><div id="wrapper"><header id="header"><ul class="brandmenu-v2">{nav}</ul></header>
+<div class="main main-review right l-box col">
+<div class="review-header"><div class="article-info">
+<h1 class="specs-phone-name-title" data-spec="modelname">Samsung Galaxy Bench {i}</h1>
+<div class="specs-photo-main"><a href="samsung_galaxy_bench_{i}-pictures.php"><img alt="Galaxy Bench {i}" src="https://fdn2.gsmarena.com/vv/bigpic/bench-{i}.jpg"></a></div>
+<ul class="specs-spotlight-features"><li><span class="specs-brief-accent">Released {values["year"]}</span></li></ul>
+</div></div>
+<div id="specs-list">{"".join(tables)}<p class="note"><strong>Disclaimer.</strong> We can not guarantee that the information on this page is 100% correct.</p></div>
+<div class="sub-header"><h2>Related devices</h2><ul>{related}</ul></div>
+<div id="user-comments">{comments}</div>
+</div></div></body></html>"""
+
+
+def load_pages(archive_root, limit):
+    if archive_root is not False:
+        archive = PageArchive(archive_root)
+        pages = []
+        for url, html in archive.iter_pages():
+            pages.append((url, html))
+            if len(pages) >= limit:
+                break
+        if pages:
+            return pages, f"archive {archive.root}"
+
+    pages = [
+        (
+            f"https://www.gsmarena.com/samsung_galaxy_bench_{i}-{i}.php",
+            synthetic_phone_page(i),
+        )
+        for i in range(limit)
+    ]
+    return pages, "synthetic pages"
+
+
+def time_parser(parse, pages, repeat):
+    per_page = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, html in pages:
+            parse(html, url)
+        per_page.append((time.perf_counter() - start) / len(pages))
+    return min(per_page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--archive", help="Archive directory (default: SCRAPER_CACHE_DIR/archive)"
+    )
+    parser.add_argument("--synthetic", action="store_true", help="Ignore any archive")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    archive_root = False if args.synthetic else args.archive
+    if archive_root is not False and args.archive is None:
+        from scraper.archive import default_archive_root
+
+        archive_root = (
+            default_archive_root() if os.path.isdir(default_archive_root()) else False
+        )
+
+    pages, source = load_pages(archive_root, args.limit)
+    print(f"{len(pages)} pages from {source}")
+
+    # The soup parser prints every row; keep that out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        mismatches = [
+            url
+            for url, html in pages
+            if parse_phone_details_soup(html, url)
+            != parse_phone_details_fast(html, url)
+        ]
+        soup = time_parser(parse_phone_details_soup, pages, args.repeat)
+    fast = time_parser(parse_phone_details_fast, pages, args.repeat)
+
+    sizes = [len(html) for _, html in pages]
+    print(f"  median page size {statistics.median(sizes) / 1024:.0f} KiB")
+    print(f"  soup  {soup * 1000:8.3f} ms/page")
+    print(f"  lxml  {fast * 1000:8.3f} ms/page  ({soup / fast:.1f}x faster)")
+    print(f"  mismatching pages: {len(mismatches)}")
+    for url in mismatches[:5]:
+        print(f"    {url}")
+
+
+if __name__ == "__main__":
+    main()
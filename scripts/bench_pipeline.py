@@ -0,0 +1,110 @@
+# scripts/bench_pipeline.py
+"""
+Ingest throughput: fetch-all / parse-all / write-all (scrape_phones_async +
+bulk_upsert_phones) vs the staged IngestPipeline, over synthetic phone pages
+served with simulated network latency into a scratch SQLite DB.
+
+Usage:
+    python -m scripts.bench_pipeline --pages 400 --latency 0.05 --workers 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.migrations import run_migrations
+from scraper.async_fetcher import AsyncFetcher
+from scraper.gsmarena_scraper import scrape_phones_async
+from scraper.ingest import bulk_upsert_phones
+from scraper.pipeline import IngestPipeline
+from scripts.bench_parser import synthetic_phone_page
+
+
+def stub_transport(latency: float) -> httpx.MockTransport:
+    async def serve(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * latency)
+        i = int(request.url.path.rsplit("-", 1)[-1].split(".")[0])
+        return httpx.Response(200, text=synthetic_phone_page(i))
+
+    return httpx.MockTransport(serve)
+
+
+def fresh_db(directory: str, name: str) -> Session:
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+    run_migrations(engine)
+    return Session(engine)
+
+
+async def run_sequential(db, urls, options):
+    async with AsyncFetcher(**options) as fetcher:
+        phones = await scrape_phones_async(urls, fetcher)
+    bulk_upsert_phones(db, phones)
+
+
+async def run_pipeline(db, urls, options, workers, batch_size):
+    async with AsyncFetcher(**options) as fetcher:
+        return await IngestPipeline(
+            db, fetcher, workers=workers, batch_size=batch_size
+        ).run(urls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds/page")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    urls = [f"https://bench.test/phone-{i}.php" for i in range(args.pages)]
+    options = dict(
+        concurrency=args.concurrency,
+        rate_per_host=0,
+        transport=stub_transport(args.latency),
+    )
+    runs = [
+        ("fetch, then parse, then write", lambda db: run_sequential(db, urls, options)),
+        (
+            "pipeline, parse in event loop",
+            lambda db: run_pipeline(db, urls, options, 0, args.batch_size),
+        ),
+        (
+            f"pipeline, {args.workers} parse processes",
+            lambda db: run_pipeline(db, urls, options, args.workers, args.batch_size),
+        ),
+    ]
+
+    print(
+        f"{args.pages} pages, ~{args.latency * 1000:.0f} ms latency, "
+        f"{args.concurrency} concurrent fetches, {os.cpu_count()} CPUs"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for n, (label, run) in enumerate(runs):
+            db = fresh_db(directory, f"bench-{n}.db")
+            start = time.perf_counter()
+            # The soup parser and save helpers print per phone
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = asyncio.run(run(db))
+            elapsed = time.perf_counter() - start
+            db.close()
+            print(f"  {label:<34} {elapsed:6.2f}s  {args.pages / elapsed:7.1f} pages/s")
+            if stats:
+                for stage, counters in stats["stages"].items():
+                    print(
+                        f"    {stage:<6} busy {counters['busy_seconds']:6.2f}s  "
+                        f"blocked {counters['blocked_seconds']:6.2f}s"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# scripts/bench_spec_analyzer.py
+"""
+Benchmark spec analysis: the original per-phone path (nested tier loops,
+per-call regex lookups, no memoization) against the precompiled analyzer,
+both per phone and through ReviewGenerator.analyze_many.
+
+Usage: python -m scripts.bench_spec_analyzer --phones 5000 --repeat 3
+"""
+
+import argparse
+import random
+import re
+import time
+
+from agents.review_agent import PhoneSpecs, ReviewGenerator, SpecAnalyzer
+
+CHIPSETS = [
+    "Qualcomm SM8750 Snapdragon 8 Elite (3 nm)",
+    "Exynos 2400 (4 nm)",
+    "Exynos 1580 (4 nm)",
+    "Exynos 1380 (5 nm)",
+    "Qualcomm Snapdragon 6 Gen 1",
+    "Exynos 850 (8 nm)",
+    "Mediatek Helio G99 (6 nm)",
+]
+MODELS = ["S25 Ultra", "S25", "S24 FE", "A56", "A36", "A16", "M35", "Z Fold6"]
+
+
+def synthetic_phone_data(i: int) -> dict:
+    rng = random.Random(i)
+    ram = rng.choice([4, 6, 8, 12, 16])
+    storage = rng.choice([128, 256, 512])
+    return {
+        "id": i,
+        "structured": {
+            "Name": f"Samsung Galaxy {rng.choice(MODELS)} {i}",
+            "Battery": f"{rng.choice([4000, 4500, 5000, 6000])} mAh",
+            "Camera": f"{rng.choice([12, 48, 50, 108, 200])} MP, f/1.7, OIS",
+            "Display": f"{rng.choice([6.1, 6.4, 6.7, 6.9])} inches, 120Hz",
+            "Chipset": rng.choice(CHIPSETS),
+            "OS": "Android 15, One UI 7",
+            "RAM": f"{ram}GB RAM",
+            "Storage": f"{storage}GB {storage * 2}GB",
+            "Release Date": f"{rng.choice([2023, 2024, 2025])}, January",
+            "Network": "GSM / HSPA / LTE / 5G",
+        },
+        "extra": {},
+    }
+
+
+def legacy_price_tier(phone_name: str) -> str:
+    name_upper = phone_name.upper()
+    for tier, models in SpecAnalyzer.PRICE_TIERS.items():
+        for model in models:
+            if model.upper() in name_upper:
+                return tier
+    return "mid_range"
+
+
+def legacy_chipset_tier(chipset: str) -> str:
+    for tier, chips in SpecAnalyzer.CHIPSET_TIERS.items():
+        for chip in chips:
+            if chip in chipset:
+                return tier
+    return "mid_range"
+
+
+def legacy_specs_object(phone_data: dict) -> PhoneSpecs:
+    """The per-phone path as it was before the analyzer was precompiled"""
+    specs = phone_data.get("structured", {})
+    ram = sorted(set(int(x) for x in re.findall(r"(\d+)GB", specs.get("RAM", ""))))
+    storage = sorted(
+        set(int(x) for x in re.findall(r"(\d+)GB", specs.get("Storage", "")))
+    )
+    display = re.search(r"(\d+\.\d+)", specs.get("Display", ""))
+    camera = re.search(r"(\d+)\s*MP", specs.get("Camera", ""))
+    battery = re.search(r"(\d+)", specs.get("Battery", ""))
+    year = re.search(r"(\d{4})", specs.get("Release Date", ""))
+    name = specs.get("Name", "")
+    if any(x in name.upper() for x in ["ULTRA", "S25", "S24", "S23"]):
+        build = "Premium"
+    elif any(x in name.upper() for x in ["A56", "A55", "FE"]):
+        build = "Good"
+    else:
+        build = "Standard"
+
+    return PhoneSpecs(
+        name=name,
+        display_size=float(display.group(1)) if display else 0.0,
+        resolution=specs.get("Resolution", ""),
+        chipset=specs.get("Chipset", ""),
+        ram_variants=ram,
+        storage_variants=storage,
+        main_camera_mp=int(camera.group(1)) if camera else 0,
+        battery_capacity=int(battery.group(1)) if battery else 0,
+        release_year=int(year.group(1)) if year else 2024,
+        price_tier=legacy_price_tier(name),
+        os_version=specs.get("OS", ""),
+        build_quality=build,
+        special_features=SpecAnalyzer.extract_special_features(phone_data),
+    )
+
+
+def timed(label: str, func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:9.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--phones", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    phones = [synthetic_phone_data(i) for i in range(args.phones)]
+    generator = ReviewGenerator(cache_size=args.phones)
+
+    # Sanity check: both paths agree
+    assert [legacy_specs_object(p) for p in phones] == generator.analyze_many(phones)
+
+    print(f"Analyzing {args.phones} phones (best of {args.repeat})")
+    legacy = timed(
+        "legacy per-phone",
+        lambda: [legacy_specs_object(p) for p in phones],
+        args.repeat,
+    )
+    timed(
+        "legacy chipset tiers",
+        lambda: [legacy_chipset_tier(p["structured"]["Chipset"]) for p in phones],
+        args.repeat,
+    )
+    timed(
+        "compiled chipset tiers",
+        lambda: [
+            SpecAnalyzer.determine_chipset_tier(p["structured"]["Chipset"])
+            for p in phones
+        ],
+        args.repeat,
+    )
+    bulk = timed("analyze_many", lambda: generator.analyze_many(phones), args.repeat)
+
+    for p in phones:
+        generator.create_phone_specs_object(p)
+    cached = timed(
+        "memoized per-phone",
+        lambda: [generator.create_phone_specs_object(p) for p in phones],
+        args.repeat,
+    )
+
+    print(
+        f"analyze_many speedup: {legacy / bulk:.1f}x, memoized: {legacy / cached:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
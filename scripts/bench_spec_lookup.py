@@ -0,0 +1,132 @@
+# scripts/bench_spec_lookup.py
+"""
+Query-plan benchmark for per-phone spec fetches.
+Builds a synthetic catalog at the baseline schema (migration 0001), times
+`specifications WHERE phone_id = ?` lookups, applies the remaining
+migrations and times them again, printing the query plan for each.
+
+Usage:
+    python -m scripts.bench_spec_lookup --phones 10000 100000
+    python -m scripts.bench_spec_lookup --database-url postgresql://... --phones 10000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, text
+
+from database.migrations import run_migrations
+from database.migrations.v0001_initial_schema import phones, specifications
+
+SPECS_PER_PHONE = 80
+INSERT_BATCH = 20000
+SPEC_QUERY = text("SELECT key, value FROM specifications WHERE phone_id = :phone_id")
+
+
+def populate(engine, phone_count: int):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(phones),
+            [
+                {"id": i, "name": f"Samsung Galaxy Bench {i}", "url": f"bench/{i}"}
+                for i in range(1, phone_count + 1)
+            ],
+        )
+
+        batch = []
+        for phone_id in range(1, phone_count + 1):
+            for k in range(SPECS_PER_PHONE):
+                batch.append(
+                    {"phone_id": phone_id, "key": f"Category - Key {k}", "value": "x"}
+                )
+            if len(batch) >= INSERT_BATCH:
+                conn.execute(insert(specifications), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(specifications), batch)
+
+
+def query_plan(engine) -> str:
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.execute(
+                text(f"EXPLAIN QUERY PLAN {SPEC_QUERY.text}"), {"phone_id": 1}
+            )
+            return "; ".join(row[-1] for row in rows)
+        rows = conn.execute(text(f"EXPLAIN {SPEC_QUERY.text}"), {"phone_id": 1})
+        return "; ".join(row[0].strip() for row in rows)
+
+
+def time_lookups(engine, phone_count: int, lookups: int) -> dict:
+    rng = random.Random(42)
+    samples = []
+    with engine.connect() as conn:
+        for _ in range(lookups):
+            phone_id = rng.randint(1, phone_count)
+            start = time.perf_counter()
+            rows = conn.execute(SPEC_QUERY, {"phone_id": phone_id}).fetchall()
+            samples.append(time.perf_counter() - start)
+            assert len(rows) == SPECS_PER_PHONE
+
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": samples[int(len(samples) * 0.99) - 1] * 1000,
+    }
+
+
+def bench(database_url: str, phone_count: int, lookups: int):
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        for table in ("schema_migrations", "specifications", "phones"):
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+    run_migrations(engine, target=1)
+    start = time.perf_counter()
+    populate(engine, phone_count)
+    print(
+        f"\n{phone_count} phones / {phone_count * SPECS_PER_PHONE} spec rows "
+        f"(loaded in {time.perf_counter() - start:.1f}s)"
+    )
+
+    for label in ("baseline", "migrated"):
+        if label == "migrated":
+            start = time.perf_counter()
+            run_migrations(engine)
+            print(f"  migrations applied in {time.perf_counter() - start:.1f}s")
+        result = time_lookups(engine, phone_count, lookups)
+        print(
+            f"  {label:<9} p50 {result['p50_ms']:8.3f} ms  "
+            f"p99 {result['p99_ms']:8.3f} ms  plan: {query_plan(engine)}"
+        )
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--phones", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument(
+        "--database-url",
+        help="Scratch database to use (tables are dropped!). Defaults to a temp SQLite file.",
+    )
+    args = parser.parse_args()
+
+    for phone_count in args.phones:
+        if args.database_url:
+            bench(args.database_url, phone_count, args.lookups)
+            continue
+
+        with tempfile.TemporaryDirectory() as tmp:
+            bench(
+                f"sqlite:///{os.path.join(tmp, 'bench.db')}", phone_count, args.lookups
+            )
+
+
+if __name__ == "__main__":
+    main()
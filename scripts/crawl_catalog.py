@@ -0,0 +1,90 @@
+# scripts/crawl_catalog.py
+
+import argparse
+import asyncio
+import os
+
+from config import settings
+from scraper.archive import PageArchive
+from scraper.async_fetcher import AsyncFetcher
+from scraper.crawler import crawl_catalog
+from scraper.frontier import CrawlFrontier
+from scraper.http_cache import ValidatorStore
+
+
+async def run(db, frontier, args):
+    fetcher = AsyncFetcher(
+        validators=ValidatorStore(),
+        archive=None if args.no_archive else PageArchive(),
+    )
+    async with fetcher:
+        summary = await crawl_catalog(
+            db,
+            frontier,
+            fetcher,
+            brands=args.brands,
+            batch_size=args.batch_size,
+            replan=args.replan,
+            limit=args.limit,
+            workers=args.workers,
+            rebuild=not args.no_rebuild,
+        )
+    return summary, fetcher.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Crawl every listed phone into the DB; re-run to resume"
+    )
+    parser.add_argument(
+        "--brands",
+        help=f"Comma-separated brands or 'all' (default: {settings.SCRAPER_BRANDS})",
+    )
+    parser.add_argument("--batch-size", type=int, help="Phones saved per checkpoint")
+    parser.add_argument(
+        "--workers", type=int, help="Parse processes (0 parses in the event loop)"
+    )
+    parser.add_argument("--limit", type=int, help="Stop after this many phone pages")
+    parser.add_argument(
+        "--replan", action="store_true", help="Walk the listings again for new phones"
+    )
+    parser.add_argument(
+        "--retry-failed", action="store_true", help="Requeue URLs that failed before"
+    )
+    parser.add_argument(
+        "--fresh", action="store_true", help="Discard the saved frontier and start over"
+    )
+    parser.add_argument(
+        "--no-archive", action="store_true", help="Don't archive fetched pages"
+    )
+    parser.add_argument(
+        "--no-rebuild",
+        action="store_true",
+        help="Don't rebuild the vector index and caches for changed phones",
+    )
+    args = parser.parse_args()
+
+    frontier = CrawlFrontier()
+    if args.fresh and os.path.exists(frontier.path):
+        os.remove(frontier.path)
+        frontier = CrawlFrontier()
+    if args.retry_failed:
+        print(f"🔁 Requeued {frontier.requeue_failed()} failed URLs")
+    if frontier.planned:
+        print(f"▶️ Resuming from {frontier.path}: {frontier.summary()}")
+
+    from config.database import session_scope
+
+    try:
+        with session_scope() as db:
+            summary, stats = asyncio.run(run(db, frontier, args))
+    except KeyboardInterrupt:
+        print(f"⏸️ Interrupted; re-run to resume from {frontier.path}")
+    else:
+        pipeline = summary.pop("pipeline")
+        changed_ids, rebuilt = summary.pop("changed_ids"), summary.pop("rebuilt")
+        print(f"✅ Crawl summary: {summary}")
+        print(f"🏭 Pipeline stats: {pipeline}")
+        print(f"🧮 Changed phone ids: {changed_ids}")
+        print(f"🔁 Rebuilt: {rebuilt}")
+        print(f"📈 Transfer stats: {stats.as_dict()}")
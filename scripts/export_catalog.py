@@ -0,0 +1,26 @@
+# scripts/export_catalog.py
+
+import argparse
+
+from catalog.snapshot import load_snapshot_from_url, write_snapshot_file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export the phone catalog as a snapshot file for serving"
+    )
+    parser.add_argument("output", help="Snapshot path (.json or .json.gz)")
+    parser.add_argument(
+        "--database-url", help="Source database (defaults to DATABASE_URL)"
+    )
+    args = parser.parse_args()
+
+    if args.database_url:
+        url = args.database_url
+    else:
+        from config.settings import DATABASE_URL as url
+
+    snapshot = load_snapshot_from_url(url)
+    write_snapshot_file(snapshot, args.output)
+    print(
+        f"✅ Exported {len(snapshot)} phones (version {snapshot.version}) to {args.output}"
+    )
@@ -0,0 +1,150 @@
+# scripts/profile_startup.py
+"""
+Cold-start profile of the API. For each worker profile, in fresh interpreters:
+
+  * `python -X importtime -c "import api.main"`, summarized as the slowest
+    modules (self time) and the heaviest top-level packages
+  * time to first request: from spawning the interpreter to the response of
+    the profile's first request (app startup/lifespan included)
+
+Profiles set API_FEATURES: "full" mounts everything, "review" only the review
+routes, "health" no feature routes. Review and health workers are checked
+against the startup budget (STARTUP_BUDGET_MS); the exit status is 1 if one
+is over it.
+
+Usage:
+    python -m scripts.profile_startup
+    python -m scripts.profile_startup --profiles review health --budget-ms 800
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from config import settings
+
+PROFILES = {
+    "full": "chatbot,review,ranking",
+    "review": "review",
+    "health": "",
+}
+BUDGETED = ("review", "health")
+
+FIRST_REQUEST = """
+import time
+from fastapi.testclient import TestClient
+import api.main
+
+with TestClient(api.main.app) as client:
+    response = client.get("/")
+    print(time.time(), response.status_code)
+"""
+
+
+def profile_env(features: str) -> dict:
+    env = dict(os.environ, API_FEATURES=features, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us) for each `-X importtime` line"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def import_profile(features: str) -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api.main"],
+        env=profile_env(features),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def time_to_first_request(features: str) -> float:
+    """Milliseconds from spawning the interpreter to the first response"""
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        env=profile_env(features),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    responded_at, status = result.stdout.split()[-2:]
+    if status != "200":
+        raise RuntimeError(f"first request returned {status}")
+    return (float(responded_at) - start) * 1000
+
+
+def summarize(entries: list, top: int):
+    total = next(cum for name, _, cum in entries if name == "api.main")
+    print(f"  import api.main: {total / 1000:.0f} ms, {len(entries)} modules")
+
+    packages = defaultdict(int)
+    for name, self_us, _ in entries:
+        packages[name.split(".")[0]] += self_us
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    print("  heaviest packages (self time):")
+    for name, self_us in heaviest[:top]:
+        print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+    print("  slowest modules (self time):")
+    for name, self_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--profiles", nargs="+", choices=PROFILES, default=list(PROFILES)
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="First-request runs/profile"
+    )
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    over_budget = []
+    for profile in args.profiles:
+        features = PROFILES[profile]
+        print(f"\n🚀 {profile} (API_FEATURES={features!r})")
+        try:
+            summarize(import_profile(features), args.top)
+            timings = [time_to_first_request(features) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"  ❌ startup failed: {e}")
+            over_budget.append(profile)
+            continue
+
+        median = statistics.median(timings)
+        line = f"  time to first request: {median:.0f} ms (median of {args.runs})"
+        if profile in BUDGETED:
+            ok = median <= args.budget_ms
+            line += f", budget {args.budget_ms:.0f} ms {'✅' if ok else '❌'}"
+            if not ok:
+                over_budget.append(profile)
+        print(line)
+
+    if over_budget:
+        print(f"\n❌ Over the startup budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
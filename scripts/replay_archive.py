@@ -0,0 +1,37 @@
+# scripts/replay_archive.py
+
+import argparse
+import time
+
+from scraper.archive import PageArchive, reparse_archive, replay_archive
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-parse archived phone pages offline and save them to the DB"
+    )
+    parser.add_argument(
+        "--archive", help="Archive directory (default: SCRAPER_CACHE_DIR/archive)"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Parser processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Parse only; don't write to the DB"
+    )
+    args = parser.parse_args()
+
+    archive = PageArchive(args.archive)
+    print(f"📦 Replaying {len(archive)} archived pages from {archive.root}")
+    start = time.perf_counter()
+
+    if args.dry_run:
+        phones = reparse_archive(archive, args.workers)
+        named = sum(1 for phone in phones if phone.get("name"))
+        print(f"🔍 Parsed {len(phones)} pages ({named} with a phone name)")
+    else:
+        from config.database import session_scope
+
+        with session_scope() as db:
+            print(f"💾 Ingested: {replay_archive(db, archive, args.workers)}")
+
+    print(f"✅ Done in {time.perf_counter() - start:.1f}s")
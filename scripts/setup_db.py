@@ -1,8 +1,22 @@
 # scripts/setup_db.py
 
-from database.setup import create_tables
+import argparse
+
+from config.database import engine
+from database.migrations import current_version, run_migrations
 
 if __name__ == "__main__":
-    print("🔧 Creating tables...")
-    create_tables()
-    print("✅ All tables created successfully.")
+    parser = argparse.ArgumentParser(description="Create or migrate the database")
+    parser.add_argument("--target", type=int, help="Migrate up to this version")
+    parser.add_argument(
+        "--status", action="store_true", help="Only print the schema version"
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        print(f"📌 Schema version: {current_version(engine)}")
+    else:
+        print("🔧 Applying migrations...")
+        for name in run_migrations(engine, target=args.target):
+            print(f"  ✔ {name}")
+        print(f"✅ Schema is at version {current_version(engine)}.")
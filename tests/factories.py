@@ -0,0 +1,11 @@
+# tests/factories.py
+
+
+def scraped_phone(i, battery="5000 mAh"):
+    """Phone i as the scraper returns it, with `battery` in both places"""
+    return {
+        "name": f"Samsung Galaxy Test {i}",
+        "url": f"https://example.com/test-{i}.php",
+        "battery": battery,
+        "specifications": {"Battery - Type": battery, "Misc - Colors": "Black"},
+    }
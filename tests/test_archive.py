@@ -0,0 +1,54 @@
+# tests/test_archive.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.migrations import run_migrations
+from database.models import Phone
+from scraper.archive import PageArchive, replay_archive
+
+PAGE = """
+<html><body>
+<h1 class="specs-phone-name-title">Samsung Galaxy Archive {i}</h1>
+<div id="specs-list"><table>
+<tr><th>Battery</th><td class="ttl">Type</td><td class="nfo">Li-Ion {mah} mAh</td></tr>
+</table></div>
+</body></html>
+"""
+
+
+def test_archive_is_content_addressed(tmp_path):
+    for codec in ("zstd", "gzip"):
+        archive = PageArchive(str(tmp_path / codec), codec=codec)
+        first = archive.put("https://example.com/a.php", PAGE)
+        second = archive.put("https://example.com/b.php", PAGE)
+        archive.put("https://example.com/a.php", PAGE + "<!-- v2 -->")
+
+        assert first == second
+        assert archive.get(first) == PAGE
+        assert len(archive) == 2
+        assert archive.latest()["https://example.com/a.php"] != first
+        objects = [f for _, _, files in os.walk(archive.root) for f in files]
+        assert len([f for f in objects if f.startswith(first)]) == 1
+
+
+def test_replay_parses_archive_into_db(tmp_path):
+    archive = PageArchive(str(tmp_path / "archive"))
+    for i in range(6):
+        archive.put(f"https://example.com/{i}.php", PAGE.format(i=i, mah=4000 + i))
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'replay.db'}")
+    run_migrations(engine)
+    with Session(engine) as db:
+        counts = replay_archive(db, archive, workers=2)
+        assert counts["inserted"] == 6
+        phone = db.query(Phone).filter(Phone.name == "Samsung Galaxy Archive 3").one()
+        assert phone.url == "https://example.com/3.php"
+        assert phone.battery == "Li-Ion 4003 mAh"
+
+        assert replay_archive(db, archive, workers=1)["unchanged"] == 6
+    engine.dispose()
@@ -0,0 +1,192 @@
+# tests/test_async_fetcher.py
+
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from scraper.archive import PageArchive
+from scraper.async_fetcher import AsyncFetcher, FetchError
+from scraper.http_cache import ValidatorStore
+from scraper.gsmarena_scraper import scrape_phones_async
+
+PHONE_PAGE = """
+<html><body>
+<h1 class="specs-phone-name-title">Samsung Galaxy Stub 1</h1>
+<div id="specs-list"><table>
+<tr><th>Battery</th><td class="ttl">Type</td><td class="nfo">Li-Ion 5000 mAh</td></tr>
+</table></div>
+</body></html>
+"""
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            hits = server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if self.path == "/etag":
+                self._reply_validated()
+            elif self.path == "/flaky" and hits <= 2:
+                self._reply(503, "busy")
+            elif self.path == "/missing":
+                self._reply(404, "nope")
+            elif self.path.startswith("/slow"):
+                time.sleep(0.05)
+                self._reply(200, self.path)
+            else:
+                self._reply(200, PHONE_PAGE)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply_validated(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self._reply(200, PHONE_PAGE, ETag='"v1"')
+
+    def _reply(self, status, body, **headers):
+        data = body.encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetcher(**options):
+    defaults = dict(concurrency=4, rate_per_host=0, backoff_base=0.01, max_retries=3)
+    return AsyncFetcher(**{**defaults, **options})
+
+
+def test_retries_transient_errors_but_not_404(stub_server):
+    async def run():
+        async with _fetcher() as fetcher:
+            body = await fetcher.fetch(f"{stub_server.base_url}/flaky")
+            with pytest.raises(FetchError) as error:
+                await fetcher.fetch(f"{stub_server.base_url}/missing")
+            return fetcher.stats.retries, body, error.value.status
+
+    retries, body, status = asyncio.run(run())
+    assert "Samsung Galaxy Stub 1" in body
+    assert retries == 2
+    assert status == 404
+    assert stub_server.hits["/missing"] == 1
+
+
+def test_concurrency_limit_and_host_rate_limit(stub_server):
+    async def run(fetcher, count):
+        async with fetcher:
+            urls = [f"{stub_server.base_url}/slow/{i}" for i in range(count)]
+            start = time.perf_counter()
+            results = await fetcher.fetch_many(urls)
+            return results, time.perf_counter() - start
+
+    results, _ = asyncio.run(run(_fetcher(concurrency=4), 16))
+    assert [body for _, body in results] == [f"/slow/{i}" for i in range(16)]
+    assert 1 < stub_server.max_in_flight <= 4
+
+    # 20 requests/second with no burst: 6 requests need at least 5 intervals
+    _, elapsed = asyncio.run(run(_fetcher(rate_per_host=20, burst=1), 6))
+    assert elapsed >= 0.24
+
+
+def test_scrape_phones_async_parses_fetched_pages(stub_server, tmp_path):
+    urls = [f"{stub_server.base_url}/phone.php", f"{stub_server.base_url}/missing"]
+
+    archive = PageArchive(str(tmp_path / "archive"))
+
+    async def run():
+        async with _fetcher(archive=archive) as fetcher:
+            return await scrape_phones_async(urls, fetcher)
+
+    phones = asyncio.run(run())
+    assert list(archive.latest()) == [urls[0]]
+
+    assert len(phones) == 1
+    assert phones[0]["name"] == "Samsung Galaxy Stub 1"
+    assert phones[0]["url"] == urls[0]
+
+
+def test_scrape_phones_async_skips_pages_that_fail_to_parse(stub_server, monkeypatch):
+    import scraper.gsmarena_scraper as gsmarena
+
+    parse = gsmarena.parse_phone_details
+    urls = [f"{stub_server.base_url}/phone.php?n={i}" for i in range(3)]
+
+    def parse_or_fail(html, url):
+        if url == urls[1]:
+            raise AttributeError("'NoneType' object has no attribute 'text'")
+        return parse(html, url)
+
+    monkeypatch.setattr(gsmarena, "parse_phone_details", parse_or_fail)
+
+    async def run():
+        async with _fetcher() as fetcher:
+            return await scrape_phones_async(urls, fetcher)
+
+    phones = asyncio.run(run())
+    assert [phone["url"] for phone in phones] == [urls[0], urls[2]]
+
+
+def test_conditional_refetch_skips_unchanged_pages(stub_server, tmp_path):
+    url = f"{stub_server.base_url}/etag"
+    path = str(tmp_path / "validators.json")
+
+    async def crawl():
+        async with _fetcher(validators=ValidatorStore(path)) as fetcher:
+            phones = await scrape_phones_async([url], fetcher)
+            fetcher.validators.save()
+            return phones, fetcher.stats
+
+    phones, stats = asyncio.run(crawl())
+    assert len(phones) == 1
+    assert stats.bytes_received > 0 and stats.not_modified == 0
+
+    # A later crawl revalidates from the persisted store and gets a 304
+    phones, stats = asyncio.run(crawl())
+    assert phones == []
+    assert stats.not_modified == 1 and stats.cache_hit_rate == 1.0
+    assert stats.bytes_received == 0
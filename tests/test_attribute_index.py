@@ -0,0 +1,52 @@
+# tests/test_attribute_index.py
+
+from types import SimpleNamespace
+
+from chatbot.attribute_index import AttributeIndex, detect_superlative
+
+
+def _phone(name, camera=None, battery=None, release=None, ram=None):
+    return SimpleNamespace(
+        name=name,
+        camera_main=camera,
+        battery=battery,
+        display_size=None,
+        ram=ram,
+        release_date=release,
+    )
+
+
+PHONES = [
+    _phone("Galaxy A56", "50 MP, f/1.8", "5000 mAh", "2025, March 02", "8GB RAM"),
+    _phone("Galaxy S25 Ultra", "200 MP, f/1.7", "5000 mAh", "2025, January 22"),
+    _phone("Galaxy S23", "50 MP, f/1.8", "3900 mAh", "2023, February 01"),
+    _phone("Galaxy M55", None, "5000 mAh", "2024", "256GB 12GB RAM, 8GB RAM"),
+]
+
+
+def test_detect_superlative():
+    assert detect_superlative("Which Samsung phone has the best camera?") == "camera"
+    assert detect_superlative("What's the latest Samsung phone?") == "release_date"
+    assert detect_superlative("Phone with the biggest screen") == "display"
+    assert detect_superlative("Samsung phone with good battery life?") is None
+    assert detect_superlative("Best Samsung phone for performance?") is None
+
+
+def test_top_ranks_whole_catalog():
+    index = AttributeIndex(PHONES)
+    assert [p.name for p in index.top("camera", 2)] == [
+        "Galaxy S25 Ultra",
+        "Galaxy A56",
+    ]
+    assert [p.name for p in index.top("release_date", 3)] == [
+        "Galaxy A56",
+        "Galaxy S25 Ultra",
+        "Galaxy M55",
+    ]
+    # Ties keep a stable order by name; phones without a value are dropped
+    assert [p.name for p in index.top("battery")][:3] == [
+        "Galaxy A56",
+        "Galaxy M55",
+        "Galaxy S25 Ultra",
+    ]
+    assert [p.name for p in index.top("ram")] == ["Galaxy M55", "Galaxy A56"]
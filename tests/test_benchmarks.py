@@ -0,0 +1,76 @@
+# tests/test_benchmarks.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from benchmarks.catalog import (
+    BASE_NAMES,
+    EDITIONS,
+    catalog_size,
+    generate_catalog,
+    phone_name,
+    synthetic_phone,
+)
+from benchmarks.results import compare_results
+from benchmarks.run import median_metrics
+
+
+def _results(calibration=0.1, **metrics):
+    return {
+        "meta": {"calibration_seconds": calibration},
+        "results": {"suite": metrics},
+    }
+
+
+def test_synthetic_phones_are_unique_and_deterministic():
+    count = len(BASE_NAMES) * len(EDITIONS) + 10
+    names = [phone_name(i) for i in range(count)]
+    assert len(set(names)) == count
+    assert names[-1].endswith(" Rev 1")
+    assert synthetic_phone(7, seed=3) == synthetic_phone(7, seed=3)
+    assert synthetic_phone(7, seed=3) != synthetic_phone(7, seed=4)
+
+
+def test_generate_catalog_ingests_and_counts(tmp_path):
+    url = f"sqlite:///{tmp_path / 'bench.db'}"
+    assert catalog_size(url) == 0
+
+    counts = generate_catalog(url, 25, batch_size=10)
+    assert counts["inserted"] == 25
+    assert catalog_size(url) == 25
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = _results(search_p50_ms=2.0, build_seconds=1.0, search_per_second=500)
+    current = _results(search_p50_ms=3.0, build_seconds=1.1, search_per_second=300)
+
+    regressions = compare_results(current, baseline, tolerance=0.25)
+    assert {r["metric"]: r["change"] for r in regressions} == {
+        "search_p50_ms": 0.5,
+        "search_per_second": 0.4,
+    }
+
+
+def test_compare_skips_noise_and_informational_metrics():
+    baseline = _results(find_p50_ms=0.01, find_p95_ms=1.0, vector_index="skipped")
+    current = _results(find_p50_ms=0.03, find_p95_ms=9.0, vector_index="skipped")
+    assert compare_results(current, baseline, tolerance=0.25) == []
+
+
+def test_compare_scales_by_calibration():
+    baseline = _results(calibration=0.1, build_seconds=1.0)
+    slower_machine = _results(calibration=0.2, build_seconds=1.8)
+    assert compare_results(slower_machine, baseline, tolerance=0.25) == []
+
+    same_machine = _results(calibration=0.1, build_seconds=1.8)
+    assert compare_results(same_machine, baseline, tolerance=0.25)
+
+
+def test_median_metrics_keeps_labels():
+    runs = [
+        {"p50_ms": 3.0, "vector_index": "skipped"},
+        {"p50_ms": 1.0, "vector_index": "skipped"},
+        {"p50_ms": 2.0, "vector_index": "skipped"},
+    ]
+    assert median_metrics(runs) == {"p50_ms": 2.0, "vector_index": "skipped"}
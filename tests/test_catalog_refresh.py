@@ -0,0 +1,157 @@
+# tests/test_catalog_refresh.py
+
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import catalog.refresh
+import catalog.snapshot
+from catalog.refresh import refresh_catalog, register_refresh_hook, sync_catalog
+from catalog.snapshot import load_snapshot_from_db
+from database.migrations import run_migrations
+from database.models import Phone
+from scraper.ingest import bulk_upsert_phones, phone_row
+from tests.factories import scraped_phone
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'refresh.db'}")
+    run_migrations(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def hook_calls(monkeypatch):
+    """Replace the default rebuild hooks with one that records its changes"""
+    calls = []
+    monkeypatch.setattr(catalog.refresh, "_hooks", {})
+    monkeypatch.setattr(catalog.refresh, "_applied_version", None)
+    register_refresh_hook("record", lambda db, change: calls.append(change))
+    return calls
+
+
+def test_refresh_emits_only_changed_phones(db, hook_calls):
+    first = refresh_catalog(db, [scraped_phone(i) for i in range(4)])
+    assert first["catalog_version"] == 1 and len(first["changed_ids"]) == 4
+
+    # Whitespace-only differences hash the same; a new battery value doesn't
+    batch = [scraped_phone(i) for i in range(4)]
+    batch[0]["battery"] = " 5000   mAh"
+    batch[2] = scraped_phone(2, battery="4500 mAh")
+    second = refresh_catalog(db, batch)
+
+    phone = db.query(Phone).filter(Phone.name == "Samsung Galaxy Test 2").one()
+    assert second["changed_ids"] == [phone.id]
+    assert second["catalog_version"] == phone.catalog_version == 2
+    assert second["ingested"]["updated"] == 1
+    assert [change.changed_ids for change in hook_calls] == [
+        tuple(first["changed_ids"]),
+        (phone.id,),
+    ]
+
+    # Nothing changed: no version bump and no hooks
+    third = refresh_catalog(db, batch)
+    assert third["changed_ids"] == [] and third["catalog_version"] == 2
+    assert len(hook_calls) == 2
+
+
+def test_sync_applies_changes_from_other_writers(db, hook_calls):
+    bulk_upsert_phones(db, [scraped_phone(i) for i in range(3)])
+    assert sync_catalog(db) is None  # first sync only records the version
+
+    bulk_upsert_phones(db, [scraped_phone(1, battery="4000 mAh"), scraped_phone(9)])
+    result = sync_catalog(db)
+    assert result["catalog_version"] == 2
+    assert len(hook_calls[0].changed_ids) == 2
+    assert sync_catalog(db) is None
+
+
+def test_snapshot_hook_patches_only_changed_records(db, hook_calls, monkeypatch):
+    bulk_upsert_phones(db, [scraped_phone(i) for i in range(3)])
+    snapshot = load_snapshot_from_db(db)
+    monkeypatch.setattr(catalog.snapshot, "_snapshot", snapshot)
+    register_refresh_hook("snapshot", catalog.refresh._refresh_snapshot)
+
+    result = refresh_catalog(
+        db, [scraped_phone(0, battery="4200 mAh"), scraped_phone(5)]
+    )
+    assert result["rebuilt"]["snapshot"]["records"] == 2
+
+    updated = catalog.snapshot.loaded_snapshot()
+    assert updated is not snapshot and len(updated) == 4
+    assert updated.find("Galaxy Test 0").battery == "4200 mAh"
+    assert updated.get(snapshot.records[1].id) is snapshot.records[1]
+    assert updated.version == load_snapshot_from_db(db).version
+
+
+def test_migration_backfills_hash_and_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    run_migrations(engine, target=4)
+    with Session(engine) as db:
+        db.execute(
+            text(
+                "INSERT INTO phones (name, url, battery, spec_doc) "
+                "VALUES ('Galaxy Old', 'https://example.com/old.php', '4000 mAh', :doc)"
+            ),
+            {"doc": '{"specs": [["Battery - Type", "4000 mAh"]]}'},
+        )
+        db.commit()
+
+    run_migrations(engine)
+    with Session(engine) as db:
+        phone = db.query(Phone).one()
+        expected = phone_row(
+            {
+                "name": "Galaxy Old",
+                "url": "https://example.com/old.php",
+                "battery": "4000 mAh",
+                "specifications": {"Battery - Type": "4000 mAh"},
+            }
+        )
+        assert phone.spec_hash == expected["spec_hash"]
+        assert phone.catalog_version == 1
+    engine.dispose()
+
+
+def test_index_newer_than_its_metadata_keeps_the_loaded_pair(tmp_path, monkeypatch):
+    import chatbot.retriever as retriever
+
+    index_file, metadata_file = tmp_path / "faiss.index", tmp_path / "meta.pkl"
+    index_file.write_bytes(b"index")
+    metadata_file.write_bytes(b"metadata")
+    monkeypatch.setattr(retriever, "FAISS_INDEX_FILE", str(index_file))
+    monkeypatch.setattr(retriever, "METADATA_FILE", str(metadata_file))
+    # A refresh swapped the index in but hasn't replaced the metadata yet
+    os.utime(metadata_file, (1000, 1000))
+    os.utime(index_file, (2000, 2000))
+    loaded = ("old index", ["old metadata"])
+    monkeypatch.setattr(retriever, "_index_cache", (1000, 1000, *loaded))
+
+    assert retriever.load_faiss_index() == loaded
+
+
+def test_index_files_are_swapped_in_whole(tmp_path):
+    from chatbot.embeddings import _write_atomically
+
+    path = tmp_path / "faiss_metadata.pkl"
+    path.write_bytes(b"old")
+
+    def interrupted(tmp):
+        with open(tmp, "wb") as f:
+            f.write(b"ne")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        _write_atomically(str(path), interrupted)
+    assert path.read_bytes() == b"old" and os.listdir(tmp_path) == [path.name]
+
+    _write_atomically(str(path), lambda tmp: open(tmp, "wb").close())
+    assert path.read_bytes() == b"" and os.listdir(tmp_path) == [path.name]
@@ -0,0 +1,64 @@
+# tests/test_catalog_snapshot.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from agents import data_agent
+from catalog import snapshot as catalog
+from config import settings
+from database.migrations import run_migrations
+from database.models import Phone, Specification, build_spec_doc
+
+
+def _sqlite_catalog(tmp_path):
+    url = f"sqlite:///{tmp_path / 'catalog.db'}"
+    engine = create_engine(url)
+    run_migrations(engine)
+    with Session(engine) as db:
+        db.add(
+            Phone(
+                name="Samsung Galaxy S25 Ultra",
+                url="s25u",
+                battery="5000 mAh",
+                spec_doc=build_spec_doc({"Battery - Type": "Li-Ion 5000 mAh"}),
+            )
+        )
+        legacy = Phone(name="Samsung Galaxy A15", url="a15")
+        db.add(legacy)
+        db.flush()
+        db.add(Specification(phone_id=legacy.id, key="Memory - Card slot", value="Yes"))
+        db.commit()
+    engine.dispose()
+    return url
+
+
+def test_snapshot_loads_from_sqlite_and_round_trips(tmp_path):
+    snapshot = catalog.load_snapshot_from_url(_sqlite_catalog(tmp_path))
+
+    assert len(snapshot) == 2
+    assert snapshot.find("s25 ultra").specs == (("Battery - Type", "Li-Ion 5000 mAh"),)
+    # Phones without a spec document fall back to the specifications rows
+    assert snapshot.find("galaxy a15").specs == (("Memory - Card slot", "Yes"),)
+
+    path = str(tmp_path / "catalog.json.gz")
+    catalog.write_snapshot_file(snapshot, path)
+    restored = catalog.read_snapshot_file(path)
+    assert restored.version == snapshot.version
+    assert restored.records == snapshot.records
+
+
+def test_data_agent_reads_published_snapshot(tmp_path, monkeypatch):
+    snapshot = catalog.load_snapshot_from_url(_sqlite_catalog(tmp_path))
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(catalog, "_snapshot", None)
+    catalog.publish_snapshot(snapshot)
+
+    data = data_agent.get_phone_data("Galaxy S25 Ultra")
+    assert data["structured"]["Battery"] == "5000 mAh"
+    assert data["extra"] == {"Battery - Type": "Li-Ion 5000 mAh"}
+    assert "error" in data_agent.get_phone_data("iPhone 15")
+    assert len(data_agent.get_all_phone_data()) == 2
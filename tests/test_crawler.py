@@ -0,0 +1,171 @@
+# tests/test_crawler.py
+
+import asyncio
+import os
+
+import httpx
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.migrations import run_migrations
+from database.models import Phone
+import scraper.pipeline
+from scraper.async_fetcher import AsyncFetcher
+from scraper.crawler import crawl_catalog
+from scraper.frontier import CrawlFrontier
+from scraper.gsmarena_scraper import parse_makers_page
+from scraper.http_cache import ValidatorStore
+
+SITE = "https://phones.test"
+
+LISTING = """
+<html><body><div class="makers"><ul>{phones}</ul></div>
+<div class="nav-pages"><strong>{page}</strong>
+<a href="{site}/acme-phones-f-1-0-p1.php">1</a>
+<a href="{site}/acme-phones-f-1-0-p2.php">2</a></div></body></html>
+"""
+
+PHONE_PAGE = """
+<html><body><h1 class="specs-phone-name-title">Acme {i}</h1>
+<div id="specs-list"><table>
+<tr><th>Battery</th><td class="ttl">Type</td><td class="nfo">Li-Ion 5000 mAh</td></tr>
+</table></div></body></html>
+"""
+
+
+def _listing(page, numbers):
+    phones = "".join(
+        f'<li><a href="acme_{i}-{i}.php">Acme {i}</a></li>' for i in numbers
+    )
+    # Phone links are relative to gsmarena.com; point them at the stub site
+    phones = phones.replace('href="', f'href="{SITE}/')
+    return LISTING.format(phones=phones, page=page, site=SITE)
+
+
+class StubSite:
+    """httpx transport serving two listing pages and phone pages 0-5"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.hits = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.hits[path] = self.hits.get(path, 0) + 1
+        if path == "/acme-phones-f-1-0-p1.php":
+            return httpx.Response(200, text=_listing(1, range(0, 3)))
+        if path == "/acme-phones-f-1-0-p2.php":
+            return httpx.Response(200, text=_listing(2, range(3, 6)))
+        i = int(path.split("-")[-1].split(".")[0])
+        if i in self.fail:
+            return httpx.Response(404, text="gone")
+        # Phone pages carry an ETag and answer 304 when it still matches
+        etag = f'"acme-{i}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, text=PHONE_PAGE.format(i=i), headers={"ETag": etag})
+
+
+def _crawl(db, frontier, site, validators=None, **options):
+    async def run():
+        fetcher = AsyncFetcher(
+            transport=httpx.MockTransport(site),
+            rate_per_host=0,
+            max_retries=0,
+            validators=validators,
+        )
+        async with fetcher:
+            return await crawl_catalog(
+                db,
+                frontier,
+                fetcher,
+                start_urls=[f"{SITE}/acme-phones-f-1-0-p1.php"],
+                batch_size=2,
+                **options,
+            )
+
+    return asyncio.run(run())
+
+
+def test_crawl_walks_pagination_and_resumes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crawl.db'}")
+    run_migrations(engine)
+    path = str(tmp_path / "frontier.json")
+
+    with Session(engine) as db:
+        # First run stops part-way, as if interrupted after two batches
+        site = StubSite(fail={4})
+        summary = _crawl(db, CrawlFrontier(path, max_attempts=2), site, limit=4)
+        assert summary["done"] == 4 and summary["pending"] == 2
+        assert db.query(Phone).count() == 4
+
+        # A new process resumes from the checkpoint without re-planning
+        site = StubSite(fail={4})
+        frontier = CrawlFrontier(path, max_attempts=2)
+        summary = _crawl(db, frontier, site)
+        assert "/acme-phones-f-1-0-p1.php" not in site.hits
+        assert site.hits == {"/acme_4-4.php": 2, "/acme_5-5.php": 1}
+
+        assert summary["done"] == 5 and summary["failed"] == 1
+        assert frontier.failed[f"{SITE}/acme_4-4.php"]["attempts"] == 2
+        assert summary["fetch_ms_p50"] is not None
+        assert summary["parse_ms_p50"] is not None
+        assert db.query(Phone).count() == 5
+
+    engine.dispose()
+
+
+def test_page_that_failed_to_parse_is_downloaded_again(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crawl.db'}")
+    run_migrations(engine)
+    parse = scraper.pipeline.parse_page
+    calls = []
+
+    def flaky_parse(html, url):
+        calls.append(url)
+        if len(calls) == 1:
+            raise ValueError("truncated page")
+        return parse(html, url)
+
+    monkeypatch.setattr(scraper.pipeline, "parse_page", flaky_parse)
+    site = StubSite()
+    frontier = CrawlFrontier(str(tmp_path / "frontier.json"), max_attempts=2)
+    frontier.add([f"{SITE}/acme_0-0.php"])
+    frontier.mark_planned()
+    validators = ValidatorStore(str(tmp_path / "validators.json"))
+
+    with Session(engine) as db:
+        summary = _crawl(db, frontier, site, validators=validators, workers=0)
+        # The retry downloaded the page in full instead of getting a 304
+        assert site.hits == {"/acme_0-0.php": 2} and len(calls) == 2
+        assert summary["done"] == 1 and summary["failed"] == 0
+        assert frontier.done[f"{SITE}/acme_0-0.php"]["status"] == "parsed"
+        assert db.query(Phone).count() == 1
+    assert validators.conditional_headers(f"{SITE}/acme_0-0.php")
+    engine.dispose()
+
+
+def test_frontier_add_dedupes_and_requeues(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.json"), max_attempts=1)
+    assert frontier.add(["a", "b", "a"]) == 2
+    frontier.mark_done("a", 0.1, 0.01)
+    frontier.mark_failed("b", "HTTP 500")
+    assert frontier.add(["a", "b", "c"]) == 1
+    assert frontier.next_batch(5) == ["c"]
+
+    assert frontier.requeue_failed() == 1
+    frontier.checkpoint()
+    assert CrawlFrontier(frontier.path).next_batch(5) == ["c", "b"]
+
+
+def test_parse_makers_page():
+    html = """<div class="st-text"><table><tr>
+    <td><a href="acer-phones-59.php">Acer<br><span>100 devices</span></a></td>
+    <td><a href="samsung-phones-9.php">Samsung</a></td></tr></table></div>"""
+    assert parse_makers_page(html) == {
+        "acer": "https://www.gsmarena.com/acer-phones-59.php",
+        "samsung": "https://www.gsmarena.com/samsung-phones-9.php",
+    }
@@ -0,0 +1,119 @@
+# tests/test_database.py
+
+import asyncio
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import database
+from config.database import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    get_db,
+    pool_stats,
+    session_scope,
+)
+
+
+@pytest.fixture
+def small_pool(tmp_path, monkeypatch):
+    """A one-connection instrumented pool installed as the app's sync engine"""
+    metrics = PoolMetrics()
+    monkeypatch.setattr(InstrumentedQueuePool, "metrics", metrics)
+    monkeypatch.setattr(database, "pool_metrics", metrics)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (name TEXT)"))
+    monkeypatch.setattr(database, "_engine", engine)
+    monkeypatch.setattr(database, "_session_factory", sessionmaker(bind=engine))
+    yield engine
+    engine.dispose()
+
+
+def _count_items(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM items")).scalar()
+
+
+def test_session_scope_rolls_back_and_closes_on_error(small_pool):
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            db.execute(text("INSERT INTO items VALUES ('lost')"))
+            raise RuntimeError("request failed")
+    assert _count_items(small_pool) == 0
+    # The connection went back to the one-slot pool, or this would time out
+    assert small_pool.pool.checkedout() == 0
+
+    with session_scope() as db:
+        db.execute(text("INSERT INTO items VALUES ('kept')"))
+        db.commit()
+    assert _count_items(small_pool) == 1
+    assert small_pool.pool.checkedout() == 0
+
+
+def test_get_db_closes_the_session_when_the_request_ends(small_pool):
+    dependency = get_db()
+    db = next(dependency)
+    db.execute(text("SELECT 1"))
+    assert small_pool.pool.checkedout() == 1
+    with pytest.raises(StopIteration):
+        next(dependency)
+    assert small_pool.pool.checkedout() == 0
+
+
+def test_sync_pool_counts_checkouts_and_timeouts(small_pool):
+    metrics = database.pool_metrics
+    start = metrics.checkouts
+    with small_pool.connect():
+        with pytest.raises(exc.TimeoutError):
+            small_pool.connect()
+    assert metrics.checkouts == start + 2 and metrics.timeouts == 1
+    assert metrics.wait_seconds_max >= 0.05
+
+    stats = pool_stats()
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert stats["checkout_timeouts"] == 1
+    assert stats["size"] == 1 and stats["checked_out"] == 0
+
+
+def test_async_pool_counts_checkouts_and_timeouts(tmp_path, monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(InstrumentedAsyncQueuePool, "metrics", metrics)
+    monkeypatch.setattr(database, "async_pool_metrics", metrics)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+    async def exhaust_pool():
+        try:
+            async with engine.connect() as held:
+                await held.execute(text("SELECT 1"))
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            return pool_stats()["async"]
+        finally:
+            await engine.dispose()  # on this loop, which owns the connections
+
+    monkeypatch.setattr(database, "_async_engine", engine)
+    stats = asyncio.run(exhaust_pool())
+    assert metrics.checkouts == 2 and metrics.timeouts == 1
+    assert metrics.wait_seconds_max >= 0.05
+    assert stats["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert stats["checkout_timeouts"] == 1 and stats["size"] == 1
@@ -0,0 +1,65 @@
+# tests/test_fast_parser.py
+
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from scraper.fast_parser import compile_mapping, parse_phone_details_fast
+from scraper.gsmarena_scraper import parse_phone_details_soup
+from scripts.bench_parser import synthetic_phone_page
+
+URL = "https://www.gsmarena.com/test-1.php"
+
+EDGE_CASE_PAGES = [
+    # No spec table at all; title falls back to a plain h1
+    "<html><body><h1>Nokia 3310</h1><img class='specs-photo' src='p.jpg'></body></html>",
+    # th.ttl category header rows, plain cells without ttl/nfo classes
+    """<html><body><div class="specs-photo"><img src="x.jpg"></div>
+    <div id="specs-list"><table>
+    <tr><th class="ttl">Memory</th></tr>
+    <tr><td>Internal</td><td>128GB 8GB RAM</td></tr>
+    <tr><td>Card slot</td><td>microSDXC</td></tr>
+    </table><table><tr><th>Platform</th><td class="ttl">OS</td><td class="nfo">iOS 17</td></tr>
+    <tr><td class="ttl">Same</td><td class="nfo">Same</td></tr></table></div></body></html>""",
+    # No #specs-list: the first cellspacing=0 table is used directly
+    """<html><body><span class="specs-brief-accent">Pixel <b>9</b></span>
+    <table cellspacing="0"><tr><th>Battery</th><td class="ttl">Capacity</td>
+    <td class="nfo">4700<br>mAh</td></tr><tr><td class="ttl">Size</td>
+    <td class="nfo">6.3 inches</td></tr></table></body></html>""",
+    # Script, style and comment nodes inside cells contribute no text
+    """<html><body><h1 class="specs-phone-name-title">Galaxy<!-- x --> A15</h1>
+    <div id="specs-list"><table><tr><th>Battery</th><td class="ttl">Type</td>
+    <td class="nfo">5000 mAh<script>var a=1;</script><style>b{}</style>
+    <b>25W</b> wired</td></tr></table></div></body></html>""",
+]
+
+
+@pytest.mark.parametrize("i", range(12))
+def test_matches_soup_parser_on_synthetic_pages(i):
+    html = synthetic_phone_page(i)
+    assert parse_phone_details_fast(html, URL) == parse_phone_details_soup(html, URL)
+
+
+@pytest.mark.parametrize("html", EDGE_CASE_PAGES)
+def test_matches_soup_parser_on_edge_cases(html):
+    assert parse_phone_details_fast(html, URL) == parse_phone_details_soup(html, URL)
+
+
+def test_structured_fields_from_synthetic_page():
+    phone = parse_phone_details_fast(synthetic_phone_page(3), URL)
+    assert phone["name"] == "Samsung Galaxy Bench 3"
+    assert phone["image"].endswith("bench-3.jpg")
+    assert phone["battery"].startswith("Li-Ion")
+    assert "RAM" in phone["ram"]
+    assert phone["network"] == "GSM / HSPA / LTE / 5G"
+    assert "Display - Size" in phone["specifications"]
+
+
+def test_mapping_is_compiled_once_per_row_kind():
+    compile_mapping.cache_clear()
+    for i in range(5):
+        parse_phone_details_fast(synthetic_phone_page(i), URL)
+    info = compile_mapping.cache_info()
+    assert info.currsize < info.hits
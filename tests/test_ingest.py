@@ -0,0 +1,43 @@
+# tests/test_ingest.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.migrations import run_migrations
+from database.models import Phone, Specification
+from scraper.ingest import bulk_upsert_phones
+from tests.factories import scraped_phone
+
+
+def test_bulk_upsert_counts_and_replaces_specs(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}")
+    run_migrations(engine)
+
+    with Session(engine) as db:
+        counts = bulk_upsert_phones(
+            db, [scraped_phone(i) for i in range(5)], batch_size=2
+        )
+        assert counts == {"inserted": 5, "updated": 0, "unchanged": 0, "skipped": 0}
+
+        batch = [scraped_phone(i) for i in range(5)]
+        batch[1] = scraped_phone(1, battery="4500 mAh")
+        batch.append(scraped_phone(5))
+        batch.append({"name": "", "specifications": {}})
+        counts = bulk_upsert_phones(db, batch)
+        assert counts == {"inserted": 1, "updated": 1, "unchanged": 4, "skipped": 1}
+
+        phone = db.query(Phone).filter(Phone.name == "Samsung Galaxy Test 1").one()
+        assert phone.battery == "4500 mAh"
+        assert phone.spec_items() == [
+            ("Battery - Type", "4500 mAh"),
+            ("Misc - Colors", "Black"),
+        ]
+        specs = db.query(Specification).filter(Specification.phone_id == phone.id)
+        assert {s.key: s.value for s in specs}["Battery - Type"] == "4500 mAh"
+        assert db.query(Specification).count() == 12
+
+    engine.dispose()
@@ -0,0 +1,91 @@
+# tests/test_leaderboard.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from agents.coordinator import PhoneAnalysisCoordinator
+from agents.leaderboard import Leaderboard, SpecMatrix
+from agents.review_agent import ReviewGenerator
+from scripts.bench_spec_analyzer import synthetic_phone_data
+
+
+def _specs(count=300):
+    phones = [synthetic_phone_data(i) for i in range(count)]
+    return ReviewGenerator().analyze_many(phones)
+
+
+def test_winners_match_scalar_scoring():
+    specs = _specs()
+    coordinator = PhoneAnalysisCoordinator()
+
+    winners = coordinator._determine_winners(specs)
+    assert (
+        winners["best_overall"]
+        == max(specs, key=coordinator._calculate_overall_score).name
+    )
+    assert winners["best_camera"] == max(specs, key=lambda x: x.main_camera_mp).name
+    assert winners["best_battery"] == max(specs, key=lambda x: x.battery_capacity).name
+    assert (
+        winners["best_value"]
+        == min(specs, key=lambda x: 1 if x.price_tier == "flagship" else 0).name
+    )
+
+
+def test_leaderboard_top_and_filters():
+    specs = _specs()
+    leaderboard = Leaderboard(SpecMatrix(specs))
+
+    top = leaderboard.top("battery", limit=5)
+    expected = sorted(specs, key=lambda x: -x.battery_capacity)[:5]
+    assert [row["name"] for row in top] == [p.name for p in expected]
+
+    mask = leaderboard.filter_mask(price_tier="flagship", min_year=2025)
+    for row in leaderboard.top("overall", limit=20, mask=mask):
+        phone = next(p for p in specs if p.name == row["name"])
+        assert phone.price_tier == "flagship"
+        assert phone.release_year >= 2025
+
+    assert leaderboard.filter_mask() is None
+
+
+def _ranking_client():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api.router import build_api_router
+
+    app = FastAPI()
+    app.include_router(build_api_router(["ranking"]))
+    return TestClient(app)
+
+
+def test_ranking_route_builds_the_shared_leaderboard_once(monkeypatch):
+    import agents.leaderboard
+
+    builds = []
+
+    def build():
+        builds.append(1)
+        return Leaderboard(SpecMatrix(_specs(20)))
+
+    monkeypatch.setattr(agents.leaderboard, "build_catalog_leaderboard", build)
+    monkeypatch.setattr(agents.leaderboard, "_catalog_leaderboard", None)
+    client = _ranking_client()
+
+    # Rejected before the catalog is parsed
+    response = client.get("/ranking/weight")
+    assert response.status_code == 404
+    assert "Unknown category 'weight'" in response.json()["error"]
+    assert builds == []
+
+    camera = client.get("/ranking/camera", params={"limit": 3}).json()
+    battery = client.get("/ranking/battery").json()
+    assert len(camera["phones"]) == 3 and battery["total"] == 20
+    assert builds == [1]
+
+
+def test_coordinator_is_shared_across_requests():
+    from api.dependencies import get_coordinator
+
+    assert get_coordinator() is get_coordinator()
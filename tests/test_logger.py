@@ -18,3 +18,71 @@ logger = get_logger(__name__)
 logger.info("Starting review agent")
 logger.error("Failed to connect to DB")
 """
+
+
+import json
+import sys
+import logging
+import logging.handlers
+import queue
+
+import config.logger
+from config.logger import JsonFormatter, LocalQueueHandler, build_handlers
+
+
+def test_get_logger_routes_through_queue():
+    config.logger.configure_logging()  # a second call changes nothing
+    queued = [
+        h for h in logging.getLogger().handlers if isinstance(h, LocalQueueHandler)
+    ]
+    assert len(queued) == 1
+
+
+def test_queued_records_render_message_at_call_time():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test.local_queue")
+    logger.propagate = False
+    logger.addHandler(LocalQueueHandler(log_queue))
+
+    specs = {"battery": "5000 mAh"}
+    logger.warning("specs: %s", specs)
+    specs["battery"] = "changed"
+
+    assert log_queue.get_nowait().getMessage() == "specs: {'battery': '5000 mAh'}"
+
+
+def test_json_file_rotates_by_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(config.logger.settings, "LOG_CONSOLE", False)
+    monkeypatch.setattr(config.logger.settings, "LOG_MAX_BYTES", 1000)
+    monkeypatch.setattr(config.logger.settings, "LOG_BACKUP_COUNT", 2)
+    log_file = tmp_path / "app.log"
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *build_handlers(str(log_file)))
+    logger = logging.getLogger("test.rotation")
+    logger.propagate = False
+    logger.addHandler(LocalQueueHandler(log_queue))
+
+    listener.start()
+    for i in range(50):
+        logger.info("saved phone %s", i, extra={"phone_id": i})
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+    assert (tmp_path / "app.log.1").exists() and (tmp_path / "app.log.2").exists()
+    assert not (tmp_path / "app.log.3").exists()
+    last = json.loads(log_file.read_text().splitlines()[-1])
+    assert last["message"] == "saved phone 49" and last["phone_id"] == 49
+    assert last["level"] == "INFO" and last["logger"] == "test.rotation"
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise ValueError("bad page")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+    entry = json.loads(JsonFormatter().format(record))
+    assert "ValueError: bad page" in entry["exc_info"]
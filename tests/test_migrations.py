@@ -0,0 +1,109 @@
+# tests/test_migrations.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine, exc, inspect, text
+
+from database.migrations import MIGRATIONS, current_version, run_migrations
+from database.migrations.v0001_initial_schema import metadata as baseline_metadata
+
+LATEST = MIGRATIONS[-1].VERSION
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _spec_index(engine):
+    indexes = inspect(engine).get_indexes("specifications")
+    return next(
+        (i for i in indexes if i["name"] == "ix_specifications_phone_id_key"), None
+    )
+
+
+def test_fresh_database_gets_every_migration(engine):
+    applied = run_migrations(engine)
+    assert applied == [f"{m.VERSION:04d}_{m.NAME}" for m in MIGRATIONS]
+    assert current_version(engine) == LATEST
+
+    columns = {c["name"] for c in inspect(engine).get_columns("phones")}
+    assert {"spec_doc", "spec_hash", "catalog_version"} <= columns
+    index = _spec_index(engine)
+    assert index["column_names"] == ["phone_id", "key"] and index["unique"]
+
+
+def test_baseline_database_is_deduplicated_and_indexed(engine):
+    # Tables as create_all made them before migrations existed
+    baseline_metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO phones (id, name, url) VALUES "
+                "(1, 'Galaxy A', 'https://example.com/a'), "
+                "(2, 'Galaxy B', 'https://example.com/b')"
+            )
+        )
+        conn.execute(
+            text(
+                'INSERT INTO specifications (id, phone_id, "key", value) VALUES '
+                "(1, 1, 'Battery', '5000 mAh'), "
+                "(2, 1, 'OS', 'Android 14'), "
+                "(3, 1, 'Battery', '4000 mAh'), "
+                "(4, 2, 'Battery', '3000 mAh'), "
+                "(5, 1, 'Battery', '4500 mAh'), "
+                "(6, 2, 'OS', 'Android 13')"
+            )
+        )
+
+    run_migrations(engine, target=2)
+    assert current_version(engine) == 2
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text('SELECT id, phone_id, "key", value FROM specifications ORDER BY id')
+        ).all()
+    # The earliest row of each (phone_id, key) survives
+    assert [tuple(row) for row in rows] == [
+        (1, 1, "Battery", "5000 mAh"),
+        (2, 1, "OS", "Android 14"),
+        (4, 2, "Battery", "3000 mAh"),
+        (6, 2, "OS", "Android 13"),
+    ]
+    assert _spec_index(engine)["unique"]
+    with pytest.raises(exc.IntegrityError):
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    'INSERT INTO specifications (phone_id, "key", value) '
+                    "VALUES (1, 'OS', 'Android 15')"
+                )
+            )
+
+    # The remaining migrations apply on top, backfilling from the kept rows
+    run_migrations(engine)
+    assert current_version(engine) == LATEST
+    with engine.connect() as conn:
+        doc = conn.execute(text("SELECT spec_doc FROM phones WHERE id = 1")).scalar()
+    assert "5000 mAh" in doc and "4000 mAh" not in doc
+
+
+def test_rerunning_migrations_is_a_no_op(engine):
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO phones (name, url) VALUES ('Galaxy A', 'https://example.com/a')"
+            )
+        )
+        before = conn.execute(text("SELECT * FROM schema_migrations")).all()
+
+    assert run_migrations(engine) == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT * FROM schema_migrations")).all() == before
+        assert conn.execute(text("SELECT COUNT(*) FROM phones")).scalar() == 1
+    assert current_version(engine) == LATEST
@@ -0,0 +1,132 @@
+# tests/test_model_backends.py
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.load import percentiles, run_load
+from chatbot import chatbot, embeddings
+from chatbot.attribute_index import AttributeIndex, detect_superlative
+from chatbot.chatbot import TemplateGenerator, create_detailed_response, generate_answer
+from chatbot.embeddings import EMBEDDING_DIM, HashEmbedder
+
+PHONES = [
+    SimpleNamespace(name="Galaxy S25 Ultra", camera_main="200 MP, f/1.7"),
+    SimpleNamespace(name="Galaxy A56", camera_main="50 MP, f/1.8"),
+]
+
+
+def test_hash_embedder_is_deterministic_unit_vectors():
+    texts = ["Galaxy S25 Ultra 200 MP camera", "Galaxy A05 5000 mAh battery"]
+    vectors = HashEmbedder().encode(texts, convert_to_numpy=True)
+
+    assert vectors.shape == (2, EMBEDDING_DIM) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert np.array_equal(vectors, HashEmbedder().encode(texts))
+
+
+def test_hash_embedder_similarity_follows_shared_words():
+    query, camera, battery = HashEmbedder().encode(
+        ["best camera MP", "Galaxy S25 Ultra 200 MP camera", "5000 mAh battery"]
+    )
+    assert query @ camera > query @ battery
+
+
+def test_template_generator_costs_latency_and_answers():
+    for cpu_bound in (False, True):
+        generator = TemplateGenerator(latency_ms=20, cpu_bound=cpu_bound)
+        start = time.perf_counter()
+        answer = generator.generate("best camera?", PHONES)
+        assert time.perf_counter() - start >= 0.02
+        assert "Galaxy S25 Ultra" in answer.splitlines()[2]
+
+
+def test_superlative_answer_shows_the_ranked_attribute():
+    catalog = [
+        SimpleNamespace(
+            name="Galaxy S25 Ultra",
+            camera_main="200 MP, f/1.7",
+            ram="12GB RAM",
+            storage="256GB",
+            release_date="2025, January 22",
+            battery=None,
+            display_size=None,
+        ),
+        SimpleNamespace(
+            name="Galaxy A56",
+            camera_main="50 MP, f/1.8",
+            ram="8GB RAM",
+            storage="512GB",
+            release_date="2025, March 02",
+            battery=None,
+            display_size=None,
+        ),
+    ]
+    index = AttributeIndex(catalog)
+
+    query = "Which phone has the most memory?"
+    attribute = detect_superlative(query)
+    answer = create_detailed_response(query, index.top(attribute), attribute)
+    assert "**Galaxy S25 Ultra** - 12GB RAM" in answer and "512GB" not in answer
+
+    # Ranked by release date, so the camera keyword doesn't re-sort by megapixels
+    query = "latest camera phone"
+    attribute = detect_superlative(query)
+    answer = create_detailed_response(query, index.top(attribute), attribute)
+    assert answer.splitlines()[2] == "1. **Galaxy A56** - Released 2025, March 02"
+
+
+def test_backends_selected_from_settings(monkeypatch):
+    monkeypatch.setattr(embeddings.settings, "EMBEDDING_BACKEND", "hash")
+    monkeypatch.setattr(chatbot.settings, "GENERATOR_BACKEND", "template")
+    monkeypatch.setattr(chatbot.settings, "FAKE_GENERATOR_LATENCY_MS", 0)
+    embeddings.get_embedding_model.cache_clear()
+    chatbot.get_answer_generator.cache_clear()
+    try:
+        assert isinstance(embeddings.get_embedding_model(), HashEmbedder)
+        assert generate_answer("best camera?", PHONES).startswith("Based on camera")
+
+        monkeypatch.setattr(embeddings.settings, "EMBEDDING_BACKEND", "word2vec")
+        embeddings.get_embedding_model.cache_clear()
+        with pytest.raises(ValueError):
+            embeddings.get_embedding_model()
+    finally:
+        embeddings.get_embedding_model.cache_clear()
+        chatbot.get_answer_generator.cache_clear()
+
+
+def test_percentiles():
+    stats = percentiles([i / 1000 for i in range(1, 101)])
+    assert stats == {"p50_ms": 50.0, "p90_ms": 90.0, "p99_ms": 99.0, "max_ms": 100.0}
+
+
+def test_run_load_keeps_the_schedule_and_counts_statuses():
+    app = FastAPI()
+
+    @app.get("/ok/{i}")
+    async def ok(i: int):
+        await asyncio.sleep(0.01)
+        return {"i": i}
+
+    async def drive():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await run_load(
+                c,
+                lambda i: ("GET", f"/ok/{i}" if i % 5 else "/missing", None),
+                100,
+                0.3,
+            )
+
+    stats = asyncio.run(drive())
+    assert stats["requests"] == 30
+    assert stats["statuses"] == {"200": 24, "404": 6}
+    assert stats["achieved_qps"] > 50
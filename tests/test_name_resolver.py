@@ -0,0 +1,72 @@
+# tests/test_name_resolver.py
+
+from agents.name_resolver import (
+    MATCH_EXACT,
+    MATCH_FUZZY,
+    MATCH_PREFIX,
+    PhoneNameResolver,
+    name_alias,
+)
+
+PHONES = [
+    (1, "Samsung Galaxy S25 Ultra"),
+    (2, "Samsung Galaxy S25"),
+    (3, "Samsung Galaxy S25 Edge"),
+    (4, "Samsung Galaxy A56"),
+    (5, "Samsung Galaxy S24 FE"),
+]
+
+
+def test_alias():
+    assert name_alias("Samsung Galaxy S25 Ultra") == "s25 ultra"
+    assert name_alias("galaxy  a56!") == "a56"
+
+
+def test_exact_beats_longer_substring_match():
+    resolver = PhoneNameResolver(PHONES)
+    match = resolver.resolve("S25")
+    assert match.phone_id == 2
+    assert match.match_type == MATCH_EXACT
+
+    assert resolver.resolve("Galaxy S25 Ultra").phone_id == 1
+
+
+def test_prefix_is_deterministic():
+    resolver = PhoneNameResolver(PHONES)
+    ranked = resolver.candidates("S25 E", limit=3)
+    assert ranked[0].phone_id == 3
+    assert ranked[0].match_type == MATCH_PREFIX
+
+    # "S24" has no exact model, so the shortest prefix match wins
+    assert resolver.resolve("s24").name == "Samsung Galaxy S24 FE"
+
+
+def test_fuzzy_fallback():
+    resolver = PhoneNameResolver(PHONES)
+    match = resolver.resolve("Galaxy S25 Ultr")
+    assert match.phone_id == 1
+
+    match = resolver.resolve("S25 Utlra")
+    assert match.phone_id == 1
+    assert match.match_type == MATCH_FUZZY
+
+    assert resolver.resolve("iPhone") is None
+
+
+def test_plus_models_resolve_apart_from_base_models():
+    resolver = PhoneNameResolver(
+        [
+            (1, "Samsung Galaxy S24"),
+            (2, "Samsung Galaxy S24+"),
+            (3, "Samsung Galaxy Note10"),
+            (4, "Samsung Galaxy Note10+"),
+        ]
+    )
+    assert name_alias("Samsung Galaxy S24+") == "s24 plus"
+    for query in ("Samsung Galaxy S24+", "samsung galaxy s24+", "S24+", "s24 plus"):
+        match = resolver.resolve(query)
+        assert match.phone_id == 2 and match.match_type == MATCH_EXACT, query
+    assert resolver.resolve("Samsung Galaxy S24").phone_id == 1
+    assert resolver.resolve("s24").phone_id == 1
+    assert resolver.resolve("Note10+").phone_id == 4
+    assert resolver.resolve("note10").phone_id == 3
@@ -0,0 +1,134 @@
+# tests/test_pipeline.py
+
+import asyncio
+import os
+import time
+
+import httpx
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import scraper.pipeline
+from database.migrations import run_migrations
+from database.models import Phone
+from scraper.async_fetcher import AsyncFetcher
+from scraper.frontier import CrawlFrontier
+from scraper.http_cache import ValidatorStore
+from scraper.pipeline import IngestPipeline
+
+PHONE_PAGE = """
+<html><body><h1 class="specs-phone-name-title">Acme {i}</h1>
+<div id="specs-list"><table>
+<tr><th>Battery</th><td class="ttl">Type</td><td class="nfo">Li-Ion 5000 mAh</td></tr>
+</table></div></body></html>
+"""
+
+
+def _serve(request: httpx.Request) -> httpx.Response:
+    name = request.url.path.strip("/")
+    if name == "missing":
+        return httpx.Response(404)
+    if name == "blank":
+        return httpx.Response(200, text="<html><body></body></html>")
+    etag = f'"{name}"'
+    if request.headers.get("If-None-Match") == etag:
+        return httpx.Response(304)
+    return httpx.Response(200, text=PHONE_PAGE.format(i=name), headers={"ETag": etag})
+
+
+def _run(db, urls, validators=None, **options):
+    async def run():
+        fetcher = AsyncFetcher(
+            transport=httpx.MockTransport(_serve),
+            rate_per_host=0,
+            max_retries=0,
+            validators=validators,
+        )
+        async with fetcher:
+            return await IngestPipeline(db, fetcher, **options).run(urls)
+
+    return asyncio.run(run())
+
+
+def _database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pipeline.db'}")
+    run_migrations(engine)
+    return engine
+
+
+def test_pipeline_ingests_through_process_pool(tmp_path):
+    engine = _database(tmp_path)
+    urls = [f"https://phones.test/{i}" for i in range(10)]
+    urls += ["https://phones.test/missing", "https://phones.test/blank"]
+
+    with Session(engine) as db:
+        stats = _run(db, urls, workers=2, batch_size=4)
+        assert db.query(Phone).count() == 10
+
+    stages = stats["stages"]
+    assert stages["fetch"]["items"] == 12 and stages["fetch"]["errors"] == 1
+    assert stages["parse"]["items"] == 11
+    assert stages["write"]["items"] == 12 and stages["write"]["errors"] == 0
+    assert stats["ingested"]["inserted"] == 10
+    engine.dispose()
+
+
+def test_slow_writer_backs_up_upstream_stages(tmp_path, monkeypatch):
+    engine = _database(tmp_path)
+    upsert = scraper.pipeline.bulk_upsert_phones
+
+    def slow_upsert(db, phones):
+        time.sleep(0.02)
+        return upsert(db, phones)
+
+    monkeypatch.setattr(scraper.pipeline, "bulk_upsert_phones", slow_upsert)
+    urls = [f"https://phones.test/{i}" for i in range(20)]
+
+    with Session(engine) as db:
+        stats = _run(db, urls, workers=0, batch_size=1, queue_size=2)
+        assert db.query(Phone).count() == 20
+
+    stages = stats["stages"]
+    assert stages["write"]["items"] == 20
+    # Bounded queues: parsing and fetching stall waiting for the writer
+    assert stages["parse"]["blocked_seconds"] > 0.1
+    assert stages["fetch"]["blocked_seconds"] > 0.1
+    engine.dispose()
+
+
+def test_failed_pages_are_refetched_in_full_on_retry(tmp_path, monkeypatch):
+    engine = _database(tmp_path)
+    upsert, parse = scraper.pipeline.bulk_upsert_phones, scraper.pipeline.parse_page
+    urls = ["https://phones.test/saved", "https://phones.test/unparsed"]
+
+    def failing_upsert(db, phones):
+        raise RuntimeError("database is locked")
+
+    def selective_parse(html, url):
+        if url.endswith("unparsed"):
+            raise ValueError("truncated page")
+        return parse(html, url)
+
+    monkeypatch.setattr(scraper.pipeline, "bulk_upsert_phones", failing_upsert)
+    monkeypatch.setattr(scraper.pipeline, "parse_page", selective_parse)
+    frontier = CrawlFrontier(str(tmp_path / "frontier.json"), max_attempts=3)
+    frontier.add(urls)
+    validators = ValidatorStore(str(tmp_path / "validators.json"))
+
+    with Session(engine) as db:
+        _run(db, urls, validators, workers=0, frontier=frontier)
+        assert frontier.next_batch(5) == urls
+        assert len(validators) == 0
+
+        # The retry must download both pages again, not get 304s
+        monkeypatch.setattr(scraper.pipeline, "bulk_upsert_phones", upsert)
+        monkeypatch.setattr(scraper.pipeline, "parse_page", parse)
+        stats = _run(db, urls, validators, workers=0, frontier=frontier)
+        assert stats["ingested"]["inserted"] == 2
+        assert db.query(Phone).count() == 2
+        assert {entry["status"] for entry in frontier.done.values()} == {"parsed"}
+        assert len(validators) == 2
+    engine.dispose()
@@ -0,0 +1,109 @@
+# tests/test_profiling.py
+
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import ProfilingMiddleware
+from api.profiling import services
+from api.profiling.routes import router as profiling_router
+from api.profiling.services import fold_stack
+
+TOKEN = {"X-Admin-Token": "s3cret"}
+
+
+def busy_review(ms: float):
+    deadline = time.perf_counter() + ms / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(services.settings, "PROFILING_ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(services, "_session", None)
+
+    app = FastAPI()
+
+    @app.get("/review/{name}")
+    async def review(name: str):
+        busy_review(20)
+        return {"review": name}
+
+    @app.get("/ranking/{category}")
+    def ranking(category: str):
+        return {"category": category}
+
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(profiling_router, prefix="/admin/profile")
+    with TestClient(app) as client:
+        yield client
+    session = services.current_session()
+    if session is not None:
+        session.finish()
+
+
+def test_fold_stack_is_root_first():
+    stack = fold_stack(sys._getframe())
+    assert stack.endswith("tests.test_profiling:test_fold_stack_is_root_first")
+    assert ";" in stack
+
+
+def test_admin_token_required(client, monkeypatch):
+    assert client.get("/admin/profile").status_code == 401
+    wrong = {"X-Admin-Token": "nope"}
+    assert client.post("/admin/profile", json={}, headers=wrong).status_code == 401
+    non_ascii = {"X-Admin-Token": "s3cr\xe9t".encode("latin-1")}
+    assert client.get("/admin/profile", headers=non_ascii).status_code == 401
+
+    monkeypatch.setattr(services.settings, "PROFILING_ADMIN_TOKEN", "")
+    assert client.get("/admin/profile", headers=TOKEN).status_code == 403
+
+
+def test_sampling_session_for_next_requests(client):
+    assert client.get("/admin/profile", headers=TOKEN).status_code == 404
+    started = client.post(
+        "/admin/profile", json={"requests": 2, "interval_ms": 1}, headers=TOKEN
+    )
+    assert started.status_code == 200 and started.json()["active"]
+    assert client.post("/admin/profile", json={}, headers=TOKEN).status_code == 409
+
+    client.get("/ranking/camera")  # not a profiled route
+    client.get("/review/a")
+    client.get("/review/b")
+    client.get("/review/c")  # after the session ended
+
+    summary = client.get("/admin/profile", headers=TOKEN).json()
+    assert not summary["active"]
+    assert [r["path"] for r in summary["requests"]] == ["/review/a", "/review/b"]
+    assert all(
+        r["duration_ms"] >= 20 and "alloc_peak_kb" in r for r in summary["requests"]
+    )
+    assert "top_allocations" in summary
+
+    folded = client.get("/admin/profile/folded", headers=TOKEN).text
+    assert "tests.test_profiling:busy_review" in folded
+    stack, samples = folded.splitlines()[0].rsplit(" ", 1)
+    assert int(samples) > 0
+
+
+def test_cprofile_session_stopped_early(client):
+    client.post(
+        "/admin/profile",
+        json={"mode": "cprofile", "seconds": 30, "allocations": False},
+        headers=TOKEN,
+    )
+    client.get("/review/a")
+    stopped = client.delete("/admin/profile", headers=TOKEN).json()
+    assert not stopped["active"] and stopped["requests_profiled"] == 1
+
+    assert "busy_review" in client.get("/admin/profile/pstats", headers=TOKEN).text
+    dump = client.get("/admin/profile/pstats?format=prof", headers=TOKEN)
+    assert dump.headers["content-type"] == "application/octet-stream"
+    assert len(dump.content) > 0
@@ -0,0 +1,84 @@
+# tests/test_readiness.py
+
+import asyncio
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main, readiness as readiness_module
+from api.readiness import Readiness, warm_up
+
+
+@pytest.fixture
+def fresh_readiness(monkeypatch):
+    state = Readiness()
+    monkeypatch.setattr(readiness_module, "readiness", state)
+    monkeypatch.setattr(main, "readiness", state)
+    return state
+
+
+def test_steps_report_status_and_load_time(fresh_readiness, monkeypatch):
+    monkeypatch.setitem(readiness_module.PRELOADS, "encoder", lambda: None)
+
+    async def empty_catalog():
+        return "skipped"
+
+    monkeypatch.setitem(readiness_module.WARMUPS, "review", empty_catalog)
+    asyncio.run(warm_up(["encoder"], ["review", "not-a-feature"]))
+
+    summary = fresh_readiness.summary()
+    assert summary["ready"] is True
+    assert summary["components"]["encoder"]["status"] == "ready"
+    assert "seconds" in summary["components"]["encoder"]
+    assert summary["components"]["warmup_review"]["status"] == "skipped"
+
+
+def test_failed_or_unknown_components_keep_the_app_unready(
+    fresh_readiness, monkeypatch
+):
+    def broken():
+        raise RuntimeError("FAISS index files not found")
+
+    monkeypatch.setitem(readiness_module.PRELOADS, "index", broken)
+    asyncio.run(warm_up(["index", "gpu"], []))
+
+    summary = fresh_readiness.summary()
+    assert summary["ready"] is False
+    assert summary["components"]["index"]["status"] == "failed"
+    assert "FAISS index files not found" in summary["components"]["index"]["error"]
+    assert summary["components"]["gpu"]["status"] == "failed"
+
+
+def test_ready_endpoint_waits_for_warmup(fresh_readiness, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_generator():
+        await release.wait()
+
+    monkeypatch.setitem(readiness_module.PRELOADS, "generator", slow_generator)
+    monkeypatch.setattr(main.settings, "WARMUP_COMPONENTS", ["generator"])
+    monkeypatch.setattr(main.settings, "CATALOG_SYNC_INTERVAL", 0)
+
+    with TestClient(main.app) as client:
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["components"]["generator"]["status"] in (
+            "pending",
+            "loading",
+        )
+
+        client.portal.call(release.set)
+        for _ in range(50):
+            response = client.get("/health/ready")
+            if response.status_code == 200:
+                break
+        assert response.status_code == 200
+        assert response.json()["components"]["generator"]["status"] == "ready"
+
+
+def test_nothing_to_warm_is_ready_at_once(fresh_readiness):
+    asyncio.run(warm_up([], []))
+    assert fresh_readiness.summary() == {"ready": True, "components": {}}
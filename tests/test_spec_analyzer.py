@@ -0,0 +1,53 @@
+# tests/test_spec_analyzer.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from agents.review_agent import ReviewGenerator, SpecAnalyzer
+from scripts.bench_spec_analyzer import (
+    legacy_chipset_tier,
+    legacy_price_tier,
+    legacy_specs_object,
+    synthetic_phone_data,
+)
+
+
+def test_tiers_match_table_order():
+    # "S24 FE" also contains the premium "S24"; the table order decides
+    for name in [
+        "Samsung Galaxy S25 Ultra",
+        "Samsung Galaxy S24 FE",
+        "Samsung Galaxy a56 5G",
+        "Samsung Galaxy M35",
+        "",
+    ]:
+        assert SpecAnalyzer.determine_price_tier(name) == legacy_price_tier(name)
+
+    for chipset in [
+        "Qualcomm Snapdragon 8 Gen 3 (4 nm)",
+        "Exynos 1380 (5 nm) / Exynos 850",
+        "Mediatek Dimensity 6300",
+    ]:
+        assert SpecAnalyzer.determine_chipset_tier(chipset) == legacy_chipset_tier(
+            chipset
+        )
+
+
+def test_analyze_many_matches_per_phone_path():
+    phones = [synthetic_phone_data(i) for i in range(200)]
+    generator = ReviewGenerator()
+    assert generator.analyze_many(phones) == [legacy_specs_object(p) for p in phones]
+
+
+def test_specs_are_memoized_per_spec_content():
+    generator = ReviewGenerator()
+    phone = synthetic_phone_data(1)
+
+    first = generator.create_phone_specs_object(phone)
+    assert generator.create_phone_specs_object(phone) is first
+
+    phone["structured"]["Battery"] = "1234 mAh"
+    changed = generator.create_phone_specs_object(phone)
+    assert changed is not first
+    assert changed.battery_capacity == 1234
@@ -0,0 +1,112 @@
+# tests/test_spec_doc.py
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from agents import data_agent, name_resolver
+from catalog import snapshot as catalog
+from database.migrations import run_migrations
+from database.models import Phone, Specification
+from scraper.ingest import bulk_upsert_phones
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    # Read from the database, with a resolver built from this one
+    monkeypatch.setattr(catalog, "_snapshot", None)
+    monkeypatch.setattr(name_resolver, "_resolver", None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'specs.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _spec_rows(db, phone):
+    rows = db.query(Specification).filter(Specification.phone_id == phone.id)
+    return [(s.key, s.value) for s in rows.order_by(Specification.id)]
+
+
+def test_spec_doc_matches_specification_rows(engine):
+    run_migrations(engine)
+    specs = {"Network - 5G": "Yes", "Battery - Type": "5000 mAh", "Misc - SAR": "1.1"}
+    with Session(engine) as db:
+        bulk_upsert_phones(
+            db,
+            [
+                {
+                    "name": "Galaxy A",
+                    "url": "https://example.com/a",
+                    "specifications": specs,
+                }
+            ],
+        )
+        phone = db.query(Phone).one()
+        assert phone.spec_items() == _spec_rows(db, phone) == list(specs.items())
+        assert data_agent.spec_dict(phone) == specs
+
+
+def test_v0004_backfills_spec_doc_in_row_order(engine):
+    run_migrations(engine, target=3)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO phones (id, name, url) VALUES "
+                "(1, 'Galaxy A', 'https://example.com/a'), "
+                "(2, 'Galaxy B', 'https://example.com/b')"
+            )
+        )
+        conn.execute(
+            text(
+                'INSERT INTO specifications (id, phone_id, "key", value) VALUES '
+                "(1, 1, 'OS', 'Android 14'), (2, 2, 'OS', 'Android 13'), "
+                "(3, 1, 'Battery', '5000 mAh')"
+            )
+        )
+
+    run_migrations(engine)
+    with Session(engine) as db:
+        for phone in db.query(Phone).order_by(Phone.id):
+            assert phone.spec_items() == _spec_rows(db, phone)
+        assert db.get(Phone, 1).spec_items() == [
+            ("OS", "Android 14"),
+            ("Battery", "5000 mAh"),
+        ]
+
+
+def test_get_phone_data_falls_back_to_rows_without_spec_doc(engine):
+    run_migrations(engine)
+    with Session(engine) as db:
+        bulk_upsert_phones(
+            db,
+            [
+                {
+                    "name": "Samsung Galaxy S25",
+                    "url": "https://example.com/s25",
+                    "battery": "4000 mAh",
+                    "specifications": {"Battery - Type": "4000 mAh"},
+                },
+                {
+                    "name": "Samsung Galaxy A15",
+                    "url": "https://example.com/a15",
+                    "specifications": {"Memory - Card slot": "Yes"},
+                },
+            ],
+        )
+        # A phone written before spec_doc existed
+        db.execute(
+            text("UPDATE phones SET spec_doc = NULL WHERE name = 'Samsung Galaxy A15'")
+        )
+        db.commit()
+
+        legacy = db.query(Phone).filter(Phone.name == "Samsung Galaxy A15").one()
+        assert legacy.spec_items() is None and data_agent.spec_dict(legacy) is None
+        data = data_agent.get_phone_data("Galaxy A15", db)
+        assert data["extra"] == {"Memory - Card slot": "Yes"}
+
+        data = data_agent.get_phone_data("Galaxy S25", db)
+        assert data["structured"]["Battery"] == "4000 mAh"
+        assert data["extra"] == {"Battery - Type": "4000 mAh"}
@@ -0,0 +1,61 @@
+# tests/test_startup.py
+
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["torch", "transformers", "sentence_transformers", "faiss"]
+
+PROBE = """
+import json, sys
+from fastapi.testclient import TestClient
+import api.main
+
+status = TestClient(api.main.app).get("/").status_code
+print(json.dumps({"status": status, "modules": sorted(sys.modules)}))
+"""
+
+# Modules the API loads on first use (retrieval, catalog sync)
+SERVING_PROBE = """
+import json, sys
+import catalog.refresh, chatbot.embeddings, chatbot.retriever
+
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+
+
+def _start_api(probe=PROBE, **env):
+    env = {**os.environ, **env}
+    env.pop("DATABASE_URL", None)
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        env=env,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_api_starts_without_database_url_or_heavy_imports():
+    probe = _start_api()
+    assert probe["status"] == 200
+    assert "chatbot.chatbot" in probe["modules"]
+    assert not set(HEAVY_MODULES) & set(probe["modules"])
+    assert "api.profiling.services" not in probe["modules"]  # off by default
+
+
+def test_review_only_worker_skips_chatbot_stack():
+    probe = _start_api(API_FEATURES="review")
+    assert probe["status"] == 200
+    assert "agents.coordinator" in probe["modules"]
+    assert not any(m.startswith("chatbot.") for m in probe["modules"])
+
+
+def test_serving_path_does_not_import_the_scraper():
+    probe = _start_api(SERVING_PROBE)
+    assert not any(
+        m.split(".")[0] in ("scraper", "httpx", "lxml") for m in probe["modules"]
+    )
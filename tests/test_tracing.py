@@ -0,0 +1,139 @@
+# tests/test_tracing.py
+
+import asyncio
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import TracingMiddleware
+from config import tracing
+from config.tracing import (
+    Histogram,
+    count,
+    end_request_trace,
+    registry,
+    render_prometheus,
+    server_timing,
+    stage,
+    start_request_trace,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4 and histogram.sum == pytest.approx(3.65)
+
+
+def test_stages_reach_the_request_trace_through_worker_threads():
+    def encode():
+        with stage("encode"):
+            return 42
+
+    async def request():
+        token = start_request_trace()
+        with stage("hydrate"):
+            await asyncio.to_thread(encode)
+        return end_request_trace(token)
+
+    stages = asyncio.run(request())
+    assert [name for name, _ in stages] == ["encode", "hydrate"]
+    assert registry.histogram("stage_duration_seconds", stage="encode").count == 1
+
+    # Outside a request, stages still feed the histograms
+    encode()
+    assert registry.histogram("stage_duration_seconds", stage="encode").count == 2
+
+
+def test_counters_and_disabled_tracing(monkeypatch):
+    count("cache_hits_total", cache="specs")
+    count("cache_hits_total", cache="specs")
+    assert registry.counter_value("cache_hits_total", cache="specs") == 2
+
+    monkeypatch.setattr(tracing.settings, "TRACING_ENABLED", False)
+    count("cache_hits_total", cache="specs")
+    with stage("encode"):
+        pass
+    assert registry.counter_value("cache_hits_total", cache="specs") == 2
+    assert registry.histogram("stage_duration_seconds", stage="encode") is None
+
+
+def test_server_timing_sums_repeated_stages():
+    header = server_timing([("encode", 0.001), ("hydrate", 0.002), ("encode", 0.003)])
+    assert header == "encode;dur=4.00, hydrate;dur=2.00"
+    assert server_timing([], total=0.0125) == "total;dur=12.50"
+
+
+def test_render_prometheus():
+    registry.observe("stage_duration_seconds", 0.003, stage="encode")
+    count("fallbacks_total", reason='say "hi"')
+    count("model_invocations_total", 1234567, model="encoder")
+    count("model_invocations_total", model="encoder")
+    text = render_prometheus(
+        {
+            "db_pool_size": 5,
+            "db_pool_checkouts_total": 2_000_001,
+            "db_pool_checkout_wait_seconds_total": 1234567.125,
+        }
+    )
+
+    assert "# TYPE phone_api_stage_duration_seconds histogram" in text
+    assert (
+        'phone_api_stage_duration_seconds_bucket{stage="encode",le="0.0025"} 0' in text
+    )
+    assert (
+        'phone_api_stage_duration_seconds_bucket{stage="encode",le="0.005"} 1' in text
+    )
+    assert 'phone_api_stage_duration_seconds_bucket{stage="encode",le="+Inf"} 1' in text
+    assert 'phone_api_stage_duration_seconds_count{stage="encode"} 1' in text
+    assert 'phone_api_fallbacks_total{reason="say \\"hi\\""} 1' in text
+    assert "# TYPE phone_api_db_pool_size gauge\nphone_api_db_pool_size 5" in text
+    assert "# TYPE phone_api_db_pool_checkouts_total counter" in text
+    # Large counters keep every digit, or rate() would see them stall
+    assert 'phone_api_model_invocations_total{model="encoder"} 1234568' in text
+    assert "phone_api_db_pool_checkouts_total 2000001\n" in text
+    assert "phone_api_db_pool_checkout_wait_seconds_total 1234567.125" in text
+
+
+def _traced_app():
+    items = APIRouter()
+
+    @items.get("/{item_id}")
+    def get_item(item_id: str):
+        with stage("lookup"):
+            return {"item": item_id}
+
+    api = APIRouter()
+    api.include_router(items, prefix="/items")
+    app = FastAPI()
+    app.include_router(api)
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+def test_middleware_records_route_templates_and_server_timing(monkeypatch):
+    client = TestClient(_traced_app())
+
+    assert "server-timing" not in client.get("/items/a").headers
+    monkeypatch.setattr(tracing.settings, "SERVER_TIMING_ENABLED", True)
+    header = client.get("/items/b").headers["server-timing"]
+    assert header.startswith("lookup;dur=") and ", total;dur=" in header
+    client.get("/nowhere")
+
+    labels = dict(method="GET", route="/items/{item_id}", status=200)
+    assert registry.histogram("http_request_duration_seconds", **labels).count == 2
+    unmatched = dict(method="GET", route="unmatched", status=404)
+    assert registry.histogram("http_request_duration_seconds", **unmatched).count == 1